@@ -35,13 +35,9 @@ def main():
         print("\n💡 Performance Tip: Install onnxruntime-gpu for 2x faster pose estimation")
 
     
-    # Initialize pipeline with optimized settings
+    # Initialize pipeline from the default profile (tracker, thresholds, device, ...)
     print("🚀 Initializing Unified Pose Pipeline...")
-    pipeline = UnifiedPosePipeline(
-        tracker_type='ocsort',  # Options: ocsort, bytetrack, botsort, strongsort
-        confidence_threshold=0.5,
-        device='cuda'  # Use GPU for both tracking and pose estimation
-    )
+    pipeline = UnifiedPosePipeline.from_config('configs/default.yaml')
     
     # Demo video path
     demo_video = 'test_videos/campusWalk.mp4'
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Motion gate benchmark
+1. Gate cost: ms per frame for the thumbnail + difference test at the given
+   resolution (the price paid on every frame, static or not).
+2. Pipeline (when a video is given): runs UnifiedPosePipeline with and without
+   motion.enabled, reporting stage FPS and skipped frames, and checking that
+   every frame the gate processed has the same tracks as the ungated run.
+
+Usage:
+    python performance_tests/benchmark_motion_gate.py                  # gate cost only
+    python performance_tests/benchmark_motion_gate.py cctv.mp4 --config configs/realtime.yaml
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pipeline.utils.motion import MotionGate
+
+
+def measure_gate(width, height, iterations):
+    gate = MotionGate()
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(2)]
+    gate.skip(frames[0])
+    start = time.perf_counter()
+    for i in range(iterations):
+        gate.skip(frames[i % 2])
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def run_pipeline(video, config, max_frames, output_dir):
+    from pipeline.unified_pipeline import UnifiedPosePipeline
+    pipeline = UnifiedPosePipeline(config=config, output_dir=output_dir)
+    results = pipeline.run_complete_pipeline(video, max_frames=max_frames)
+    return results, pipeline.frame_data, pipeline.motion_skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark motion-gated frame skipping')
+    parser.add_argument('video', nargs='?', default=None, help='run the full pipeline comparison on this video')
+    parser.add_argument('--config', default=None)
+    parser.add_argument('--max-frames', type=int, default=None)
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    parser.add_argument('--iterations', type=int, default=300)
+    args = parser.parse_args()
+
+    print("🎞️  Motion Gate Benchmark")
+    print("=" * 60)
+    gate_ms = measure_gate(args.width, args.height, args.iterations)
+    print(f"\n⏱️  Gate cost ({args.width}x{args.height}): {gate_ms:.2f} ms/frame")
+
+    if args.video is None:
+        return
+
+    from pipeline.config import load_config
+    base = load_config(args.config)
+    runs = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, enabled in (('ungated', False), ('gated', True)):
+            print(f"\n🔁 Pipeline {label}...")
+            config = base.with_overrides(**{'motion.enabled': enabled})
+            runs[label] = run_pipeline(args.video, config, args.max_frames, os.path.join(tmp, label))
+
+    print("\n📊 RESULTS")
+    for label, (results, _, skipped) in runs.items():
+        frames = results['tracking_results']['frame_count']
+        print(f"   {label:8s} TrackDet {results['tracking_results']['stage1_fps']:6.1f} FPS | "
+              f"Pose2D {results['pose_results']['stage2_fps']:6.1f} FPS | "
+              f"Overall {results['overall_fps']:6.1f} FPS | "
+              f"static {len(skipped)}/{frames} frames")
+    (ungated, full_tracks, _), (gated, tracks, skipped) = runs['ungated'], runs['gated']
+    processed = [i for i in tracks if i not in skipped]
+    same = sum(tracks[i] == full_tracks.get(i) for i in processed)
+    print(f"   Same tracks on processed frames: {same}/{len(processed)}")
+    print(f"   Same target: {ungated['pose_results']['target_person'] == gated['pose_results']['target_person']}")
+    print(f"   Speedup: {gated['overall_fps'] / ungated['overall_fps']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Multi-process pipeline benchmark
+1. Transport: passes decoded frames between processes through a pickling
+   multiprocessing.Queue vs the shared-memory FrameRing (slot indices only).
+2. Pipeline (when a video is given): runs UnifiedPosePipeline in-process and
+   with runtime.multiprocess, reporting stage FPS and checking that both
+   produce the same target and keypoints.
+
+Usage:
+    python performance_tests/benchmark_multiprocess.py                 # transport only
+    python performance_tests/benchmark_multiprocess.py video.mp4 --config configs/realtime.yaml
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pipeline.multiprocess import run_stages, StageWorker
+
+
+class _Touch(StageWorker):
+    """Reads one pixel per frame so the consumer really maps the data"""
+
+    name = 'touch'
+
+    def process(self, slot, frame_idx, frame, payload):
+        frame[0, 0, 0]
+        return [(slot, frame_idx, payload)]
+
+
+def _queue_decode(video, frames_queue, max_frames, go):
+    import cv2
+    cap = cv2.VideoCapture(video)
+    go.wait()
+    for _ in range(max_frames):
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames_queue.put(frame)
+    frames_queue.put(None)
+
+
+def _queue_consume(frames_queue, done):
+    count = 0
+    while (frame := frames_queue.get()) is not None:
+        frame[0, 0, 0]
+        count += 1
+    done.put(count)
+
+
+def run_queue_transport(video, max_frames):
+    """Decode and consumer processes exchanging pickled frames"""
+    import multiprocessing as mp
+    ctx = mp.get_context('spawn')
+    frames_queue, done, go = ctx.Queue(maxsize=16), ctx.Queue(), ctx.Event()
+    consumer = ctx.Process(target=_queue_consume, args=(frames_queue, done))
+    decoder = ctx.Process(target=_queue_decode, args=(video, frames_queue, max_frames, go))
+    consumer.start()
+    decoder.start()
+    time.sleep(1.0)  # let both processes finish importing, as run_stages waits for 'ready'
+    go.set()
+    start = time.perf_counter()
+    count = done.get()
+    elapsed = time.perf_counter() - start
+    decoder.join()
+    consumer.join()
+    return count, elapsed
+
+
+def make_clip(path, num_frames, width, height):
+    import cv2
+    out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 30, (width, height))
+    base = np.tile(np.linspace(0, 255, width, dtype=np.uint8), (height, 1))
+    for i in range(num_frames):
+        out.write(cv2.merge([np.roll(base, 4 * i, axis=1), base, np.full_like(base, i % 256)]))
+    out.release()
+
+
+def run_pipeline(video, config, max_frames, output_dir):
+    from pipeline.unified_pipeline import UnifiedPosePipeline
+    pipeline = UnifiedPosePipeline(config=config, output_dir=output_dir)
+    results = pipeline.run_complete_pipeline(video, max_frames=max_frames)
+    return results, pipeline.keypoint_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark shared-memory multi-process execution')
+    parser.add_argument('video', nargs='?', default=None, help='run the full pipeline comparison on this video')
+    parser.add_argument('--config', default=None)
+    parser.add_argument('--max-frames', type=int, default=300)
+    parser.add_argument('--ring-slots', type=int, default=16)
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    args = parser.parse_args()
+
+    print("🧵 Multi-Process Pipeline Benchmark")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        clip = os.path.join(tmp, 'clip.mp4')
+        make_clip(clip, args.max_frames, args.width, args.height)
+        print(f"\n📦 Frame transport ({args.width}x{args.height}, {args.max_frames} frames, decode included)")
+        count, queue_time = run_queue_transport(clip, args.max_frames)
+        print(f"   Pickling queue:    {count / queue_time:7.1f} FPS")
+        _, ring_time = run_stages(clip, (args.height, args.width, 3), [_Touch()],
+                                  num_slots=args.ring_slots, max_frames=args.max_frames)
+        print(f"   Shared-mem ring:   {count / ring_time:7.1f} FPS ({queue_time / ring_time:.2f}x)")
+
+        if args.video is None:
+            return
+
+        from pipeline.config import load_config
+        base = load_config(args.config).with_overrides(**{'output.format': 'npz'})
+        runs = {}
+        for label, multiprocess in (('in-process', False), ('multiprocess', True)):
+            config = base.with_overrides(**{'runtime.multiprocess': multiprocess,
+                                            'runtime.ring_slots': args.ring_slots})
+            print(f"\n🔁 Pipeline {label}...")
+            runs[label] = run_pipeline(args.video, config, args.max_frames, os.path.join(tmp, label))
+
+    print("\n📊 RESULTS")
+    for label, (results, _) in runs.items():
+        print(f"   {label:13s} TrackDet {results['tracking_results']['stage1_fps']:6.1f} FPS | "
+              f"Pose2D {results['pose_results']['stage2_fps']:6.1f} FPS | "
+              f"Overall {results['overall_fps']:6.1f} FPS")
+    (single, single_kpts), (multi, multi_kpts) = runs['in-process'], runs['multiprocess']
+    same_target = single['pose_results']['target_person'] == multi['pose_results']['target_person']
+    same_kpts = single_kpts.keys() == multi_kpts.keys() and all(
+        np.allclose(single_kpts[i][0], multi_kpts[i][0], atol=1e-3) for i in single_kpts)
+    print(f"   Same target: {same_target} | Same keypoints: {same_kpts}")
+    print(f"   Speedup: {multi['overall_fps'] / single['overall_fps']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Multi-stream batching benchmark
+Processes N videos concurrently two ways on the same machine:
+  1. N independent UnifiedPosePipeline instances, one process each (batch size 1)
+  2. One MultiStreamScheduler sharing detector and pose batches across streams
+Model loading is excluded from both timings. The pipeline estimates pose only
+for its target (the longest track). By default the scheduler does the same
+work with pose_tracks='longest': one pose per frame, for the track seen most
+so far. --pose-tracks all estimates every tracked person instead.
+
+With --stub-models both sides use the contour detector and fixed pose model
+from tests/test_pipeline.py. That runs without model weights and measures the
+scheduling overhead (reader threads, batching, routing), not the batching
+gain of a real detector or pose model.
+
+Usage:
+    python performance_tests/benchmark_multistream.py video1.mp4 video2.mp4 ...
+    python performance_tests/benchmark_multistream.py video.mp4 --streams 4
+    python performance_tests/benchmark_multistream.py video.mp4 --streams 4 --stub-models
+    python performance_tests/benchmark_multistream.py video.mp4 --streams 4 --pose-tracks all
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import multiprocessing as mp
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pipeline.config import load_config
+from pipeline.unified_pipeline import UnifiedPosePipeline
+from pipeline.multistream import MultiStreamScheduler
+
+
+def pipeline_class(stub_models):
+    if not stub_models:
+        return UnifiedPosePipeline
+    from tests.test_pipeline import StubPipeline
+    return StubPipeline
+
+
+class _BatchAdapter:
+    """Calls a single-frame stub detector over a list of frames, as YOLO accepts"""
+
+    def __init__(self, detector):
+        self.detector = detector
+
+    def __call__(self, frames, **kwargs):
+        return [self.detector(frame, **kwargs)[0] for frame in frames]
+
+
+def _independent_worker(config, video, max_frames, output_dir, barrier, results, stub_models):
+    pipeline = pipeline_class(stub_models)(config=config, output_dir=output_dir)
+    barrier.wait()
+    run = pipeline.run_complete_pipeline(video, max_frames=max_frames)
+    results.put(run['tracking_results']['frame_count'])
+
+
+def run_independent(config, videos, max_frames, output_root, stub_models=False):
+    """N pipeline processes started together once all have loaded their models"""
+    ctx = mp.get_context('spawn')
+    barrier = ctx.Barrier(len(videos) + 1)
+    results = ctx.Queue()
+    procs = [ctx.Process(target=_independent_worker,
+                         args=(config, video, max_frames, os.path.join(output_root, f'independent_{i}'),
+                               barrier, results, stub_models))
+             for i, video in enumerate(videos)]
+    for proc in procs:
+        proc.start()
+    barrier.wait()
+    start = time.perf_counter()
+    frames = sum(results.get() for _ in procs)
+    elapsed = time.perf_counter() - start
+    for proc in procs:
+        proc.join()
+    return frames, elapsed
+
+
+def run_scheduler(config, videos, max_frames, output_root, max_batch, max_latency_ms, stub_models=False,
+                  pose_tracks='longest'):
+    pipeline = pipeline_class(stub_models)(config=config, output_dir=os.path.join(output_root, 'scheduler'))
+    if stub_models:
+        pipeline.detector = _BatchAdapter(pipeline.detector)
+    scheduler = MultiStreamScheduler.from_pipeline(pipeline, max_batch=max_batch,
+                                                   max_latency_ms=max_latency_ms, keep_results=False,
+                                                   pose_tracks=pose_tracks)
+    for i, video in enumerate(videos):
+        scheduler.add_stream(f'stream{i}', video, max_frames=max_frames)
+    return scheduler.run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark multi-stream dynamic batching')
+    parser.add_argument('videos', nargs='+')
+    parser.add_argument('--streams', type=int, default=None, help='repeat the video list to N streams')
+    parser.add_argument('--config', default=None)
+    parser.add_argument('--max-frames', type=int, default=300)
+    parser.add_argument('--max-batch', type=int, default=8)
+    parser.add_argument('--max-latency-ms', type=float, default=20.0)
+    parser.add_argument('--skip-independent', action='store_true')
+    parser.add_argument('--pose-tracks', choices=['longest', 'all'], default='longest',
+                        help="scheduler pose work: the longest track like the pipeline (default) or all tracks")
+    parser.add_argument('--stub-models', action='store_true',
+                        help='stub detector/pose from the test suite (no weights needed)')
+    args = parser.parse_args()
+
+    videos = args.videos
+    if args.streams:
+        videos = [videos[i % len(videos)] for i in range(args.streams)]
+    # Data-only output for both sides: no rendering, compact keypoints
+    config = load_config(args.config).with_overrides(**{'output.render': False, 'output.format': 'npz'})
+    if args.stub_models:
+        config = config.with_overrides(**{'pipeline.device': 'cpu', 'trackdet.tracker_type': 'iou',
+                                          'runtime.warmup_iterations': 0})
+
+    print("🎛️  Multi-Stream Batching Benchmark")
+    print("=" * 60)
+    print(f"Streams: {len(videos)} | Frames/stream: {args.max_frames} | "
+          f"Max batch: {args.max_batch} | Deadline: {args.max_latency_ms:.0f} ms | "
+          f"Scheduler pose: {args.pose_tracks} tracks")
+
+    with tempfile.TemporaryDirectory() as output_root:
+        if not args.skip_independent:
+            print(f"\n🔁 {len(videos)} independent UnifiedPosePipeline processes...")
+            frames, elapsed = run_independent(config, videos, args.max_frames, output_root, args.stub_models)
+            independent_fps = frames / elapsed
+            print(f"   {frames} frames in {elapsed:.2f}s | Aggregate FPS: {independent_fps:.1f}")
+
+        print(f"\n🧺 MultiStreamScheduler (pose on {args.pose_tracks} tracks)...")
+        stats = run_scheduler(config, videos, args.max_frames, output_root,
+                              args.max_batch, args.max_latency_ms, args.stub_models, args.pose_tracks)
+
+    print("\n📊 RESULTS")
+    print(f"   Scheduler aggregate FPS: {stats['aggregate_fps']:.1f}")
+    print(f"   Mean det batch: {stats['mean_det_batch']:.1f} | Mean pose batch: {stats['mean_pose_batch']:.1f}")
+    print(f"   Stage time: det {stats['det_time']:.2f}s | track {stats['track_time']:.2f}s | "
+          f"pose {stats['pose_time']:.2f}s")
+    print(f"   Latency p50/p95: {stats['latency_p50_ms']:.0f}/{stats['latency_p95_ms']:.0f} ms")
+    if not args.skip_independent:
+        print(f"   Speedup vs independent pipelines: {stats['aggregate_fps'] / independent_fps:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Skeleton rendering benchmark
+Compares rtmlib.draw_skeleton against the vectorized SkeletonRenderer
+on synthetic multi-person 1080p overlays
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pipeline.pose2d.visualization import SkeletonRenderer
+
+# Rough standing OpenPose-18 pose in a unit box (x right, y down)
+TEMPLATE = np.array([
+    [0.50, 0.08], [0.50, 0.20], [0.35, 0.20], [0.30, 0.38], [0.28, 0.55],
+    [0.65, 0.20], [0.70, 0.38], [0.72, 0.55], [0.40, 0.55], [0.40, 0.75],
+    [0.40, 0.95], [0.60, 0.55], [0.60, 0.75], [0.60, 0.95], [0.46, 0.06],
+    [0.54, 0.06], [0.42, 0.08], [0.58, 0.08]], dtype=np.float32)
+
+
+def make_people(num_people, width, height, rng):
+    """Random people as (N, 18, 2) keypoints and (N, 18) scores"""
+    heights = rng.uniform(0.25, 0.6, num_people) * height
+    origins = np.stack([rng.uniform(0, width - heights * 0.5),
+                        rng.uniform(0, height - heights)], axis=1)
+    keypoints = origins[:, None] + TEMPLATE[None] * heights[:, None, None] * [0.5, 1.0]
+    keypoints += rng.normal(0, 3, keypoints.shape)
+    scores = rng.uniform(0.1, 1.0, (num_people, len(TEMPLATE)))
+    return keypoints.astype(np.float32), scores.astype(np.float32)
+
+
+def time_draw(draw_fn, frame, keypoints, scores, iters):
+    """Average ms per call, drawing onto a fresh copy of the frame each time"""
+    canvases = [frame.copy() for _ in range(iters)]
+    start = time.perf_counter()
+    for canvas in canvases:
+        draw_fn(canvas, keypoints, scores)
+    return (time.perf_counter() - start) * 1000 / iters
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark skeleton rendering')
+    parser.add_argument('--people', type=int, nargs='+', default=[1, 5, 20])
+    parser.add_argument('--iters', type=int, default=200)
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, (args.height, args.width, 3), dtype=np.uint8)
+
+    candidates = {
+        'SkeletonRenderer': SkeletonRenderer(kpt_thr=0.3),
+    }
+    try:
+        from rtmlib import draw_skeleton
+        candidates = {'rtmlib.draw_skeleton': lambda img, k, s: draw_skeleton(
+            img, k, s, openpose_skeleton=True, kpt_thr=0.3), **candidates}
+    except ImportError:
+        print("⚠️  rtmlib not installed - benchmarking SkeletonRenderer only")
+
+    print("🎨 Skeleton Rendering Benchmark")
+    print("=" * 60)
+    print(f"Frame: {args.width}x{args.height}, {args.iters} iterations per case")
+
+    for num_people in args.people:
+        keypoints, scores = make_people(num_people, args.width, args.height, rng)
+        print(f"\n👥 {num_people} people:")
+        baseline = None
+        for name, draw_fn in candidates.items():
+            ms = time_draw(draw_fn, frame, keypoints, scores, args.iters)
+            baseline = baseline or ms
+            print(f"   {name:34s} {ms:8.3f} ms/frame | {baseline / ms:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
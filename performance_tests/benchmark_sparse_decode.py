@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Sparse decode benchmark
+Generates a clip and compares stage 2's full sequential decode against
+FrameReader's grab()-only and keyframe-seek skipping for different target
+presence ratios. Every sparse frame is checked against the sequential decode.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+import cv2
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pipeline.utils.video_io import FrameReader
+
+
+def make_clip(path, num_frames, width, height, fps=30):
+    """Moving-gradient clip with a frame counter so every frame decodes differently"""
+    out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+    base = np.tile(np.linspace(0, 255, width, dtype=np.uint8), (height, 1))
+    for i in range(num_frames):
+        frame = cv2.merge([np.roll(base, 4 * i, axis=1), base, np.full_like(base, i % 256)])
+        cv2.putText(frame, f"{i:05d}", (50, 100), cv2.FONT_HERSHEY_SIMPLEX, 2, (255, 255, 255), 3)
+        out.write(frame)
+    out.release()
+
+
+def presence_indices(num_frames, ratio, num_segments, rng):
+    """Target present in num_segments contiguous runs covering ~ratio of the clip"""
+    seg_len = max(1, int(num_frames * ratio / num_segments))
+    starts = np.sort(rng.choice(num_frames - seg_len, num_segments, replace=False))
+    frames = set()
+    for start in starts:
+        frames.update(range(start, start + seg_len))
+    return sorted(frames)
+
+
+def run_reader(path, indices, num_frames, seek_min_gap):
+    cap = cv2.VideoCapture(path)
+    start = time.perf_counter()
+    reader = FrameReader(cap, indices, max_frames=num_frames, seek_min_gap=seek_min_gap)
+    frames = {idx: frame for idx, frame in reader}
+    elapsed = time.perf_counter() - start
+    cap.release()
+    return elapsed, frames, reader.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark sparse stage-2 decoding')
+    parser.add_argument('--frames', type=int, default=1500)
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--ratios', type=float, nargs='+', default=[0.05, 0.2, 0.5])
+    parser.add_argument('--segments', type=int, default=3)
+    parser.add_argument('--seek-min-gap', type=int, default=250)
+    parser.add_argument('--video', help='use an existing clip instead of generating one')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.video or os.path.join(tmp, 'sparse_clip.mp4')
+        if not args.video:
+            print(f"🎞️  Generating {args.frames} frames at {args.width}x{args.height}...")
+            make_clip(path, args.frames, args.width, args.height)
+        num_frames = min(args.frames, int(cv2.VideoCapture(path).get(cv2.CAP_PROP_FRAME_COUNT)))
+
+        print("⏩ Sparse Decode Benchmark")
+        print("=" * 60)
+        full_time, full_frames, _ = run_reader(path, None, num_frames, None)
+        print(f"Full sequential decode: {full_time:.2f}s ({num_frames / full_time:.1f} FPS)")
+
+        for ratio in args.ratios:
+            indices = presence_indices(num_frames, ratio, args.segments, rng)
+            print(f"\n🎯 Target present in {len(indices)}/{num_frames} frames ({ratio:.0%})")
+            for name, gap in [('grab() only', None), (f'seek (gap >= {args.seek_min_gap})',
+                                                      args.seek_min_gap)]:
+                elapsed, frames, stats = run_reader(path, indices, num_frames, gap)
+                exact = all(np.array_equal(frames[i], full_frames[i]) for i in indices)
+                print(f"   {name:22s} {elapsed:6.2f}s | {full_time / elapsed:4.1f}x | "
+                      f"retrieved {stats['retrieved']}, grabbed {stats['grabbed']}, "
+                      f"seeks {stats['seeks']} | {'✅ exact' if exact else '❌ MISMATCH'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+asyncio API
+Runs the blocking pipeline (decode, detection, tracking, pose) in an executor
+thread and streams its progress to the event loop as structured events:
+
+    {'type': 'stage_start',    'stage': 'trackdet' | 'pose2d', ...}
+    {'type': 'tracks',         'frame': i, 'tracks': {track_id: [x1, y1, x2, y2]}}
+    {'type': 'adjustment',     ...}   # throughput controller changes
+    {'type': 'stage_complete', 'stage': ..., 'frames', 'time', 'fps'}
+    {'type': 'target',         'track_id', 'frames', 'start_frame', 'end_frame'}
+    {'type': 'pose',           'frame': i, 'bbox', 'keypoints', 'scores'}
+    {'type': 'complete',       'results': <run_complete_pipeline results>}
+
+Cancelling the consuming task, or leaving the `async for` early, stops the
+run at the next frame and waits for the worker thread before returning, so
+the pipeline can be reused right away. AsyncPipelinePool runs many videos on
+one loop with at most `size` concurrent runs, one warm pipeline each.
+"""
+
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+
+from .unified_pipeline import UnifiedPosePipeline
+
+
+async def stream_events(pipeline, input_video, max_frames=None, executor=None, quiet=True):
+    """Async generator behind UnifiedPosePipeline.astream()"""
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+    finished = object()
+
+    def push(event):
+        try:
+            loop.call_soon_threadsafe(events.put_nowait, event)
+        except RuntimeError:
+            pass  # event loop already closed
+
+    def run():
+        verbose = pipeline.verbose
+        pipeline.on_event = push
+        pipeline.verbose = verbose and not quiet
+        try:
+            return pipeline.run_complete_pipeline(input_video, max_frames)
+        finally:
+            pipeline.on_event = None
+            pipeline.verbose = verbose
+            push(finished)
+
+    pipeline.cancel_event.clear()
+    future = loop.run_in_executor(executor, run)
+    try:
+        while (event := await events.get()) is not finished:
+            yield event
+        yield {'type': 'complete', 'results': await future}
+    finally:
+        if not future.done():
+            # Consumer cancelled or stopped early: stop the run and wait for the thread
+            pipeline.cancel_event.set()
+            await asyncio.wait([future])
+        if not future.cancelled():
+            future.exception()  # mark PipelineCancelled as retrieved
+
+
+class AsyncPipelinePool:
+    """Bounded concurrency for many videos on one event loop.
+
+    Holds `size` warm pipelines (built by pipeline_factory, default
+    UnifiedPosePipeline(config=config)) and a thread per pipeline; a run waits
+    for a free pipeline, so at most `size` videos are processed at once.
+    """
+
+    def __init__(self, size=2, config=None, pipeline_factory=None,
+                 output_root=os.path.join('unifiedpipelineoutputs', 'async')):
+        self.size = size
+        self.pipeline_factory = pipeline_factory or (lambda: UnifiedPosePipeline(config=config))
+        self.output_root = output_root
+        self._executor = None
+        self._idle = None
+        self._runs = 0
+
+    async def start(self):
+        """Build the pipelines (in worker threads, one after another)"""
+        loop = asyncio.get_running_loop()
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix='pipeline')
+        self._idle = asyncio.Queue()
+        for _ in range(self.size):
+            self._idle.put_nowait(await loop.run_in_executor(self._executor, self.pipeline_factory))
+        return self
+
+    async def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _output_dir(self, video):
+        self._runs += 1
+        stem = os.path.splitext(os.path.basename(str(video)))[0]
+        return os.path.join(self.output_root, f"{self._runs:04d}_{stem}")
+
+    async def astream(self, video, max_frames=None, output_dir=None):
+        """Events for one video (each tagged with 'video'), once a pipeline is free"""
+        if self._idle is None:
+            raise RuntimeError("Pool not started: use 'async with AsyncPipelinePool(...)' or await start()")
+        output_dir = output_dir or self._output_dir(video)
+        pipeline = await self._idle.get()
+        try:
+            pipeline.reset(output_dir)
+            async with aclosing(pipeline.astream(video, max_frames, executor=self._executor)) as events:
+                async for event in events:
+                    yield {**event, 'video': video}
+        finally:
+            self._idle.put_nowait(pipeline)
+
+    async def arun(self, video, max_frames=None, output_dir=None, on_event=None):
+        """Results of run_complete_pipeline for one video"""
+        async with aclosing(self.astream(video, max_frames, output_dir)) as events:
+            async for event in events:
+                if event['type'] == 'complete':
+                    return event['results']
+                if on_event is not None:
+                    on_event(event)
+
+    async def arun_many(self, videos, max_frames=None, on_event=None, return_exceptions=False):
+        """Run all videos, at most `size` at a time; results in input order"""
+        return await asyncio.gather(*(self.arun(video, max_frames, on_event=on_event) for video in videos),
+                                    return_exceptions=return_exceptions)
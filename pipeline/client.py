@@ -0,0 +1,76 @@
+"""
+Client for the local inference server (pipeline/server.py)
+Standard library only, so jobs can be submitted from any local script.
+"""
+
+import json
+import time
+import socket
+import http.client
+from urllib.parse import urlparse
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path, timeout=None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class PipelineClient:
+    """Submit and poll jobs over HTTP (url) or a Unix socket (socket_path)"""
+
+    def __init__(self, url='http://127.0.0.1:8765', socket_path=None, timeout=30):
+        self.url = urlparse(url)
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def _request(self, method, path, payload=None):
+        if self.socket_path:
+            conn = _UnixHTTPConnection(self.socket_path, timeout=self.timeout)
+        else:
+            conn = http.client.HTTPConnection(self.url.hostname, self.url.port or 80,
+                                              timeout=self.timeout)
+        try:
+            body = json.dumps(payload).encode() if payload is not None else None
+            headers = {'Content-Type': 'application/json'} if body else {}
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            data = json.loads(response.read() or b'null')
+        finally:
+            conn.close()
+        if response.status >= 400:
+            raise RuntimeError(f"Server returned {response.status}: {data.get('error', data)}")
+        return data
+
+    def health(self):
+        return self._request('GET', '/health')
+
+    def submit(self, video, priority=0, max_frames=None, output_dir=None):
+        """Queue a video (path as seen by the server); returns the job dict"""
+        return self._request('POST', '/jobs', {'video': video, 'priority': priority,
+                                               'max_frames': max_frames, 'output_dir': output_dir})
+
+    def status(self, job_id):
+        return self._request('GET', f'/jobs/{job_id}')
+
+    def jobs(self):
+        return self._request('GET', '/jobs')
+
+    def cancel(self, job_id):
+        return self._request('DELETE', f'/jobs/{job_id}')
+
+    def wait(self, job_id, timeout=None, poll_interval=0.5):
+        """Poll until the job is done, failed or cancelled"""
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            job = self.status(job_id)
+            if job['status'] in ('done', 'failed', 'cancelled'):
+                return job
+            if deadline is not None and time.time() > deadline:
+                raise TimeoutError(f"{job_id} still {job['status']} after {timeout}s")
+            time.sleep(poll_interval)
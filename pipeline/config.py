@@ -0,0 +1,283 @@
+"""
+Pipeline configuration
+Typed sections mirroring configs/default.yaml. load_config() reads a YAML
+file, rejects unknown keys and wrong types, and validates value ranges so a
+bad deployment profile fails at startup rather than mid-video.
+"""
+
+import os
+import typing
+from dataclasses import dataclass, field, fields, asdict
+from typing import Optional
+
+from .trackdet.tracker import TRACKER_BACKENDS
+
+
+REID_ONLY_TRACKERS = ('strongsort',)
+POSE_MODES = ('lightweight', 'balanced', 'performance')
+POSE_BACKENDS = ('onnxruntime', 'opencv', 'openvino')
+OUTPUT_FORMATS = ('json', 'npz', 'none')
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                   'configs', 'default.yaml')
+
+
+@dataclass
+class PipelineSection:
+    output_dir: str = 'unifiedpipelineoutputs'
+    max_frames: Optional[int] = None
+    device: str = 'cuda'
+    model_dir: Optional[str] = None
+    sparse_decode: bool = True
+    seek_min_gap: Optional[int] = 250
+
+
+@dataclass
+class TrackDetConfig:
+    tracker_type: str = 'ocsort'
+    detector_weights: str = 'yolov8s.pt'
+    detector_input_size: int = 640
+    confidence_threshold: float = 0.5
+    detection_threshold: float = 0.2
+    max_age: int = 30
+    min_hits: int = 3
+    iou_threshold: float = 0.3
+    use_osnet: bool = True
+    reid_weights: str = 'osnet_x0_25_msmt17.pt'
+    record_detections: bool = False
+
+
+@dataclass
+class Pose2DConfig:
+    mode: str = 'balanced'
+    backend: str = 'onnxruntime'
+    kpt_thr: float = 0.3
+    batch_size: int = 8
+
+
+@dataclass
+class RuntimeConfig:
+    """Thread counts (None leaves the library default), ONNX cache, warm-up and process layout"""
+    opencv_threads: Optional[int] = None
+    torch_threads: Optional[int] = None
+    onnx_intra_op_threads: Optional[int] = None
+    onnx_inter_op_threads: Optional[int] = None
+    onnx_cache_dir: Optional[str] = '~/.cache/unified_pose_pipeline/onnx'
+    warmup_iterations: int = 2
+    multiprocess: bool = False
+    ring_slots: int = 16
+    stage_timeout: Optional[float] = 300.0
+
+
+@dataclass
+class OutputConfig:
+    render: bool = True
+    format: str = 'json'
+    video_codec: str = 'mp4v'
+
+
+@dataclass
+class ControllerConfig:
+    """Adaptive throughput control; off by default so quality is never traded silently"""
+    enabled: bool = False
+    target_fps: float = 25.0
+    detector_share: float = 0.5
+    window: int = 30
+    cooldown: int = 30
+    headroom: float = 0.9
+    min_detector_input_size: int = 320
+    max_detection_interval: int = 3
+    max_pose_skip: int = 3
+    switch_pose_mode: bool = True
+
+
+@dataclass
+class MemoryConfig:
+    """Per-stage RSS sampling, optional tracemalloc snapshots and the growth warning"""
+    enabled: bool = True
+    sample_every: int = 50
+    tracemalloc: bool = False
+    top_allocations: int = 5
+    growth_warn_mb: float = 50.0
+
+
+@dataclass
+class MotionConfig:
+    """Motion gate: reuse detections, tracks and keypoints while the scene is static"""
+    enabled: bool = False
+    downsample_width: int = 160
+    pixel_threshold: int = 15
+    changed_fraction: float = 0.001
+    settle_frames: int = 5
+    max_static_frames: int = 150
+
+
+@dataclass
+class PipelineConfig:
+    pipeline: PipelineSection = field(default_factory=PipelineSection)
+    trackdet: TrackDetConfig = field(default_factory=TrackDetConfig)
+    pose2d: Pose2DConfig = field(default_factory=Pose2DConfig)
+    runtime: RuntimeConfig = field(default_factory=RuntimeConfig)
+    output: OutputConfig = field(default_factory=OutputConfig)
+    controller: ControllerConfig = field(default_factory=ControllerConfig)
+    memory: MemoryConfig = field(default_factory=MemoryConfig)
+    motion: MotionConfig = field(default_factory=MotionConfig)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a config from nested dicts, rejecting unknown sections/keys and bad types"""
+        data = data or {}
+        sections = {f.name: f.type for f in fields(cls)}
+        unknown = set(data) - set(sections)
+        if unknown:
+            raise ValueError(f"Unknown config sections: {sorted(unknown)}")
+
+        kwargs = {}
+        for name, section_type in sections.items():
+            values = data.get(name) or {}
+            if not isinstance(values, dict):
+                raise ValueError(f"Config section '{name}' must be a mapping")
+            kwargs[name] = _build_section(section_type, values, name)
+        config = cls(**kwargs)
+        config.validate()
+        return config
+
+    def to_dict(self):
+        return asdict(self)
+
+    def with_overrides(self, **overrides):
+        """Return a copy with 'section.key' overrides applied, e.g. {'pose2d.mode': 'lightweight'}"""
+        data = self.to_dict()
+        for dotted, value in overrides.items():
+            section, _, key = dotted.partition('.')
+            if section not in data or key not in data[section]:
+                raise ValueError(f"Unknown config key: {dotted}")
+            data[section][key] = value
+        return PipelineConfig.from_dict(data)
+
+    def validate(self):
+        """Raise ValueError on out-of-range or inconsistent settings"""
+        td, pose, rt, out = self.trackdet, self.pose2d, self.runtime, self.output
+        errors = []
+
+        if td.tracker_type not in TRACKER_BACKENDS:
+            errors.append(f"trackdet.tracker_type must be one of {sorted(TRACKER_BACKENDS)}")
+        if td.tracker_type in REID_ONLY_TRACKERS and not td.use_osnet:
+            errors.append(f"trackdet.use_osnet cannot be false for '{td.tracker_type}'")
+        for key in ('confidence_threshold', 'detection_threshold', 'iou_threshold'):
+            if not 0.0 <= getattr(td, key) <= 1.0:
+                errors.append(f"trackdet.{key} must be in [0, 1]")
+        if td.max_age < 1 or td.min_hits < 0:
+            errors.append("trackdet.max_age must be >= 1 and trackdet.min_hits >= 0")
+        if td.detector_input_size < 32 or td.detector_input_size % 32:
+            errors.append("trackdet.detector_input_size must be a positive multiple of 32")
+
+        if pose.mode not in POSE_MODES:
+            errors.append(f"pose2d.mode must be one of {POSE_MODES}")
+        if pose.backend not in POSE_BACKENDS:
+            errors.append(f"pose2d.backend must be one of {POSE_BACKENDS}")
+        if not 0.0 <= pose.kpt_thr <= 1.0:
+            errors.append("pose2d.kpt_thr must be in [0, 1]")
+        if pose.batch_size < 1:
+            errors.append("pose2d.batch_size must be >= 1")
+
+        for key in ('opencv_threads', 'torch_threads', 'onnx_intra_op_threads', 'onnx_inter_op_threads'):
+            value = getattr(rt, key)
+            if value is not None and value < 1:
+                errors.append(f"runtime.{key} must be >= 1 or null")
+        if rt.warmup_iterations < 0:
+            errors.append("runtime.warmup_iterations must be >= 0")
+        if rt.ring_slots < 4:
+            errors.append("runtime.ring_slots must be >= 4")
+        if rt.stage_timeout is not None and rt.stage_timeout <= 0:
+            errors.append("runtime.stage_timeout must be > 0 or null")
+        if rt.multiprocess and self.controller.enabled:
+            errors.append("runtime.multiprocess does not support controller.enabled")
+
+        if out.format not in OUTPUT_FORMATS:
+            errors.append(f"output.format must be one of {OUTPUT_FORMATS}")
+        if len(out.video_codec) != 4:
+            errors.append("output.video_codec must be a 4-character FourCC")
+        if not out.render and out.format == 'none':
+            errors.append("output.render is false and output.format is 'none': nothing would be saved")
+
+        if self.pipeline.max_frames is not None and self.pipeline.max_frames < 1:
+            errors.append("pipeline.max_frames must be >= 1 or null")
+        if self.pipeline.seek_min_gap is not None and self.pipeline.seek_min_gap < 1:
+            errors.append("pipeline.seek_min_gap must be >= 1 or null")
+
+        ctrl = self.controller
+        if ctrl.target_fps <= 0:
+            errors.append("controller.target_fps must be > 0")
+        if not 0.0 < ctrl.detector_share < 1.0:
+            errors.append("controller.detector_share must be in (0, 1)")
+        if not 0.0 < ctrl.headroom <= 1.0:
+            errors.append("controller.headroom must be in (0, 1]")
+        if ctrl.window < 1 or ctrl.cooldown < 0:
+            errors.append("controller.window must be >= 1 and controller.cooldown >= 0")
+        if ctrl.min_detector_input_size < 32 or ctrl.min_detector_input_size % 32:
+            errors.append("controller.min_detector_input_size must be a positive multiple of 32")
+        if ctrl.max_detection_interval < 1 or ctrl.max_pose_skip < 1:
+            errors.append("controller.max_detection_interval and controller.max_pose_skip must be >= 1")
+
+        mem = self.memory
+        if mem.sample_every < 1 or mem.top_allocations < 0:
+            errors.append("memory.sample_every must be >= 1 and memory.top_allocations >= 0")
+        if mem.growth_warn_mb <= 0:
+            errors.append("memory.growth_warn_mb must be > 0")
+
+        motion = self.motion
+        if motion.downsample_width < 8:
+            errors.append("motion.downsample_width must be >= 8")
+        if not 0 <= motion.pixel_threshold <= 255:
+            errors.append("motion.pixel_threshold must be in [0, 255]")
+        if not 0.0 <= motion.changed_fraction < 1.0:
+            errors.append("motion.changed_fraction must be in [0, 1)")
+        if motion.settle_frames < 0 or motion.max_static_frames < 1:
+            errors.append("motion.settle_frames must be >= 0 and motion.max_static_frames >= 1")
+
+        if errors:
+            raise ValueError("Invalid pipeline config:\n  - " + "\n  - ".join(errors))
+
+
+def _check_type(value, expected):
+    if typing.get_origin(expected) is typing.Union:
+        return any(_check_type(value, arg) for arg in typing.get_args(expected))
+    if expected is type(None):
+        return value is None
+    if expected is float:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if expected is int:
+        return isinstance(value, int) and not isinstance(value, bool)
+    return isinstance(value, expected)
+
+
+def _build_section(section_type, values, section_name):
+    known = {f.name: f.type for f in fields(section_type)}
+    unknown = set(values) - set(known)
+    if unknown:
+        raise ValueError(f"Unknown keys in config section '{section_name}': {sorted(unknown)}")
+
+    typed = {}
+    for key, value in values.items():
+        if not _check_type(value, known[key]):
+            raise ValueError(f"Config key {section_name}.{key} has wrong type: {value!r}")
+        typed[key] = float(value) if known[key] is float else value
+    return section_type(**typed)
+
+
+def load_config(path_or_config=None):
+    """Load and validate a PipelineConfig from a YAML path (None loads configs/default.yaml)"""
+    if path_or_config is None:
+        if not os.path.exists(DEFAULT_CONFIG_PATH):
+            return PipelineConfig()
+        path_or_config = DEFAULT_CONFIG_PATH
+    if isinstance(path_or_config, PipelineConfig):
+        path_or_config.validate()
+        return path_or_config
+    if isinstance(path_or_config, dict):
+        return PipelineConfig.from_dict(path_or_config)
+
+    import yaml
+    with open(path_or_config) as f:
+        data = yaml.safe_load(f)
+    return PipelineConfig.from_dict(data)
@@ -0,0 +1,162 @@
+"""
+Adaptive throughput controller
+Watches rolling per-stage latency against a per-frame budget derived from
+target_fps and steps quality knobs down (or back up when there is headroom).
+Each stage has an ordered ladder of knobs: degrading moves the first knob
+that can still get cheaper, restoring moves the last knob that was lowered.
+"""
+
+import time
+from collections import deque
+
+
+# Costliest first, so stepping down a level is always cheaper
+POSE_MODE_LADDER = ('performance', 'balanced', 'lightweight')
+DETECTOR_SIZE_LADDER = (640, 512, 416, 320)
+
+
+def pose_mode_ladder(pose_mode):
+    """The configured rtmlib mode followed by every cheaper one"""
+    return list(POSE_MODE_LADDER[POSE_MODE_LADDER.index(pose_mode):])
+
+
+class _Stage:
+    def __init__(self, knobs, budget, window):
+        self.knobs = knobs  # [(name, levels)], tried in order when degrading
+        self.levels = {name: 0 for name, _ in knobs}
+        self.budget = budget  # seconds per frame
+        self.window = deque(maxlen=window)
+        self.last_change = None
+        self.pending_cost = None  # (knob, level, latency before the change)
+        self.step_cost = {}  # (knob, level) -> latency ratio of level-1 over level
+
+
+class ThroughputController:
+    """Holds a target FPS by trading detector/pose quality for speed.
+
+    Stage 'trackdet' adjusts detector_input_size, then detection_interval;
+    stage 'pose2d' adjusts pose_mode, then pose_skip. Restores happen only
+    when the measured cost of the better level fits in headroom * budget.
+    """
+
+    def __init__(self, target_fps, detector_input_size=640, pose_mode='balanced',
+                 detector_share=0.5, window=30, cooldown=30, headroom=0.9,
+                 min_detector_input_size=320, max_detection_interval=3, max_pose_skip=3,
+                 switch_pose_mode=True):
+        self.target_fps = target_fps
+        self.frame_budget = 1.0 / target_fps
+        self.cooldown = cooldown
+        self.headroom = headroom
+
+        sizes = [detector_input_size] + [s for s in DETECTOR_SIZE_LADDER
+                                         if min_detector_input_size <= s < detector_input_size]
+        modes = pose_mode_ladder(pose_mode) if switch_pose_mode else [pose_mode]
+        self.stages = {
+            'trackdet': _Stage([('detector_input_size', sizes),
+                                ('detection_interval', list(range(1, max_detection_interval + 1)))],
+                               self.frame_budget * detector_share, window),
+            'pose2d': _Stage([('pose_mode', modes),
+                              ('pose_skip', list(range(1, max_pose_skip + 1)))],
+                             self.frame_budget * (1.0 - detector_share), window),
+        }
+        self.adjustments = []
+        self.log = print
+        self.stage_times = {name: [0.0, 0] for name in self.stages}  # total seconds, frames
+        self.start_time = time.time()
+
+    @classmethod
+    def from_config(cls, config):
+        ctrl = config.controller
+        return cls(ctrl.target_fps, detector_input_size=config.trackdet.detector_input_size,
+                   pose_mode=config.pose2d.mode, detector_share=ctrl.detector_share,
+                   window=ctrl.window, cooldown=ctrl.cooldown, headroom=ctrl.headroom,
+                   min_detector_input_size=ctrl.min_detector_input_size,
+                   max_detection_interval=ctrl.max_detection_interval,
+                   max_pose_skip=ctrl.max_pose_skip, switch_pose_mode=ctrl.switch_pose_mode)
+
+    def value(self, knob):
+        for stage in self.stages.values():
+            for name, levels in stage.knobs:
+                if name == knob:
+                    return levels[stage.levels[name]]
+        raise KeyError(knob)
+
+    def set_budget(self, stage, seconds_per_frame):
+        """Override a stage's per-frame budget (e.g. stage 2 gets what stage 1 left)"""
+        self.stages[stage].budget = max(seconds_per_frame, 1e-6)
+
+    def record(self, stage, seconds, frames=1):
+        """Add the wall time spent on `frames` frames of a stage"""
+        if frames <= 0:
+            return
+        self.stages[stage].window.extend([seconds / frames] * frames)
+        totals = self.stage_times[stage]
+        totals[0] += seconds
+        totals[1] += frames
+
+    def update(self, stage, frame_idx):
+        """Evaluate the rolling window; returns the adjustment made, if any"""
+        s = self.stages[stage]
+        if len(s.window) < s.window.maxlen:
+            return None
+        if s.last_change is not None and frame_idx - s.last_change < self.cooldown:
+            return None
+
+        latency = sum(s.window) / len(s.window)
+        if s.pending_cost is not None:
+            # First full window after a degrade: remember what the step saved
+            knob, level, before = s.pending_cost
+            s.step_cost[(knob, level)] = before / latency
+            s.pending_cost = None
+
+        if latency > s.budget:
+            for name, levels in s.knobs:
+                if s.levels[name] < len(levels) - 1:
+                    s.pending_cost = (name, s.levels[name] + 1, latency)
+                    return self._step(stage, name, +1, frame_idx, latency, 'over budget')
+        else:
+            for name, levels in reversed(s.knobs):
+                level = s.levels[name]
+                if level == 0:
+                    continue
+                predicted = latency * s.step_cost.get((name, level), 1.0 / self.headroom)
+                if predicted <= s.budget * self.headroom:
+                    return self._step(stage, name, -1, frame_idx, latency, 'headroom')
+                break
+        return None
+
+    def _step(self, stage, knob, direction, frame_idx, latency, reason):
+        s = self.stages[stage]
+        levels = dict(s.knobs)[knob]
+        old = levels[s.levels[knob]]
+        s.levels[knob] += direction
+        new = levels[s.levels[knob]]
+        s.window.clear()
+        s.last_change = frame_idx
+
+        adjustment = {
+            'time': time.time() - self.start_time,
+            'stage': stage,
+            'frame': frame_idx,
+            'knob': knob,
+            'from': old,
+            'to': new,
+            'latency_ms': latency * 1000,
+            'budget_ms': s.budget * 1000,
+            'reason': reason,
+        }
+        self.adjustments.append(adjustment)
+        arrow = '⬇️ ' if direction > 0 else '⬆️ '
+        self.log(f"   {arrow}[{stage} @ frame {frame_idx}] {knob}: {old} -> {new} "
+                 f"({latency * 1000:.1f} ms/frame vs {s.budget * 1000:.1f} ms budget)")
+        return adjustment
+
+    def summary(self):
+        stage_ms = {name: (t / n * 1000 if n else None) for name, (t, n) in self.stage_times.items()}
+        return {
+            'target_fps': self.target_fps,
+            'stage_ms_per_frame': stage_ms,
+            'final_settings': {name: levels[s.levels[name]]
+                               for s in self.stages.values() for name, levels in s.knobs},
+            'adjustments': self.adjustments,
+        }
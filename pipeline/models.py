@@ -0,0 +1,199 @@
+"""
+Model provisioning
+Resolves weights from a local model directory (verified against its
+checksums.sha256 manifest) and builds ONNX Runtime sessions whose optimized
+graphs are cached on disk, keyed by model hash and session options, so graph
+optimization only runs once per model/runtime combination.
+"""
+
+import os
+import json
+import hashlib
+import platform
+import tempfile
+
+
+CHECKSUM_FILE = 'checksums.sha256'
+DEFAULT_CACHE_DIR = os.path.join('~', '.cache', 'unified_pose_pipeline')
+
+
+def rtmpose_filename(mode):
+    """Local file name for an rtmlib pose mode, e.g. rtmpose-m_simcc-...-e48f03d0_20230504.onnx"""
+    from rtmlib import Body
+    url = Body.MODE[mode]['pose']
+    return os.path.splitext(os.path.basename(url))[0] + '.onnx'
+
+
+def required_models(config, modes=None):
+    """{filename: kind} for every model the config can load (pose modes default to config + controller)"""
+    from .controller import pose_mode_ladder
+    from .trackdet.tracker import TRACKER_BACKENDS
+
+    trackdet = config.trackdet
+    models = {trackdet.detector_weights: 'detector'}
+    if TRACKER_BACKENDS[trackdet.tracker_type].uses_reid and trackdet.use_osnet:
+        models[trackdet.reid_weights] = 'reid'
+
+    if modes is None:
+        controller = config.controller
+        modes = (pose_mode_ladder(config.pose2d.mode)
+                 if controller.enabled and controller.switch_pose_mode else [config.pose2d.mode])
+    for mode in modes:
+        models[rtmpose_filename(mode)] = f'pose:{mode}'
+    return models
+
+
+def _hash_cache_path():
+    return os.path.join(os.path.expanduser(DEFAULT_CACHE_DIR), 'sha256.json')
+
+
+def file_sha256(path, use_cache=True):
+    """SHA-256 of a file; results are cached by (path, inode, size, mtime, ctime) so startup skips rehashing.
+
+    ctime cannot be set from user space, so a file replaced or rewritten in
+    place (even with its mtime preserved) always misses the cache and is rehashed.
+    """
+    stat = os.stat(path)
+    key = (f"{os.path.realpath(path)}:{stat.st_dev}:{stat.st_ino}:{stat.st_size}:"
+           f"{stat.st_mtime_ns}:{stat.st_ctime_ns}")
+    cache_path = _hash_cache_path()
+    cache = {}
+    if use_cache and os.path.exists(cache_path):
+        try:
+            with open(cache_path) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+        if key in cache:
+            return cache[key]
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    sha = digest.hexdigest()
+
+    if use_cache:
+        cache[key] = sha
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        # Write-then-rename so concurrent pipelines never read a torn file
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(cache_path))
+        with os.fdopen(fd, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp, cache_path)
+    return sha
+
+
+def read_checksums(model_dir):
+    """Parse <model_dir>/checksums.sha256 (sha256sum format) into {filename: sha256}"""
+    path = os.path.join(model_dir, CHECKSUM_FILE)
+    checksums = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                if line.strip() and not line.startswith('#'):
+                    sha, name = line.split(maxsplit=1)
+                    checksums[name.strip().lstrip('*')] = sha.lower()
+    return checksums
+
+
+def write_checksums(model_dir, filenames):
+    """Add/refresh entries for filenames in <model_dir>/checksums.sha256"""
+    checksums = read_checksums(model_dir)
+    for name in filenames:
+        checksums[name] = file_sha256(os.path.join(model_dir, name), use_cache=False)
+    with open(os.path.join(model_dir, CHECKSUM_FILE), 'w') as f:
+        for name in sorted(checksums):
+            f.write(f"{checksums[name]}  {name}\n")
+    return checksums
+
+
+def verify_model(model_dir, filename, checksums=None):
+    """Path to a verified local model; raises if it is missing or its checksum is wrong"""
+    path = os.path.join(model_dir, filename)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Model not found: {path} (run scripts/download_models.py --fetch)")
+    checksums = read_checksums(model_dir) if checksums is None else checksums
+    expected = checksums.get(filename)
+    if expected is None:
+        raise ValueError(f"No checksum for {filename} in {os.path.join(model_dir, CHECKSUM_FILE)} "
+                         f"(run scripts/download_models.py --write-checksums)")
+    actual = file_sha256(path)
+    if actual != expected:
+        raise ValueError(f"Checksum mismatch for {path}: expected {expected[:12]}..., got {actual[:12]}...")
+    return path
+
+
+def resolve_model(filename, model_dir=None):
+    """Verified local path when a model directory is configured, else the bare name (library download)"""
+    if model_dir is None:
+        return filename
+    return verify_model(model_dir, filename)
+
+
+def resolve_pose_model(mode, model_dir=None):
+    """Local .onnx path for an rtmlib pose mode, downloading into rtmlib's cache without a model_dir"""
+    if model_dir is not None:
+        return verify_model(model_dir, rtmpose_filename(mode))
+    from rtmlib import Body
+    from rtmlib.tools.file import download_checkpoint
+    return download_checkpoint(Body.MODE[mode]['pose'])
+
+
+def ort_providers(device):
+    """ONNX Runtime providers for a pipeline device string (cpu, cuda, cuda:N)"""
+    if device.startswith('cuda'):
+        device_id = int(device.split(':')[1]) if ':' in device else 0
+        return [('CUDAExecutionProvider', {'device_id': device_id}), 'CPUExecutionProvider']
+    return ['CPUExecutionProvider']
+
+
+def optimized_model_path(onnx_path, providers, options, cache_dir):
+    """Cache file for the optimized graph, keyed by model hash, providers, options and ORT build"""
+    import onnxruntime as ort
+    key = json.dumps({'providers': providers, 'options': options, 'ort': ort.__version__,
+                      'machine': platform.machine()}, sort_keys=True, default=str)
+    model_hash = file_sha256(onnx_path)[:16]
+    options_hash = hashlib.sha256(key.encode()).hexdigest()[:8]
+    stem = os.path.splitext(os.path.basename(onnx_path))[0]
+    return os.path.join(os.path.expanduser(cache_dir), f"{stem}.{model_hash}.{options_hash}.onnx")
+
+
+def create_ort_session(onnx_path, device='cpu', cache_dir=None, intra_op_threads=None,
+                       inter_op_threads=None):
+    """InferenceSession that reuses a cached optimized graph when one exists.
+
+    Returns (session, cache_hit). On a miss the session is built with full
+    graph optimization and ORT writes the optimized graph to the cache; on a
+    hit the cached graph is loaded with optimization disabled.
+    """
+    import onnxruntime as ort
+
+    providers = ort_providers(device)
+    options = ort.SessionOptions()
+    if intra_op_threads:
+        options.intra_op_num_threads = intra_op_threads
+    if inter_op_threads:
+        options.inter_op_num_threads = inter_op_threads
+    if cache_dir is None:
+        return ort.InferenceSession(onnx_path, sess_options=options, providers=providers), False
+
+    cached = optimized_model_path(onnx_path, providers,
+                                  {'intra': intra_op_threads, 'inter': inter_op_threads}, cache_dir)
+    if os.path.exists(cached):
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        try:
+            return ort.InferenceSession(cached, sess_options=options, providers=providers), True
+        except Exception as e:
+            print(f"⚠️  Ignoring unreadable ONNX cache {cached}: {e}")
+            os.remove(cached)
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+    os.makedirs(os.path.dirname(cached), exist_ok=True)
+    # Write to a temp name and rename, so a crash never leaves a half-written cache entry
+    tmp = f"{cached}.{os.getpid()}.tmp"
+    options.optimized_model_filepath = tmp
+    session = ort.InferenceSession(onnx_path, sess_options=options, providers=providers)
+    if os.path.exists(tmp):
+        os.replace(tmp, cached)
+    return session, False
@@ -0,0 +1,392 @@
+"""
+Multi-process staged execution
+Runs decode, detection/tracking and pose/render in separate processes that
+hand frames to each other through a shared-memory FrameRing: the decoder
+writes straight into a ring slot and only slot indices travel over queues.
+UnifiedPosePipeline uses this when runtime.multiprocess is on:
+  stage 1: decode -> trackdet -> (render)
+  stage 2: decode -> pose2d -> (render)
+Per-frame results are sent back to the parent, which keeps the pipeline
+state and writes the data outputs exactly like the single-process path.
+If any process raises, dies or stops making progress for stall_timeout
+seconds, the run is aborted: the other processes are stopped and the shared
+memory is freed.
+"""
+
+import os
+import time
+import queue
+import traceback
+import multiprocessing as mp
+import cv2
+
+from .utils.frame_ring import FrameRing
+from .utils.video_io import FrameReader
+from .utils.motion import MotionGate
+from .trackdet.utils import filter_person_detections
+from .pose2d.postprocess import transfer_keypoints
+
+
+POLL_INTERVAL = 0.1
+DECODE_STAGE = 0
+CRASH_GRACE_POLLS = 3  # empty polls after a process exits before it counts as crashed
+
+
+class StageWorker:
+    """One stage process. Constructed in the parent and pickled to the child,
+    so __init__ must stay light; load models in setup().
+
+    process() receives each frame as a writable ring slot view and returns the
+    (slot, frame_idx, payload) items it is done with, in frame order. A worker
+    may hold slots (e.g. to batch) and return them later or from finish().
+    """
+
+    name = 'stage'
+
+    def setup(self):
+        """Load models / open writers (runs in the worker process)"""
+
+    def process(self, slot, frame_idx, frame, payload):
+        return [(slot, frame_idx, payload)]
+
+    def finish(self):
+        """End of input: return (held items, summary sent to the parent)"""
+        return [], None
+
+    def emit(self, data):
+        """Send a result to the parent's on_data callback (bound by the stage loop)"""
+        raise RuntimeError("emit() is only available inside a running stage")
+
+
+def _acquire(ring, stop):
+    while not stop.is_set():
+        slot = ring.acquire(DECODE_STAGE, timeout=POLL_INTERVAL)
+        if slot is not None:
+            return slot
+    return None
+
+
+def _decode_main(video, ring_spec, out_queue, results, start, stop, frame_indices, max_frames,
+                 seek_min_gap):
+    """Decode frames directly into ring slots and pass their indices downstream"""
+    ring = FrameRing.attach(ring_spec)
+    cap = cv2.VideoCapture(video)
+    reader = FrameReader(cap, frame_indices, max_frames=max_frames, seek_min_gap=seek_min_gap)
+    try:
+        results.put(('ready', 'decode', os.getpid()))
+        while not start.wait(POLL_INTERVAL):
+            if stop.is_set():
+                return
+
+        slot = _acquire(ring, stop)
+        if slot is not None:
+            reader.out = ring.frame(slot)
+            for frame_idx, frame in reader:
+                if frame is not reader.out:
+                    reader.out[...] = frame  # backend could not decode in place
+                out_queue.put((slot, frame_idx, None))
+                slot = _acquire(ring, stop)
+                if slot is None:
+                    return
+                reader.out = ring.frame(slot)
+            ring.release(slot)
+        out_queue.put(None)
+        results.put(('done', 'decode', reader.stats))
+    except Exception:
+        results.put(('error', 'decode', traceback.format_exc()))
+    finally:
+        cap.release()
+        reader.out = None
+        ring.close()
+
+
+def _stage_main(worker, stage, ring_spec, in_queue, out_queue, results, stop):
+    """Claim slots from in_queue, run the worker, forward (or release, if last) its items"""
+    ring = FrameRing.attach(ring_spec)
+    worker.emit = lambda data: results.put(('data', worker.name, data))
+
+    def forward(items):
+        for slot, frame_idx, payload in items:
+            if out_queue is None:
+                ring.release(slot)
+            else:
+                out_queue.put((slot, frame_idx, payload))
+
+    try:
+        worker.setup()
+        results.put(('ready', worker.name, os.getpid()))
+        while not stop.is_set():
+            try:
+                item = in_queue.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if item is None:
+                items, summary = worker.finish()
+                forward(items)
+                if out_queue is not None:
+                    out_queue.put(None)
+                results.put(('done', worker.name, summary))
+                return
+            slot, frame_idx, payload = item
+            ring.claim(slot, stage)
+            forward(worker.process(slot, frame_idx, ring.frame(slot), payload))
+    except Exception:
+        results.put(('error', worker.name, traceback.format_exc()))
+    finally:
+        ring.close()
+
+
+def run_stages(video, frame_shape, workers, num_slots=16, frame_indices=None, max_frames=None,
+               seek_min_gap=250, on_data=None, stall_timeout=None):
+    """Run decode -> workers[0] -> workers[1] ... over a video in separate processes.
+
+    on_data(worker_name, data) receives everything workers emit, in frame
+    order per worker. Timing starts once every process has finished setup,
+    so model loading is excluded. Returns ({name: summary}, elapsed seconds);
+    the 'decode' summary holds FrameReader stats. With stall_timeout, the run
+    is aborted (and hung workers terminated) when no process reports anything
+    for that many seconds, setup included.
+    """
+    names = ['decode'] + [worker.name for worker in workers]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Stage worker names must be unique: {names}")
+    ctx = mp.get_context('spawn')  # fork is unsafe once CUDA/ORT threads exist
+    ring = FrameRing.create(num_slots, frame_shape, ctx)
+    results = ctx.Queue()
+    start, stop = ctx.Event(), ctx.Event()
+    queues = [ctx.Queue() for _ in workers]
+
+    procs = {'decode': ctx.Process(
+        target=_decode_main, name='decode', daemon=True,
+        args=(video, ring.spec(), queues[0], results, start, stop,
+              None if frame_indices is None else sorted(frame_indices), max_frames, seek_min_gap))}
+    for i, worker in enumerate(workers):
+        out_queue = queues[i + 1] if i + 1 < len(workers) else None
+        procs[worker.name] = ctx.Process(
+            target=_stage_main, name=worker.name, daemon=True,
+            args=(worker, i + 1, ring.spec(), queues[i], out_queue, results, stop))
+
+    pids, summaries = {}, {}
+    started = None
+    dead_polls = 0
+    try:
+        for proc in procs.values():
+            proc.start()
+        last_message = time.time()
+        while len(summaries) < len(procs):
+            try:
+                kind, name, data = results.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                dead = [n for n, p in procs.items() if n not in summaries and p.exitcode is not None]
+                dead_polls = dead_polls + 1 if dead else 0
+                if dead_polls >= CRASH_GRACE_POLLS:
+                    name = dead[0]
+                    held = ring.owned_by(pids[name]) if name in pids else []
+                    raise RuntimeError(f"{name} worker died (exit code {procs[name].exitcode}) "
+                                       f"holding ring slots {held}; run aborted")
+                if stall_timeout is not None and time.time() - last_message > stall_timeout:
+                    pending = [n for n in procs if n not in summaries]
+                    raise RuntimeError(f"No progress from stage workers for {stall_timeout:.0f}s "
+                                       f"(unfinished: {pending}); run aborted")
+                continue
+            last_message = time.time()
+
+            if kind == 'data':
+                if on_data is not None:
+                    on_data(name, data)
+            elif kind == 'ready':
+                pids[name] = data
+                if len(pids) == len(procs):
+                    started = time.time()
+                    start.set()
+            elif kind == 'done':
+                summaries[name] = data
+            elif kind == 'error':
+                raise RuntimeError(f"{name} worker failed; run aborted\n{data}")
+        elapsed = time.time() - started
+    finally:
+        stop.set()
+        for proc in procs.values():
+            if proc.pid is None:
+                continue  # never started
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+                proc.join()
+        ring.close()
+        ring.unlink()
+    return summaries, elapsed
+
+
+class TrackDetWorker(StageWorker):
+    """Stage 1: detector + tracker; emits (frame_idx, [(track_id, bbox, conf)], detections, static).
+
+    detections is None unless recording is on and the detector ran on this frame.
+    """
+
+    name = 'trackdet'
+
+    def __init__(self, pipeline_cls, config):
+        self.pipeline_cls = pipeline_cls
+        self.config = config
+
+    def setup(self):
+        self.pipeline = self.pipeline_cls(config=self.config, components=('trackdet',))
+        self.gate = MotionGate.from_config(self.config) if self.config.motion.enabled else None
+        self.detections = self.tracks = None
+
+    def process(self, slot, frame_idx, frame, payload):
+        pipeline = self.pipeline
+        trackdet = pipeline.config.trackdet
+        # Static frames (motion gate) hold the last detections and tracks
+        static = self.gate is not None and self.gate.skip(frame)
+        if not static:
+            results = pipeline.detector(frame, conf=pipeline.confidence_threshold,
+                                        imgsz=trackdet.detector_input_size, verbose=False)
+            self.detections = filter_person_detections(results[0].boxes.data.cpu().numpy(),
+                                                       pipeline.confidence_threshold)
+            self.tracks = [(int(t[4]), [int(v) for v in t[:4]], float(t[5]))
+                           for t in pipeline.tracker.update(self.detections, frame) if len(t) >= 6]
+        # Held frames send no detections, so the recorded stream only has real detector output
+        record = trackdet.record_detections and not static
+        self.emit((frame_idx, self.tracks, self.detections if record else None, static))
+        return [(slot, frame_idx, self.tracks)]
+
+
+class TrackRenderWorker(StageWorker):
+    """Stage 1 video: draws every track box and ID"""
+
+    name = 'trackdet_render'
+
+    def __init__(self, output_path, codec, fps, size):
+        self.output_path = output_path
+        self.codec = codec
+        self.fps = fps
+        self.size = size
+
+    def setup(self):
+        self.writer = cv2.VideoWriter(self.output_path, cv2.VideoWriter_fourcc(*self.codec),
+                                      self.fps, self.size)
+
+    def process(self, slot, frame_idx, frame, tracks):
+        for track_id, (x1, y1, x2, y2), conf in tracks:
+            cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+            cv2.putText(frame, f"ID:{track_id} ({conf:.2f})", (x1, y1-10),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
+        self.writer.write(frame)
+        return [(slot, frame_idx, None)]
+
+    def finish(self):
+        self.writer.release()
+        return [], None
+
+
+class PoseWorker(StageWorker):
+    """Stage 2: batched pose on the target's crops; emits [(frame_idx, keypoints, scores)] per batch.
+
+    Holds at most max_pending slots, which must leave the decoder (and renderer)
+    at least one slot each or the ring would stall.
+    """
+
+    name = 'pose2d'
+
+    def __init__(self, pipeline_cls, config, bbox_data, max_pending, static_frames=()):
+        self.pipeline_cls = pipeline_cls
+        self.config = config
+        self.bbox_data = bbox_data
+        self.max_pending = max_pending
+        self.static_frames = static_frames
+
+    def setup(self):
+        self.pipeline = self.pipeline_cls(config=self.config, components=('pose2d',))
+        self.batch_size = self.config.pose2d.batch_size
+        self.pending = []
+        self.pending_crops = 0
+        self.last_pose = None
+
+    def process(self, slot, frame_idx, frame, payload):
+        bbox = self.bbox_data.get(frame_idx)
+        run_pose = reuse = False
+        if bbox is not None:
+            x1, y1, x2, y2 = bbox
+            run_pose = y2 > y1 and x2 > x1 and x1 >= 0 and y1 >= 0
+        if run_pose and frame_idx in self.static_frames:
+            # Static frames (motion gate) reuse the last keypoints
+            run_pose, reuse = False, True
+        if not run_pose and not reuse and not self.pending:
+            return [(slot, frame_idx, (bbox, None, None))]
+
+        self.pending.append((slot, frame_idx, frame, bbox, run_pose, reuse))
+        self.pending_crops += run_pose
+        if self.pending_crops >= self.batch_size or len(self.pending) >= self.max_pending:
+            return self._flush()
+        return []
+
+    def _flush(self):
+        crops = [(frame, bbox) for _, _, frame, bbox, run_pose, _ in self.pending if run_pose]
+        keypoints = scores = None
+        if crops:
+            try:
+                frames, bboxes = zip(*crops)
+                keypoints, scores = self.pipeline.pose2d.estimate_batch(frames, bboxes)
+            except Exception as e:
+                print(f"⚠️  Pose batch failed ({len(crops)} crops): {e}")
+
+        items, poses = [], []
+        crop_idx = 0
+        for slot, frame_idx, _, bbox, run_pose, reuse in self.pending:
+            frame_kpts = frame_scores = None
+            if run_pose and keypoints is not None:
+                frame_kpts, frame_scores = keypoints[crop_idx], scores[crop_idx]
+                self.last_pose = (bbox, frame_kpts, frame_scores)
+            elif reuse and self.last_pose is not None:
+                last_bbox, last_kpts, frame_scores = self.last_pose
+                frame_kpts = transfer_keypoints(last_kpts, last_bbox, bbox)
+            if frame_kpts is not None:
+                poses.append((frame_idx, frame_kpts, frame_scores))
+            crop_idx += run_pose
+            items.append((slot, frame_idx, (bbox, frame_kpts, frame_scores)))
+        if poses:
+            self.emit(poses)
+        self.pending = []
+        self.pending_crops = 0
+        return items
+
+    def finish(self):
+        return self._flush(), None
+
+
+class PoseRenderWorker(StageWorker):
+    """Stage 2 video: skeleton, bbox and label for the target person"""
+
+    name = 'pose2d_render'
+
+    def __init__(self, output_path, codec, fps, size, target_person_id, kpt_thr):
+        self.output_path = output_path
+        self.codec = codec
+        self.fps = fps
+        self.size = size
+        self.target_person_id = target_person_id
+        self.kpt_thr = kpt_thr
+
+    def setup(self):
+        from .pose2d import SkeletonRenderer
+        self.renderer = SkeletonRenderer('openpose18', kpt_thr=self.kpt_thr)
+        self.writer = cv2.VideoWriter(self.output_path, cv2.VideoWriter_fourcc(*self.codec),
+                                      self.fps, self.size)
+
+    def process(self, slot, frame_idx, frame, payload):
+        bbox, keypoints, scores = payload
+        if bbox is not None:
+            x1, y1, x2, y2 = bbox
+            if keypoints is not None:
+                self.renderer.draw(frame, keypoints, scores)
+            cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+            cv2.putText(frame, f"ID:{self.target_person_id} (Pose2D)",
+                        (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
+        self.writer.write(frame)
+        return [(slot, frame_idx, None)]
+
+    def finish(self):
+        self.writer.release()
+        return [], None
@@ -0,0 +1,291 @@
+"""
+Multi-stream scheduler
+Runs several videos/cameras through one detector and one pose model. Each
+stream keeps its own tracker, while frames from all streams are merged into
+shared detection batches (dispatched when full or when the oldest frame hits
+the latency deadline) and all resulting person crops go through the pose
+model together. Results are routed back per stream, frame and track ID.
+"""
+
+import time
+import queue
+import threading
+import numpy as np
+import cv2
+from collections import defaultdict
+
+from .trackdet.utils import filter_person_detections, select_longest_track
+
+
+def _capture_frames(cap):
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            return
+        yield frame
+
+
+class _Stream:
+    """Per-stream state: frame queue filled by a reader thread, tracker and results"""
+
+    def __init__(self, stream_id, source, tracker, max_frames, queue_size, pose_tracks):
+        self.stream_id = stream_id
+        self.source = source
+        self.tracker = tracker
+        self.max_frames = max_frames
+        self.pose_tracks = pose_tracks
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.finished = False  # reader hit end of stream and the queue is drained
+        self.frames = 0
+        self.results = {}
+        self.track_history = defaultdict(list)
+
+    def pose_track_ids(self, frame_idx, track_ids):
+        """Track IDs on this frame that get pose estimation"""
+        if self.pose_tracks == 'all':
+            return track_ids
+        if self.pose_tracks == 'longest':
+            # Online stand-in for the pipeline's target: the present track seen most so far
+            if not track_ids:
+                return []
+            return [max(track_ids, key=lambda track_id: len(self.track_history[track_id]))]
+        if callable(self.pose_tracks):
+            return self.pose_tracks(frame_idx, track_ids)
+        return [track_id for track_id in track_ids if track_id in self.pose_tracks]
+
+
+class MultiStreamScheduler:
+    """Shared dynamic batching of detection and pose across concurrent streams.
+
+    detector(frames, conf=..., imgsz=..., verbose=False) must accept a list of
+    frames (as ultralytics YOLO does); pose_estimator is a Pose2DEstimator;
+    tracker_factory() returns a fresh TrackingManager per stream.
+
+    pose_tracks picks whose pose is estimated (per stream via add_stream):
+    'all' tracks, 'longest' (the present track seen in the most frames so
+    far, one per frame like the pipeline's target), a collection of track IDs,
+    or a callable(frame_idx, track_ids) returning the IDs to estimate.
+    """
+
+    def __init__(self, detector, pose_estimator, tracker_factory, confidence_threshold=0.5,
+                 detector_input_size=640, max_batch=8, max_latency_ms=20.0,
+                 pose_batch_size=32, queue_size=4, keep_results=True, on_result=None,
+                 pose_tracks='all'):
+        self.detector = detector
+        self.pose_estimator = pose_estimator
+        self.tracker_factory = tracker_factory
+        self.confidence_threshold = confidence_threshold
+        self.detector_input_size = detector_input_size
+        self.max_batch = max_batch
+        self.max_latency = max_latency_ms / 1000.0
+        self.pose_batch_size = pose_batch_size
+        self.queue_size = queue_size
+        self.keep_results = keep_results
+        self.on_result = on_result  # on_result(stream_id, frame_idx, frame, tracks)
+        self.pose_tracks = pose_tracks
+
+        self.streams = {}
+        self._frame_ready = threading.Event()
+        self._stop = threading.Event()
+        self._reset_stats()
+
+    @classmethod
+    def from_pipeline(cls, pipeline, **kwargs):
+        """Share a UnifiedPosePipeline's warm detector and pose model across streams"""
+        trackdet = pipeline.config.trackdet
+        kwargs.setdefault('confidence_threshold', pipeline.confidence_threshold)
+        kwargs.setdefault('detector_input_size', trackdet.detector_input_size)
+        return cls(pipeline.detector, pipeline.pose2d, pipeline.build_tracker, **kwargs)
+
+    def _reset_stats(self):
+        self.det_batches = []
+        self.pose_batches = []
+        self.latencies = []
+        self.det_time = 0.0
+        self.track_time = 0.0
+        self.pose_time = 0.0
+
+    def add_stream(self, stream_id, source, max_frames=None, pose_tracks=None):
+        """Register a video path, camera index or iterable of BGR frames"""
+        if stream_id in self.streams:
+            raise ValueError(f"Stream '{stream_id}' already added")
+        pose_tracks = self.pose_tracks if pose_tracks is None else pose_tracks
+        if isinstance(pose_tracks, str) and pose_tracks not in ('all', 'longest'):
+            raise ValueError(f"pose_tracks must be 'all', 'longest', track IDs or a callable, "
+                             f"got '{pose_tracks}'")
+        self.streams[stream_id] = _Stream(stream_id, source, self.tracker_factory(),
+                                          max_frames, self.queue_size, pose_tracks)
+
+    def _put(self, stream, item):
+        while not self._stop.is_set():
+            try:
+                stream.queue.put(item, timeout=0.1)
+                self._frame_ready.set()
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _reader(self, stream):
+        """Decode frames into the stream's bounded queue; None marks end of stream"""
+        cap = None
+        if isinstance(stream.source, (str, int)):
+            cap = cv2.VideoCapture(stream.source)
+            frames = _capture_frames(cap)
+        else:
+            frames = iter(stream.source)
+        try:
+            for frame_idx, frame in enumerate(frames):
+                if stream.max_frames is not None and frame_idx >= stream.max_frames:
+                    break
+                if not self._put(stream, (frame_idx, frame, time.perf_counter())):
+                    break
+        finally:
+            if cap is not None:
+                cap.release()
+            self._put(stream, None)
+
+    def _collect_batch(self):
+        """Round-robin frames from all streams until the batch is full or the deadline passes"""
+        batch = []
+        deadline = None
+        while len(batch) < self.max_batch:
+            self._frame_ready.clear()
+            took = False
+            for stream in self.streams.values():
+                if stream.finished or len(batch) >= self.max_batch:
+                    continue
+                try:
+                    item = stream.queue.get_nowait()
+                except queue.Empty:
+                    continue
+                if item is None:
+                    stream.finished = True
+                    continue
+                batch.append((stream,) + item)
+                took = True
+
+            if all(s.finished for s in self.streams.values()):
+                break
+            if batch and deadline is None:
+                deadline = batch[0][3] + self.max_latency
+            if took:
+                continue
+            # Nothing new: wait for a reader, but never past the oldest frame's deadline
+            timeout = 0.1 if deadline is None else deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            self._frame_ready.wait(timeout)
+        return batch
+
+    def _process_batch(self, batch):
+        frames = [frame for _, _, frame, _ in batch]
+
+        start = time.perf_counter()
+        det_results = self.detector(frames, conf=self.confidence_threshold,
+                                    imgsz=self.detector_input_size, verbose=False)
+        self.det_time += time.perf_counter() - start
+        self.det_batches.append(len(batch))
+
+        # Trackers stay per-stream; batch order preserves each stream's frame order
+        start = time.perf_counter()
+        frame_tracks = []
+        crops = []
+        for (stream, frame_idx, frame, _), result in zip(batch, det_results):
+            detections = filter_person_detections(result.boxes.data.cpu().numpy(),
+                                                  self.confidence_threshold)
+            tracks = {}
+            for track in stream.tracker.update(detections, frame):
+                x1, y1, x2, y2 = map(int, track[:4])
+                track_id = int(track[4])
+                tracks[track_id] = {'bbox': [x1, y1, x2, y2]}
+                stream.track_history[track_id].append(frame_idx)
+            # Tracks left out by pose_tracks keep only their bbox
+            for track_id in stream.pose_track_ids(frame_idx, list(tracks)):
+                x1, y1, x2, y2 = tracks[track_id]['bbox']
+                if x2 > x1 and y2 > y1:
+                    crops.append((frame, [x1, y1, x2, y2], tracks[track_id]))
+            frame_tracks.append(tracks)
+        self.track_time += time.perf_counter() - start
+
+        # All crops from all streams share pose batches
+        start = time.perf_counter()
+        for i in range(0, len(crops), self.pose_batch_size):
+            chunk = crops[i:i + self.pose_batch_size]
+            images, bboxes, targets = zip(*chunk)
+            keypoints, scores = self.pose_estimator.estimate_batch(images, bboxes)
+            for target, kpts, kpt_scores in zip(targets, keypoints, scores):
+                target['keypoints'] = kpts
+                target['scores'] = kpt_scores
+            self.pose_batches.append(len(chunk))
+        self.pose_time += time.perf_counter() - start
+
+        done = time.perf_counter()
+        for (stream, frame_idx, frame, arrival), tracks in zip(batch, frame_tracks):
+            stream.frames += 1
+            self.latencies.append(done - arrival)
+            if self.keep_results:
+                stream.results[frame_idx] = tracks
+            if self.on_result is not None:
+                self.on_result(stream.stream_id, frame_idx, frame, tracks)
+
+    def run(self):
+        """Process all streams to the end; returns throughput and batching stats"""
+        if not self.streams:
+            raise ValueError("No streams added")
+
+        self._stop.clear()
+        self._reset_stats()
+        readers = [threading.Thread(target=self._reader, args=(stream,), daemon=True)
+                   for stream in self.streams.values()]
+        for reader in readers:
+            reader.start()
+
+        print(f"🎛️  Multi-stream scheduler: {len(self.streams)} streams, "
+              f"max batch {self.max_batch}, deadline {self.max_latency * 1000:.0f} ms")
+        start = time.perf_counter()
+        try:
+            while True:
+                batch = self._collect_batch()
+                if not batch:
+                    if all(s.finished for s in self.streams.values()):
+                        break
+                    continue
+                self._process_batch(batch)
+        finally:
+            self._stop.set()
+            for reader in readers:
+                reader.join()
+        elapsed = time.perf_counter() - start
+
+        stats = self.summary(elapsed)
+        print(f"✅ {stats['total_frames']} frames in {elapsed:.2f}s | "
+              f"Aggregate FPS: {stats['aggregate_fps']:.1f} | "
+              f"Det batch: {stats['mean_det_batch']:.1f} | Pose batch: {stats['mean_pose_batch']:.1f} | "
+              f"Latency p95: {stats['latency_p95_ms']:.0f} ms")
+        return stats
+
+    def summary(self, elapsed):
+        total_frames = sum(s.frames for s in self.streams.values())
+        latencies = np.array(self.latencies) * 1000 if self.latencies else np.zeros(1)
+        streams = {}
+        for stream in self.streams.values():
+            target = select_longest_track(stream.track_history)[0] if stream.track_history else None
+            streams[stream.stream_id] = {'frames': stream.frames,
+                                         'tracks': len(stream.track_history),
+                                         'longest_track': target}
+        return {
+            'total_frames': total_frames,
+            'elapsed': elapsed,
+            'aggregate_fps': total_frames / elapsed if elapsed > 0 else 0,
+            'det_batches': len(self.det_batches),
+            'mean_det_batch': float(np.mean(self.det_batches)) if self.det_batches else 0.0,
+            'pose_batches': len(self.pose_batches),
+            'mean_pose_batch': float(np.mean(self.pose_batches)) if self.pose_batches else 0.0,
+            'det_time': self.det_time,
+            'track_time': self.track_time,
+            'pose_time': self.pose_time,
+            'latency_p50_ms': float(np.percentile(latencies, 50)),
+            'latency_p95_ms': float(np.percentile(latencies, 95)),
+            'streams': streams,
+        }
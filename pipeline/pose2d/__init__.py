@@ -2,4 +2,9 @@
 2D Pose Estimation Module
 """
 
-__all__ = ['Pose2DEstimator']
\ No newline at end of file
+from .estimator import Pose2DEstimator, OnnxPoseModel
+from .postprocess import postprocess_batch, decode_simcc_batch, to_openpose_batch, transfer_keypoints
+from .visualization import SkeletonRenderer
+
+__all__ = ['Pose2DEstimator', 'OnnxPoseModel', 'SkeletonRenderer', 'postprocess_batch',
+           'decode_simcc_batch', 'to_openpose_batch', 'transfer_keypoints']
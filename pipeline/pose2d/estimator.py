@@ -0,0 +1,109 @@
+"""
+Batched 2D pose estimator
+Wraps an rtmlib RTMPose model: affine-crops every bbox straight from its
+frame, runs the crops as one batch and decodes them with the vectorized
+post-processing in postprocess.py.
+"""
+
+import cv2
+import numpy as np
+
+from .postprocess import (bbox_xyxy2cs, fix_aspect_ratio, get_warp_matrices,
+                          postprocess_batch)
+
+
+# rtmlib RTMPose defaults
+RTMPOSE_MEAN = (123.675, 116.28, 103.53)
+RTMPOSE_STD = (58.395, 57.12, 57.375)
+
+
+class OnnxPoseModel:
+    """Minimal RTMPose stand-in around an existing ONNX Runtime session.
+
+    Lets the pipeline use a session built from the optimized-graph cache
+    (pipeline/models.py) instead of the one rtmlib would create itself.
+    """
+
+    backend = 'onnxruntime'
+
+    def __init__(self, session, model_input_size, mean=RTMPOSE_MEAN, std=RTMPOSE_STD):
+        self.session = session
+        self.model_input_size = tuple(model_input_size)
+        self.mean = mean
+        self.std = std
+
+    def inference(self, img):
+        """Single (H, W, 3) normalized crop, same contract as rtmlib's inference"""
+        inputs = {self.session.get_inputs()[0].name:
+                  np.ascontiguousarray(img.transpose(2, 0, 1)[None], dtype=np.float32)}
+        return self.session.run([out.name for out in self.session.get_outputs()], inputs)
+
+
+class Pose2DEstimator:
+    """Top-down pose estimation over batches of (frame, bbox) pairs"""
+
+    def __init__(self, pose_model, to_openpose=True, padding=1.25):
+        self.pose_model = pose_model
+        self.to_openpose = to_openpose
+        self.padding = padding
+        self.input_size = tuple(pose_model.model_input_size)
+
+        mean = pose_model.mean if pose_model.mean is not None else (0., 0., 0.)
+        std = pose_model.std if pose_model.std is not None else (1., 1., 1.)
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.std = np.asarray(std, dtype=np.float32)
+
+        self._batched_session = self._supports_dynamic_batch()
+
+    def _supports_dynamic_batch(self):
+        """True when the ONNX Runtime session accepts batch sizes above 1"""
+        if getattr(self.pose_model, 'backend', None) != 'onnxruntime':
+            return False
+        batch_dim = self.pose_model.session.get_inputs()[0].shape[0]
+        return not isinstance(batch_dim, int) or batch_dim != 1
+
+    def __call__(self, image, bboxes):
+        """Estimate poses for several bboxes in a single frame"""
+        return self.estimate_batch([image] * len(bboxes), bboxes)
+
+    def preprocess_batch(self, images, bboxes):
+        """Warp each bbox region to model input size and normalize the stack"""
+        centers, scales = bbox_xyxy2cs(bboxes, padding=self.padding)
+        scales = fix_aspect_ratio(scales, self.input_size)
+        warp_mats = get_warp_matrices(centers, scales, self.input_size)
+
+        w, h = self.input_size
+        batch = np.empty((len(images), h, w, 3), dtype=np.float32)
+        for i, (image, mat) in enumerate(zip(images, warp_mats)):
+            batch[i] = cv2.warpAffine(image, mat, (w, h), flags=cv2.INTER_LINEAR)
+
+        batch -= self.mean
+        batch /= self.std
+        return batch, centers, scales
+
+    def inference_batch(self, batch):
+        """Run the pose model on an (N, H, W, 3) batch, returning [simcc_x, simcc_y]"""
+        if self._batched_session:
+            session = self.pose_model.session
+            inputs = {session.get_inputs()[0].name:
+                      np.ascontiguousarray(batch.transpose(0, 3, 1, 2))}
+            output_names = [out.name for out in session.get_outputs()]
+            return session.run(output_names, inputs)
+
+        # Fixed batch size or non-ORT backend: one call per crop
+        outputs = [self.pose_model.inference(img) for img in batch]
+        return [np.concatenate(parts, axis=0) for parts in zip(*outputs)]
+
+    def estimate_batch(self, images, bboxes):
+        """Estimate one pose per (image, bbox) pair.
+
+        Returns (N, K, 2) keypoints in frame coordinates and (N, K) scores.
+        """
+        if len(bboxes) == 0:
+            num_kpts = 18 if self.to_openpose else 17
+            return np.empty((0, num_kpts, 2), np.float32), np.empty((0, num_kpts), np.float32)
+
+        batch, centers, scales = self.preprocess_batch(images, bboxes)
+        outputs = self.inference_batch(batch)
+        return postprocess_batch(outputs, centers, scales, self.input_size,
+                                 to_openpose=self.to_openpose)
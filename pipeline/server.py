@@ -0,0 +1,290 @@
+"""
+Local inference server
+Keeps warm UnifiedPosePipeline instances (detector, tracker factory, pose
+sessions) in memory and runs video-path jobs from a priority queue on a fixed
+number of worker threads. Jobs are submitted and polled over HTTP on localhost
+or a Unix socket; see pipeline/client.py and scripts/serve_pipeline.py.
+
+Endpoints:
+    GET    /health          worker/queue summary
+    GET    /jobs            all jobs
+    POST   /jobs            {"video": path, "priority": 0, "max_frames": null}
+    GET    /jobs/<id>       job status, timing and result
+    DELETE /jobs/<id>       cancel a queued job
+"""
+
+import os
+import json
+import time
+import queue
+import socket
+import itertools
+import threading
+import socketserver
+from dataclasses import dataclass, field, asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+@dataclass
+class Job:
+    job_id: str
+    video: str
+    priority: int = 0
+    max_frames: Optional[int] = None
+    output_dir: Optional[str] = None
+    status: str = 'queued'  # queued, running, done, failed, cancelled
+    worker: Optional[int] = None
+    error: Optional[str] = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    timing: dict = field(default_factory=dict)
+    result: Optional[dict] = None
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def _job_timing(job, result):
+    """Queue wait, wall time and per-stage timing for a finished job"""
+    timing = {'queue_time': job.started_at - job.submitted_at,
+              'run_time': job.finished_at - job.started_at}
+    if result:
+        tracking = result.get('tracking_results', {})
+        pose = result.get('pose_results', {})
+        timing.update({
+            'frames': tracking.get('frame_count'),
+            'stage1_time': tracking.get('stage1_time'),
+            'stage2_time': pose.get('stage2_time'),
+            'overall_fps': result.get('overall_fps'),
+        })
+    return timing
+
+
+def _to_json(obj):
+    """JSON-encode results that may contain numpy scalars/arrays"""
+    return json.dumps(obj, default=lambda o: o.tolist() if hasattr(o, 'tolist') else str(o))
+
+
+class PipelineServer:
+    """Priority job queue served by warm pipelines, one per worker thread.
+
+    pipeline_factory() must return an object with reset(output_dir) and
+    run_complete_pipeline(video, max_frames); by default it builds a
+    UnifiedPosePipeline from config. Higher priority jobs run first; equal
+    priorities run in submission order.
+    """
+
+    def __init__(self, config=None, workers=1, pipeline_factory=None,
+                 output_dir='unifiedpipelineoutputs/jobs'):
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        if pipeline_factory is None:
+            from .unified_pipeline import UnifiedPosePipeline
+            pipeline_factory = lambda: UnifiedPosePipeline(config=config)
+
+        self.pipeline_factory = pipeline_factory
+        self.num_workers = workers
+        self.output_dir = output_dir
+
+        self._queue = queue.PriorityQueue()
+        self._order = itertools.count()
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._threads = []
+        self._accepting = False
+        self.startup_time = None
+
+    def start(self):
+        """Build one warm pipeline per worker, then start the worker threads"""
+        print(f"🔥 Warming {self.num_workers} pipeline worker(s)...")
+        start = time.time()
+        pipelines = [self.pipeline_factory() for _ in range(self.num_workers)]
+        self.startup_time = time.time() - start
+        print(f"✅ Workers ready in {self.startup_time:.2f}s")
+
+        for worker_id, pipeline in enumerate(pipelines):
+            thread = threading.Thread(target=self._worker, args=(worker_id, pipeline),
+                                      name=f'pipeline-worker-{worker_id}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        self._accepting = True
+        return self
+
+    def submit(self, video, priority=0, max_frames=None, output_dir=None):
+        """Queue a video-path job; returns the job as a dict"""
+        if not self._accepting:
+            raise RuntimeError("Server is not accepting jobs")
+        if not os.path.exists(video):
+            raise FileNotFoundError(f"Input video not found: {video}")
+
+        with self._lock:
+            order = next(self._order)
+            job_id = f'job-{order:05d}'
+            job = Job(job_id, video, int(priority), max_frames,
+                      output_dir or os.path.join(self.output_dir, job_id))
+            self._jobs[job_id] = job
+        self._queue.put((-job.priority, order, job_id))
+        print(f"📥 Queued {job_id}: {video} (priority {job.priority})")
+        return job.to_dict()
+
+    def get_job(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.to_dict() if job else None
+
+    def list_jobs(self):
+        with self._lock:
+            return [job.to_dict() for job in self._jobs.values()]
+
+    def cancel(self, job_id):
+        """Cancel a queued job; running and finished jobs are left alone"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job.status == 'queued':
+                job.status = 'cancelled'
+                job.finished_at = time.time()
+            return job.to_dict()
+
+    def health(self):
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        return {
+            'status': 'ok' if self._accepting else 'stopped',
+            'workers': self.num_workers,
+            'startup_time': self.startup_time,
+            **{s: statuses.count(s) for s in ('queued', 'running', 'done', 'failed', 'cancelled')},
+        }
+
+    def _worker(self, worker_id, pipeline):
+        while True:
+            _, _, job_id = self._queue.get()
+            if job_id is None:
+                return
+            with self._lock:
+                job = self._jobs[job_id]
+                if job.status != 'queued':
+                    continue
+                job.status, job.worker, job.started_at = 'running', worker_id, time.time()
+
+            result, error = None, None
+            try:
+                pipeline.reset(output_dir=job.output_dir)
+                result = pipeline.run_complete_pipeline(job.video, max_frames=job.max_frames)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+
+            with self._lock:
+                job.finished_at = time.time()
+                job.status = 'failed' if error else 'done'
+                job.error = error
+                job.result = json.loads(_to_json(result)) if result is not None else None
+                job.timing = _job_timing(job, job.result)
+            print(f"{'❌' if error else '✅'} {job_id} {job.status} in {job.timing['run_time']:.2f}s")
+
+    def shutdown(self, wait=True):
+        """Stop accepting jobs, cancel queued ones and stop the workers"""
+        self._accepting = False
+        with self._lock:
+            for job in self._jobs.values():
+                if job.status == 'queued':
+                    job.status, job.finished_at = 'cancelled', time.time()
+        for _ in self._threads:
+            self._queue.put((float('inf'), next(self._order), None))
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
+
+    def make_http_server(self, host='127.0.0.1', port=8765, socket_path=None):
+        """HTTP server bound to host:port, or to a Unix socket if socket_path is given"""
+        handler = type('BoundHandler', (_RequestHandler,), {'server_app': self})
+        if socket_path:
+            return _UnixHTTPServer(socket_path, handler)
+        return ThreadingHTTPServer((host, port), handler)
+
+    def serve(self, host='127.0.0.1', port=8765, socket_path=None):
+        """Start workers and block serving HTTP until interrupted"""
+        if not self._threads:
+            self.start()
+        httpd = self.make_http_server(host, port, socket_path)
+        where = socket_path or f"http://{host}:{httpd.server_address[1]}"
+        print(f"🌐 Pipeline server listening on {where}")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("\n🛑 Shutting down...")
+        finally:
+            httpd.server_close()
+            self.shutdown()
+
+
+class _UnixHTTPServer(ThreadingHTTPServer):
+    address_family = socket.AF_UNIX
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        socketserver.TCPServer.server_bind(self)
+        self.server_name, self.server_port = 'localhost', 0
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server_app = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload):
+        body = _to_json(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _job_id(self):
+        parts = self.path.strip('/').split('/')
+        return parts[1] if len(parts) == 2 and parts[0] == 'jobs' else None
+
+    def do_GET(self):
+        app = self.server_app
+        if self.path == '/health':
+            return self._send(200, app.health())
+        if self.path.rstrip('/') == '/jobs':
+            return self._send(200, app.list_jobs())
+        job = app.get_job(self._job_id()) if self._job_id() else None
+        if job is None:
+            return self._send(404, {'error': f'Not found: {self.path}'})
+        self._send(200, job)
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/jobs':
+            return self._send(404, {'error': f'Not found: {self.path}'})
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+            job = self.server_app.submit(request['video'], priority=request.get('priority', 0),
+                                         max_frames=request.get('max_frames'),
+                                         output_dir=request.get('output_dir'))
+        except KeyError:
+            return self._send(400, {'error': "Missing 'video'"})
+        except RuntimeError as e:
+            return self._send(503, {'error': str(e)})
+        except (ValueError, TypeError, FileNotFoundError) as e:
+            return self._send(400, {'error': str(e)})
+        self._send(202, job)
+
+    def do_DELETE(self):
+        job = self.server_app.cancel(self._job_id()) if self._job_id() else None
+        if job is None:
+            return self._send(404, {'error': f'Not found: {self.path}'})
+        self._send(200, job)
@@ -2,4 +2,8 @@
 Tracking & Detection Module
 """
 
-__all__ = ['TrackingManager']
\ No newline at end of file
+from .tracker import TrackingManager, IoUTracker, register_tracker, TRACKER_BACKENDS
+from .replay import replay_stream, sweep_tracker_params, expand_grid
+
+__all__ = ['TrackingManager', 'IoUTracker', 'register_tracker', 'TRACKER_BACKENDS',
+           'replay_stream', 'sweep_tracker_params', 'expand_grid']
@@ -0,0 +1,197 @@
+"""
+Offline tracker replay and parameter sweeps
+Runs tracker configurations over a recorded detection stream (see
+save_detection_stream) without decoding video or running the detector,
+fanning configurations out over worker processes.
+"""
+
+import os
+import time
+import itertools
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .tracker import TrackingManager, DEFAULT_TRACKER_PARAMS, greedy_match
+from .utils import iou_matrix, select_longest_track
+
+
+def expand_grid(grid):
+    """Expand {'max_age': [10, 30], 'min_hits': [1, 3]} into a list of config dicts"""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def replay_stream(frames, tracker_type='iou', frame_shape=(1080, 1920), device='cpu',
+                  **tracker_params):
+    """Run one tracker configuration over recorded detections.
+
+    Returns a list with one (M, 5) [x1, y1, x2, y2, track_id] array per frame.
+    """
+    manager = TrackingManager(tracker_type=tracker_type, device=device, **tracker_params)
+    # Trackers that look at pixels get a blank frame of the recorded size
+    frame = np.zeros((int(frame_shape[0]), int(frame_shape[1]), 3), np.uint8)
+    return [manager.update(dets, frame)[:, :5].astype(np.float32) for dets in frames]
+
+
+def hold_tracks(frame_tracks, frame_indices, frame_count=None):
+    """Spread per-update track arrays over video frames, as stage 1 does.
+
+    Each update's tracks are held until the next recorded frame index (stage 1
+    keeps the last tracks between detector runs and on motion-skipped frames);
+    frames before the first update have no tracks. frame_count defaults to one
+    past the last recorded index.
+    """
+    frame_indices = np.asarray(frame_indices, dtype=np.int64)
+    if frame_count is None:
+        frame_count = int(frame_indices[-1]) + 1 if len(frame_indices) else 0
+    empty = np.empty((0, 5), np.float32)
+    # Update that is current on each video frame (-1 before the first one)
+    current = np.searchsorted(frame_indices, np.arange(frame_count), side='right') - 1
+    return [frame_tracks[i] if i >= 0 else empty for i in current]
+
+
+def tracks_to_history(frame_tracks):
+    """Convert per-frame track arrays to {track_id: [frame indices]}, like stage 1's track_history"""
+    history = defaultdict(list)
+    for frame_idx, tracks in enumerate(frame_tracks):
+        for track_id in tracks[:, 4].astype(int):
+            history[int(track_id)].append(frame_idx)
+    return history
+
+
+def count_fragmentations(history):
+    """Number of times a track disappears and later comes back under the same ID"""
+    return int(sum(np.count_nonzero(np.diff(frames) > 1) for frames in history.values()))
+
+
+def id_switch_stats(frame_tracks, reference_tracks, iou_threshold=0.5):
+    """Compare tracks against a reference run, CLEAR-MOT style.
+
+    Each reference track is matched per frame to a track by IoU; an ID switch
+    is counted whenever the matched ID differs from its previous match.
+    Returns (total switches, {reference_id: switches}, recall vs reference).
+    """
+    last_match = {}
+    switches = defaultdict(int)
+    matched = total = 0
+    for tracks, reference in zip(frame_tracks, reference_tracks):
+        total += len(reference)
+        if not len(tracks) or not len(reference):
+            continue
+        pairs = greedy_match(iou_matrix(reference[:, :4], tracks[:, :4]), iou_threshold)
+        for ref_idx, track_idx in pairs:
+            ref_id, track_id = int(reference[ref_idx, 4]), int(tracks[track_idx, 4])
+            if last_match.get(ref_id, track_id) != track_id:
+                switches[ref_id] += 1
+            last_match[ref_id] = track_id
+        matched += len(pairs)
+    recall = matched / total if total else 0.0
+    return sum(switches.values()), dict(switches), recall
+
+
+def target_agreement(frame_tracks, target_id, reference_tracks, reference_target_id,
+                     iou_threshold=0.5):
+    """Fraction of the reference target's frames where this run's target covers the same box"""
+    agree = present = 0
+    for tracks, reference in zip(frame_tracks, reference_tracks):
+        ref_box = reference[reference[:, 4] == reference_target_id, :4]
+        if not len(ref_box):
+            continue
+        present += 1
+        box = tracks[tracks[:, 4] == target_id, :4]
+        if len(box) and iou_matrix(ref_box, box)[0, 0] >= iou_threshold:
+            agree += 1
+    return agree / present if present else 0.0
+
+
+def evaluate_config(frames, config, reference_tracks=None, frame_shape=(1080, 1920),
+                    device='cpu', frame_indices=None, frame_count=None):
+    """Replay one configuration and summarize target selection and ID stability.
+
+    With frame_indices (from load_detection_stream) tracks are held between
+    updates, so frame counts and reference comparisons are in video frames;
+    reference_tracks must then already be per video frame (see hold_tracks).
+    """
+    start = time.perf_counter()
+    frame_tracks = replay_stream(frames, frame_shape=frame_shape, device=device, **config)
+    elapsed = time.perf_counter() - start
+    if frame_indices is not None:
+        frame_tracks = hold_tracks(frame_tracks, frame_indices, frame_count)
+
+    history = tracks_to_history(frame_tracks)
+    target_id, target_frames, target_start, target_end = select_longest_track(history)
+    result = {
+        'config': config,
+        'num_ids': len(history),
+        'fragmentations': count_fragmentations(history),
+        'target_id': target_id,
+        'target_frames': target_frames,
+        'target_start': target_start,
+        'target_end': target_end,
+        'ms_per_frame': elapsed * 1000 / max(len(frames), 1),
+    }
+
+    if reference_tracks is not None:
+        ref_target_id = select_longest_track(tracks_to_history(reference_tracks))[0]
+        switches, per_track, recall = id_switch_stats(frame_tracks, reference_tracks)
+        result.update({
+            'id_switches': switches,
+            'target_id_switches': per_track.get(ref_target_id, 0),
+            'recall_vs_reference': recall,
+            'target_agreement': target_agreement(frame_tracks, target_id, reference_tracks,
+                                                 ref_target_id),
+        })
+    return result
+
+
+# Per-process state so the stream and reference are shipped to each worker once
+_WORKER_STATE = {}
+
+
+def _init_worker(frames, reference_tracks, frame_shape, device, frame_indices, frame_count):
+    _WORKER_STATE.update(frames=frames, reference_tracks=reference_tracks,
+                         frame_shape=frame_shape, device=device, frame_indices=frame_indices,
+                         frame_count=frame_count)
+
+
+def _evaluate_in_worker(config):
+    return evaluate_config(_WORKER_STATE['frames'], config, _WORKER_STATE['reference_tracks'],
+                           _WORKER_STATE['frame_shape'], _WORKER_STATE['device'],
+                           _WORKER_STATE['frame_indices'], _WORKER_STATE['frame_count'])
+
+
+def sweep_tracker_params(frames, configs, reference_config=None, frame_shape=(1080, 1920),
+                         workers=None, device='cpu', frame_indices=None, frame_count=None):
+    """Evaluate many tracker configurations over one recorded detection stream.
+
+    Args:
+        frames: list of per-frame (N, 6) detection arrays.
+        configs: list of dicts with tracker_type and/or tracker params.
+        reference_config: configuration whose tracks ID switches are measured
+            against (defaults to the 'iou' tracker with default params).
+        workers: worker processes; 1 runs everything in this process.
+        frame_indices: video frame of each detection array, frame_count: frames
+            in the video (metadata from load_detection_stream); statistics are
+            then counted in video frames rather than detector updates.
+
+    Returns one result dict per config, in input order.
+    """
+    reference_config = reference_config or dict(tracker_type='iou', **DEFAULT_TRACKER_PARAMS)
+    reference_tracks = replay_stream(frames, frame_shape=frame_shape, device=device,
+                                     **reference_config)
+    if frame_indices is not None:
+        reference_tracks = hold_tracks(reference_tracks, frame_indices, frame_count)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [evaluate_config(frames, config, reference_tracks, frame_shape, device,
+                                frame_indices, frame_count)
+                for config in configs]
+
+    chunksize = max(1, len(configs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(frames, reference_tracks, frame_shape, device, frame_indices,
+                                       frame_count)) as pool:
+        return list(pool.map(_evaluate_in_worker, configs, chunksize=chunksize))
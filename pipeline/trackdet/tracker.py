@@ -0,0 +1,255 @@
+"""
+Tracker backends
+TrackingManager builds a tracker from a name + params and hides which
+library implements it. Besides the boxmot trackers it ships IoUTracker, a
+pure-NumPy IoU/Kalman tracker for the simple single-subject case.
+"""
+
+import numpy as np
+
+from .utils import iou_matrix
+
+
+REID_WEIGHTS = 'osnet_x0_25_msmt17.pt'
+
+DEFAULT_TRACKER_PARAMS = {
+    'det_thresh': 0.2,
+    'max_age': 30,
+    'min_hits': 3,
+    'iou_threshold': 0.3,
+}
+
+
+def greedy_match(scores, threshold):
+    """Greedily pair rows and columns of a score matrix, best pair first.
+
+    Returns an (M, 2) int array of (row, col) matches with score >= threshold.
+    """
+    scores = scores.copy()
+    matches = []
+    for _ in range(min(scores.shape)):
+        row, col = np.unravel_index(np.argmax(scores), scores.shape)
+        if scores[row, col] < threshold:
+            break
+        matches.append((row, col))
+        scores[row, :] = -1
+        scores[:, col] = -1
+    return np.asarray(matches, dtype=np.intp).reshape(-1, 2)
+
+
+class IoUTracker:
+    """SORT-style tracker: constant-velocity Kalman filter + greedy IoU association.
+
+    All tracks live in stacked arrays, so predict/update are batched matrix
+    ops no matter how many tracks are alive. No appearance model, so no
+    extra network runs per detection. update() returns rows in boxmot's
+    layout: [x1, y1, x2, y2, id, conf, cls, det_ind].
+    """
+
+    # Box-size-relative noise, as in DeepSORT's Kalman filter
+    STD_WEIGHT_POSITION = 1. / 20
+    STD_WEIGHT_VELOCITY = 1. / 160
+
+    def __init__(self, det_thresh=0.2, max_age=30, min_hits=3, iou_threshold=0.3, **kwargs):
+        self.det_thresh = det_thresh
+        self.max_age = max_age
+        self.min_hits = min_hits
+        self.iou_threshold = iou_threshold
+
+        # State is [cx, cy, w, h, vx, vy, vw, vh]
+        self._F = np.eye(8, dtype=np.float64)
+        self._F[:4, 4:] = np.eye(4)
+        self.reset()
+
+    def reset(self):
+        """Drop all tracks and restart ID numbering"""
+        self.frame_count = 0
+        self.next_id = 1
+        self.ids = np.empty(0, dtype=np.int64)
+        self.mean = np.empty((0, 8))
+        self.cov = np.empty((0, 8, 8))
+        self.hit_streak = np.empty(0, dtype=np.int64)
+        self.time_since_update = np.empty(0, dtype=np.int64)
+        self.conf = np.empty(0)
+        self.cls = np.empty(0)
+
+    @staticmethod
+    def _xyxy_to_cxcywh(boxes):
+        wh = boxes[:, 2:4] - boxes[:, :2]
+        return np.concatenate([boxes[:, :2] + wh / 2, wh], axis=1)
+
+    def _predicted_boxes(self):
+        cxcy, wh = self.mean[:, :2], np.maximum(self.mean[:, 2:4], 1.0)
+        return np.concatenate([cxcy - wh / 2, cxcy + wh / 2], axis=1)
+
+    def _size_std(self, wh, weight):
+        return weight * np.concatenate([wh, wh], axis=1)
+
+    def _predict(self):
+        wh = np.maximum(self.mean[:, 2:4], 1.0)
+        q = np.concatenate([self._size_std(wh, self.STD_WEIGHT_POSITION),
+                            self._size_std(wh, self.STD_WEIGHT_VELOCITY)], axis=1) ** 2
+
+        self.mean = self.mean @ self._F.T
+        self.cov = self._F @ self.cov @ self._F.T
+        diag = np.arange(8)
+        self.cov[:, diag, diag] += q
+        self.time_since_update += 1
+
+    def _update(self, track_idx, measurements):
+        mean, cov = self.mean[track_idx], self.cov[track_idx]
+        r = self._size_std(measurements[:, 2:4], self.STD_WEIGHT_POSITION) ** 2
+
+        # Kalman gain K = P H^T S^-1 with H = [I 0], solved for all matches at once
+        innovation_cov = cov[:, :4, :4] + r[:, :, None] * np.eye(4)
+        gain = np.linalg.solve(innovation_cov, cov[:, :4, :]).transpose(0, 2, 1)
+        innovation = measurements - mean[:, :4]
+
+        self.mean[track_idx] = mean + (gain @ innovation[:, :, None])[:, :, 0]
+        self.cov[track_idx] = cov - gain @ cov[:, :4, :]
+
+    def _spawn(self, measurements, conf, cls):
+        n = len(measurements)
+        wh = np.maximum(measurements[:, 2:4], 1.0)
+        std = np.concatenate([2 * self._size_std(wh, self.STD_WEIGHT_POSITION),
+                              10 * self._size_std(wh, self.STD_WEIGHT_VELOCITY)], axis=1)
+        mean = np.concatenate([measurements, np.zeros((n, 4))], axis=1)
+        cov = np.zeros((n, 8, 8))
+        diag = np.arange(8)
+        cov[:, diag, diag] = std ** 2
+
+        self.ids = np.concatenate([self.ids, np.arange(self.next_id, self.next_id + n)])
+        self.next_id += n
+        self.mean = np.concatenate([self.mean, mean])
+        self.cov = np.concatenate([self.cov, cov])
+        self.hit_streak = np.concatenate([self.hit_streak, np.ones(n, dtype=np.int64)])
+        self.time_since_update = np.concatenate([self.time_since_update, np.zeros(n, dtype=np.int64)])
+        self.conf = np.concatenate([self.conf, conf])
+        self.cls = np.concatenate([self.cls, cls])
+
+    def _keep(self, mask):
+        for name in ('ids', 'mean', 'cov', 'hit_streak', 'time_since_update', 'conf', 'cls'):
+            setattr(self, name, getattr(self, name)[mask])
+
+    def update(self, dets, img=None):
+        """Advance one frame with (N, 6) [x1, y1, x2, y2, conf, cls] detections"""
+        self.frame_count += 1
+        dets = np.asarray(dets, dtype=np.float64).reshape(-1, 6)
+        det_ind = np.flatnonzero(dets[:, 4] >= self.det_thresh)
+        dets = dets[det_ind]
+        measurements = self._xyxy_to_cxcywh(dets[:, :4])
+
+        self._predict()
+        matches = greedy_match(iou_matrix(self._predicted_boxes(), dets[:, :4]),
+                               self.iou_threshold)
+        track_idx, det_idx = matches[:, 0], matches[:, 1]
+
+        if len(matches):
+            self._update(track_idx, measurements[det_idx])
+            self.time_since_update[track_idx] = 0
+            self.conf[track_idx] = dets[det_idx, 4]
+            self.cls[track_idx] = dets[det_idx, 5]
+        missed = self.time_since_update > 0
+        self.hit_streak[missed] = 0
+        self.hit_streak[track_idx] += 1
+
+        # Matched detection index per track, -1 for tracks without a match
+        track_det = np.full(len(self.ids), -1, dtype=np.int64)
+        track_det[track_idx] = det_ind[det_idx]
+
+        unmatched = np.ones(len(dets), dtype=bool)
+        unmatched[det_idx] = False
+        if unmatched.any():
+            self._spawn(measurements[unmatched], dets[unmatched, 4], dets[unmatched, 5])
+            track_det = np.concatenate([track_det, det_ind[unmatched]])
+
+        alive = self.time_since_update <= self.max_age
+        if not alive.all():
+            self._keep(alive)
+            track_det = track_det[alive]
+
+        confirmed = (self.hit_streak >= self.min_hits) | (self.frame_count <= self.min_hits)
+        out = (self.time_since_update == 0) & confirmed
+        if not out.any():
+            return np.empty((0, 8))
+        return np.column_stack([self._predicted_boxes()[out], self.ids[out], self.conf[out],
+                                self.cls[out], track_det[out]])
+
+
+def _build_iou(device=None, reid_weights=None, use_reid=False, half=False, per_class=False,
+               **params):
+    return IoUTracker(**params)
+
+
+_build_iou.uses_reid = False
+
+
+def _boxmot_builder(class_name, uses_reid):
+    def build(device='cuda', reid_weights=REID_WEIGHTS, use_reid=True, half=False,
+              per_class=False, **params):
+        import boxmot
+        config = dict(params, per_class=per_class)
+        # Only appearance-based trackers get ReID weights; motion-only ones never load osnet
+        if uses_reid:
+            config.update(model_weights=reid_weights, device=device, half=half)
+            if not use_reid:
+                if class_name != 'BotSort':
+                    raise ValueError(f"{class_name} cannot run without ReID")
+                config['with_reid'] = False
+        return getattr(boxmot, class_name)(**config)
+    build.uses_reid = uses_reid
+    return build
+
+
+TRACKER_BACKENDS = {
+    'iou': _build_iou,
+    'ocsort': _boxmot_builder('OcSort', uses_reid=False),
+    'bytetrack': _boxmot_builder('ByteTrack', uses_reid=False),
+    'botsort': _boxmot_builder('BotSort', uses_reid=True),
+    'strongsort': _boxmot_builder('StrongSort', uses_reid=True),
+}
+
+
+def register_tracker(name, builder, uses_reid=False):
+    """Register a tracker backend; builder(**params) must return an object with update(dets, img)"""
+    builder.uses_reid = uses_reid
+    TRACKER_BACKENDS[name] = builder
+
+
+class TrackingManager:
+    """Owns the active tracker and builds fresh ones from the same configuration"""
+
+    def __init__(self, tracker_type='ocsort', device='cuda', reid_weights=REID_WEIGHTS,
+                 use_reid=True, half=False, per_class=False, **tracker_params):
+        if tracker_type not in TRACKER_BACKENDS:
+            raise ValueError(f"Unknown tracker '{tracker_type}'. "
+                             f"Options: {sorted(TRACKER_BACKENDS)}")
+        self.tracker_type = tracker_type
+        self.builder_kwargs = dict(device=device, reid_weights=reid_weights, use_reid=use_reid,
+                                   half=half, per_class=per_class)
+        self.tracker_params = dict(DEFAULT_TRACKER_PARAMS, **tracker_params)
+        self.tracker = self.create_tracker()
+
+    @property
+    def uses_reid(self):
+        return TRACKER_BACKENDS[self.tracker_type].uses_reid and self.builder_kwargs['use_reid']
+
+    def create_tracker(self):
+        """Build a new, independent tracker with this manager's configuration"""
+        return TRACKER_BACKENDS[self.tracker_type](**self.builder_kwargs, **self.tracker_params)
+
+    def reset(self):
+        """Clear tracker state before a new video.
+
+        Backends with their own reset() are reset in place, which keeps loaded
+        ReID weights; the rest are replaced with a fresh tracker.
+        """
+        if callable(getattr(self.tracker, 'reset', None)):
+            self.tracker.reset()
+        else:
+            self.tracker = self.create_tracker()
+
+    def update(self, detections, frame):
+        """Feed (N, 6) detections for one frame, returning boxmot-style track rows"""
+        tracks = np.asarray(self.tracker.update(detections, frame))
+        return tracks if tracks.ndim == 2 else tracks.reshape(0, 8)
@@ -0,0 +1,78 @@
+"""
+Tracking & detection helpers
+Vectorized box math plus save/load of recorded per-frame detection streams
+"""
+
+import numpy as np
+
+
+def iou_matrix(boxes_a, boxes_b):
+    """Pairwise IoU between (N, 4) and (M, 4) xyxy boxes, returned as (N, M)"""
+    boxes_a = np.asarray(boxes_a, dtype=np.float32).reshape(-1, 4)
+    boxes_b = np.asarray(boxes_b, dtype=np.float32).reshape(-1, 4)
+
+    x1 = np.maximum(boxes_a[:, None, 0], boxes_b[None, :, 0])
+    y1 = np.maximum(boxes_a[:, None, 1], boxes_b[None, :, 1])
+    x2 = np.minimum(boxes_a[:, None, 2], boxes_b[None, :, 2])
+    y2 = np.minimum(boxes_a[:, None, 3], boxes_b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+
+
+def filter_person_detections(detections, confidence_threshold, person_class=0):
+    """Keep (N, 6) [x1, y1, x2, y2, conf, cls] rows for confident person detections"""
+    detections = np.asarray(detections, dtype=np.float32)
+    detections = detections.reshape(-1, detections.shape[-1] if detections.ndim > 1 else 6)[:, :6]
+    keep = (detections[:, 5] == person_class) & (detections[:, 4] >= confidence_threshold)
+    return detections[keep]
+
+
+def save_detection_stream(path, detections, frame_indices=None, **metadata):
+    """Save a list of per-frame (N, 6) detection arrays to a compressed .npz file.
+
+    frame_indices gives the video frame each array came from; frames where
+    the detector did not run (detection interval, motion gate) are simply
+    absent, so replay feeds the tracker exactly the updates stage 1 made.
+    Pass frame_count as metadata so replay can hold tracks to the video's end
+    (see replay.hold_tracks).
+    """
+    counts = np.array([len(d) for d in detections], dtype=np.int64)
+    flat = (np.concatenate(detections).astype(np.float32) if len(detections)
+            else np.empty((0, 6), np.float32))
+    if frame_indices is None:
+        frame_indices = np.arange(len(detections))
+    np.savez_compressed(path, detections=flat.reshape(-1, 6), counts=counts,
+                        frames=np.asarray(frame_indices, dtype=np.int64),
+                        **{f'meta_{k}': v for k, v in metadata.items()})
+
+
+def load_detection_stream(path):
+    """Load a recorded detection stream as (list of (N, 6) arrays, metadata dict).
+
+    metadata['frame_indices'] holds the video frame of each array (consecutive
+    for streams recorded before indices were stored).
+    """
+    with np.load(path) as data:
+        counts = data['counts']
+        frames = np.split(data['detections'], np.cumsum(counts)[:-1]) if len(counts) else []
+        metadata = {k[len('meta_'):]: data[k].item() for k in data.files if k.startswith('meta_')}
+        metadata['frame_indices'] = data['frames'] if 'frames' in data.files else np.arange(len(counts))
+    return frames, metadata
+
+
+def select_longest_track(track_history):
+    """Pick the track seen in the most frames, as the pipeline's target person.
+
+    Returns (track_id, num_frames, start_frame, end_frame); ties keep the
+    track that was seen first.
+    """
+    longest_id, max_frames, start_frame, end_frame = None, 0, 0, 0
+    for track_id, frames in track_history.items():
+        if len(frames) > max_frames:
+            longest_id, max_frames = track_id, len(frames)
+            start_frame, end_frame = min(frames), max(frames)
+    return longest_id, max_frames, start_frame, end_frame
@@ -8,78 +8,271 @@ import time
 import json
 import os
 import sys
+import threading
+import contextlib
 import numpy as np
-from collections import defaultdict
+from collections import defaultdict, deque
+
+from .config import load_config
+from .controller import ThroughputController, pose_mode_ladder
+from .models import resolve_model, resolve_pose_model, create_ort_session
+from .trackdet.utils import filter_person_detections, save_detection_stream, select_longest_track
+from .utils.video_io import FrameReader
+from .utils.metrics import MemoryMonitor
+from .utils.motion import MotionGate
+from .pose2d.postprocess import transfer_keypoints
+
+
+class PipelineCancelled(Exception):
+    """Raised inside a run when cancel_event is set (e.g. an astream consumer was cancelled)"""
 
 
 class UnifiedPosePipeline:
     """Main pipeline combining tracking/detection with 2D pose estimation"""
     
-    def __init__(self, tracker_type='ocsort', confidence_threshold=0.5, 
-                 device='cuda', output_dir='unifiedpipelineoutputs'):
-        self.tracker_type = tracker_type
-        self.confidence_threshold = confidence_threshold
-        self.device = device
-        self.output_dir = output_dir
+    def __init__(self, tracker_type=None, confidence_threshold=None, 
+                 device=None, output_dir=None, pose_batch_size=None, record_detections=None,
+                 config=None, components=None):
+        # Settings come from config (YAML path, dict or PipelineConfig; None
+        # loads configs/default.yaml). Explicit arguments override the config.
+        self.config = load_config(config)
+        overrides = {
+            'trackdet.tracker_type': tracker_type,
+            'trackdet.confidence_threshold': confidence_threshold,
+            'pipeline.device': device,
+            'pipeline.output_dir': output_dir,
+            'pose2d.batch_size': pose_batch_size,
+            'trackdet.record_detections': record_detections,
+        }
+        overrides = {k: v for k, v in overrides.items() if v is not None}
+        if overrides:
+            self.config = self.config.with_overrides(**overrides)
+        
+        self.tracker_type = self.config.trackdet.tracker_type
+        self.confidence_threshold = self.config.trackdet.confidence_threshold
+        self.device = self.config.pipeline.device
+        self.output_dir = self.config.pipeline.output_dir
+        
+        # Progress goes to stdout unless verbose is off; on_event(dict) gets the
+        # same milestones plus per-frame records as structured events
+        self.verbose = True
+        self.on_event = None
+        self.cancel_event = threading.Event()
         
         # Create output directory
-        os.makedirs(output_dir, exist_ok=True)
+        os.makedirs(self.output_dir, exist_ok=True)
+        
+        self.log("🚀 Initializing Unified Pose Pipeline...")
         
-        print("🚀 Initializing Unified Pose Pipeline...")
+        # Models load where they run: with runtime.multiprocess that is the
+        # stage worker processes, which pass components=('trackdet',) etc.
+        if components is None:
+            components = () if self.config.runtime.multiprocess else ('trackdet', 'pose2d')
+        self.components = tuple(components)
         
         # Initialize components
-        self.setup_trackdet_components()
-        self.setup_pose2d_components()
+        startup_start = time.time()
+        self.onnx_cache_hits = []
+        self.pose_estimators = {}
+        self.setup_runtime()
+        if 'trackdet' in self.components:
+            self.setup_trackdet_components()
+        trackdet_ready = time.time()
+        if 'pose2d' in self.components:
+            self.setup_pose2d_components()
+        pose2d_ready = time.time()
+        self.warmup(self.config.runtime.warmup_iterations)
+        self.startup_times = {
+            'trackdet': trackdet_ready - startup_start,
+            'pose2d': pose2d_ready - trackdet_ready,
+            'warmup': time.time() - pose2d_ready,
+            'total': time.time() - startup_start,
+            'onnx_cache_hits': sum(self.onnx_cache_hits),
+            'onnx_sessions': len(self.onnx_cache_hits),
+        }
+        self.log(f"⏱️  Startup: {self.startup_times['total']:.2f}s "
+                 f"(TrackDet {self.startup_times['trackdet']:.2f}s, Pose2D {self.startup_times['pose2d']:.2f}s, "
+                 f"warm-up {self.startup_times['warmup']:.2f}s)")
         
         # Tracking data storage
         self.track_history = defaultdict(list)
         self.frame_data = {}
+        self.detection_stream = []
+        self.detection_frames = []
+        self.motion_skipped = set()
+        self.controller = None
+        self.memory = None
+    
+    @classmethod
+    def from_config(cls, config_path, **overrides):
+        """Build a pipeline from a YAML profile, e.g. from_config('configs/realtime.yaml')"""
+        return cls(config=config_path, **overrides)
+
+    def log(self, message=''):
+        if self.verbose:
+            print(message)
+
+    def emit(self, event_type, **data):
+        """Send a structured event ({'type': event_type, ...}) to on_event, if set"""
+        if self.on_event is not None:
+            self.on_event({'type': event_type, **data})
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise PipelineCancelled("Pipeline run cancelled")
+
+    def reset(self, output_dir=None):
+        """Clear per-video state (and a pending cancel) so warm models can be reused for another video"""
+        if output_dir is not None:
+            self.output_dir = output_dir
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        self.cancel_event.clear()
+
+        if 'trackdet' in self.components:
+            self.tracker.reset()
+        self.track_history = defaultdict(list)
+        self.frame_data = {}
+        self.detection_stream = []
+        self.detection_frames = []
+        self.motion_skipped = set()
+        self.keypoint_data = {}
+    
+    def setup_runtime(self):
+        """Apply thread-count settings from the runtime config section"""
+        runtime = self.config.runtime
+        if runtime.opencv_threads:
+            cv2.setNumThreads(runtime.opencv_threads)
+        if runtime.torch_threads:
+            try:
+                import torch
+                torch.set_num_threads(runtime.torch_threads)
+            except ImportError:
+                pass
     
     def setup_trackdet_components(self):
         """Setup tracking & detection components using pip packages"""
-        print("🔧 Setting up TrackDet components...")
+        self.log("🔧 Setting up TrackDet components...")
+        trackdet = self.config.trackdet
         
         try:
             from ultralytics import YOLO
-            from boxmot import OcSort, ByteTrack, BotSort, StrongSort
-            
-            self.detector = YOLO('yolov8s.pt')
-            tracker_config = {
-                'model_weights': 'osnet_x0_25_msmt17.pt',
-                'device': self.device, 'half': False, 'per_class': False,
-                'det_thresh': 0.2, 'max_age': 30, 'min_hits': 3, 'iou_threshold': 0.3
-            }
             
-            trackers = {'ocsort': OcSort, 'bytetrack': ByteTrack, 
-                       'botsort': BotSort, 'strongsort': StrongSort}
-            self.tracker = trackers[self.tracker_type](**tracker_config)
-            print("✅ TrackDet components initialized")
+            self.detector = YOLO(resolve_model(trackdet.detector_weights, self.config.pipeline.model_dir))
+            self.tracker = self.build_tracker()
+            self.log("✅ TrackDet components initialized")
             
         except ImportError as e:
-            print(f"❌ Failed to import TrackDet components: {e}")
-            print("Please install: pip install boxmot ultralytics")
+            self.log(f"❌ Failed to import TrackDet components: {e}")
+            self.log("Please install: pip install boxmot ultralytics")
             raise
     
+    def build_tracker(self):
+        """Create a TrackingManager from the trackdet config (one per video stream)"""
+        from .trackdet import TrackingManager, TRACKER_BACKENDS
+        
+        trackdet = self.config.trackdet
+        reid_weights = trackdet.reid_weights
+        if TRACKER_BACKENDS[self.tracker_type].uses_reid and trackdet.use_osnet:
+            reid_weights = resolve_model(reid_weights, self.config.pipeline.model_dir)
+        # Only botsort/strongsort load ReID weights; 'iou' needs no boxmot at all
+        return TrackingManager(
+            tracker_type=self.tracker_type, device=self.device,
+            reid_weights=reid_weights, use_reid=trackdet.use_osnet,
+            det_thresh=trackdet.detection_threshold, max_age=trackdet.max_age,
+            min_hits=trackdet.min_hits, iou_threshold=trackdet.iou_threshold
+        )
+    
     def setup_pose2d_components(self):
         """Setup 2D pose estimation components using pip packages"""
-        print("🔧 Setting up Pose2D components...")
+        self.log("🔧 Setting up Pose2D components...")
         
         try:
-            from rtmlib import Body, draw_skeleton
+            from .pose2d import SkeletonRenderer
             
-            self.pose_estimator = Body(
-                to_openpose=True,
-                mode='balanced',
-                backend='onnxruntime', 
-                device=self.device
-            )
-            self.draw_skeleton = draw_skeleton
-            print("✅ Pose2D components initialized")
+            self.pose2d = self.build_pose_estimator(self.config.pose2d.mode)
+            self.pose_estimators = {self.config.pose2d.mode: self.pose2d}
+            # Warm the cheaper modes up front so controller switches don't stall mid-run
+            controller = self.config.controller
+            if controller.enabled and controller.switch_pose_mode:
+                for mode in pose_mode_ladder(self.config.pose2d.mode):
+                    self.get_pose_estimator(mode)
+            self.skeleton_renderer = SkeletonRenderer('openpose18', kpt_thr=self.config.pose2d.kpt_thr)
+            self.log("✅ Pose2D components initialized")
             
         except ImportError as e:
-            print(f"❌ Failed to import Pose2D components: {e}")
-            print("Please install: pip install rtmlib")
+            self.log(f"❌ Failed to import Pose2D components: {e}")
+            self.log("Please install: pip install rtmlib")
             raise
+    
+    def build_pose_estimator(self, mode):
+        """Load the RTMPose model for an rtmlib mode (lightweight/balanced/performance)"""
+        from rtmlib import Body, RTMPose
+        from .pose2d import Pose2DEstimator, OnnxPoseModel
+        
+        # Build the model directly: rtmlib's Body would also load a YOLOX detector we never use
+        pose_cfg = self.config.pose2d
+        runtime = self.config.runtime
+        model_info = Body.MODE[mode]
+        onnx_model = resolve_pose_model(mode, self.config.pipeline.model_dir)
+        
+        if pose_cfg.backend == 'onnxruntime':
+            # Own session (thread options + cached optimized graph) instead of rtmlib's
+            cache_dir = runtime.onnx_cache_dir
+            session, cache_hit = create_ort_session(
+                onnx_model, device=self.device, cache_dir=cache_dir,
+                intra_op_threads=runtime.onnx_intra_op_threads,
+                inter_op_threads=runtime.onnx_inter_op_threads)
+            self.onnx_cache_hits.append(cache_hit)
+            if cache_dir:
+                self.log(f"   ONNX graph cache {'hit' if cache_hit else 'miss (optimized graph saved)'}: {mode}")
+            pose_model = OnnxPoseModel(session, model_info['pose_input_size'])
+        else:
+            pose_model = RTMPose(
+                onnx_model,
+                model_input_size=model_info['pose_input_size'],
+                to_openpose=True,
+                backend=pose_cfg.backend,
+                device=self.device
+            )
+        
+        # Batched preprocessing + vectorized SimCC decoding on top of rtmlib's session
+        return Pose2DEstimator(pose_model, to_openpose=True)
+
+    def get_pose_estimator(self, mode):
+        """Cached estimator per rtmlib mode, so the controller can switch modes mid-run"""
+        if mode not in self.pose_estimators:
+            self.pose_estimators[mode] = self.build_pose_estimator(mode)
+        return self.pose_estimators[mode]
+    
+    def warmup(self, iterations=2):
+        """Run dummy batches through the detector and every loaded pose model"""
+        if iterations <= 0:
+            return
+        frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+        bboxes = [[400, 100, 700, 650]] * self.config.pose2d.batch_size
+        for _ in range(iterations):
+            if 'trackdet' in self.components:
+                self.detector(frame, conf=self.confidence_threshold,
+                              imgsz=self.config.trackdet.detector_input_size, verbose=False)
+            for estimator in self.pose_estimators.values():
+                estimator.estimate_batch([frame] * len(bboxes), bboxes)
+    
+    def build_controller(self):
+        """Fresh ThroughputController for a run, or None when adaptive control is off"""
+        if not self.config.controller.enabled:
+            return None
+        controller = ThroughputController.from_config(self.config)
+        controller.log = self.log
+        return controller
+
+    def build_memory_monitor(self):
+        """Fresh MemoryMonitor for a run, or None when memory reporting is off"""
+        if not self.config.memory.enabled:
+            return None
+        monitor = MemoryMonitor.from_config(self.config)
+        monitor.log = self.log
+        return monitor
 
     # [KEEP ALL OTHER METHODS THE SAME - stage1_trackdet, analyze_tracking_results, etc.]
     
@@ -110,12 +303,15 @@ class UnifiedPosePipeline:
 
     def stage1_trackdet(self, input_video, max_frames=None):
         """Stage 1: Track all persons and find the longest-running person"""
-        print(f"\n{'='*60}")
-        print("🎬 STAGE 1: Tracking & Detection")
-        print(f"{'='*60}")
+        self.log(f"\n{'='*60}")
+        self.log("🎬 STAGE 1: Tracking & Detection")
+        self.log(f"{'='*60}")
         
         if not os.path.exists(input_video):
             raise FileNotFoundError(f"Input video not found: {input_video}")
+        memory = self.memory = self.build_memory_monitor()
+        if self.config.runtime.multiprocess:
+            return self._stage1_multiprocess(input_video, max_frames)
         
         # Video setup
         cap = cv2.VideoCapture(input_video)
@@ -127,86 +323,131 @@ class UnifiedPosePipeline:
         if max_frames and max_frames > 0:
             total_frames = min(total_frames, max_frames)
         
-        # Stage 1 output video
-        stage1_output = os.path.join(self.output_dir, 'stage1_tracking.mp4')
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out_stage1 = cv2.VideoWriter(stage1_output, fourcc, fps, (width, height))
+        # Stage 1 output video (skipped entirely when rendering is off)
+        render = self.config.output.render
+        stage1_output = os.path.join(self.output_dir, 'stage1_tracking.mp4') if render else None
+        out_stage1 = None
+        if render:
+            fourcc = cv2.VideoWriter_fourcc(*self.config.output.video_codec)
+            out_stage1 = cv2.VideoWriter(stage1_output, fourcc, fps, (width, height))
         
-        print(f"📹 Video: {width}x{height}, {fps:.1f} FPS, {total_frames} frames")
-        print("⏳ Tracking all persons...")
+        self.log(f"📹 Video: {width}x{height}, {fps:.1f} FPS, {total_frames} frames")
+        self.log("⏳ Tracking all persons...")
+        self.emit('stage_start', stage='trackdet', total_frames=total_frames,
+                  width=width, height=height, fps=fps)
         
         # Timing for Stage 1
         stage1_start = time.time()
         frame_count = 0
-        frame_times = []
+        frame_times = deque(maxlen=50)
+        controller = self.controller = self.build_controller()
+        if memory is not None:
+            memory.start_stage('trackdet')
+        imgsz = self.config.trackdet.detector_input_size
+        detection_interval = 1
+        gate = MotionGate.from_config(self.config) if self.config.motion.enabled else None
         
-        while frame_count < total_frames:
-            frame_start = time.time()
-            ret, frame = cap.read()
-            if not ret: 
-                break
-            
-            # Run detection and tracking
-            results = self.detector(frame, conf=self.confidence_threshold, verbose=False)
-            detections = results[0].boxes.data.cpu().numpy()
+        try:
+            while frame_count < total_frames:
+                self.check_cancelled()
+                frame_start = time.time()
+                ret, frame = cap.read()
+                if not ret: 
+                    break
             
-            # Filter person detections (class 0)
-            person_detections = []
-            for det in detections:
-                x1, y1, x2, y2, conf, cls = det
-                if cls == 0 and conf >= self.confidence_threshold:
-                    person_detections.append([x1, y1, x2, y2, conf, cls])
+                if controller is not None:
+                    imgsz = controller.value('detector_input_size')
+                    detection_interval = controller.value('detection_interval')
             
-            detections_array = np.array(person_detections) if person_detections else np.empty((0, 6))
-            tracks = self.tracker.update(detections_array, frame)
+                # Between detector runs (detection_interval > 1) and while the scene is
+                # static (motion gate) the last detections and tracks are held
+                if gate is not None and gate.skip(frame):
+                    self.motion_skipped.add(frame_count)
+                elif frame_count % detection_interval == 0:
+                    # Run detection and tracking
+                    results = self.detector(frame, conf=self.confidence_threshold,
+                                            imgsz=imgsz, verbose=False)
+                    detections = results[0].boxes.data.cpu().numpy()
+                
+                    # Filter person detections (class 0)
+                    detections_array = filter_person_detections(detections, self.confidence_threshold)
+                    tracks = self.tracker.update(detections_array, frame)
+                    # Only frames the detector actually ran on are recorded, with their index
+                    if self.config.trackdet.record_detections:
+                        self.detection_stream.append(detections_array)
+                        self.detection_frames.append(frame_count)
             
-            # Store tracking data and draw on frame
-            current_frame_tracks = {}
-            for track in tracks:
-                if len(track) >= 6:
-                    x1, y1, x2, y2 = map(int, track[:4])
-                    track_id = int(track[4])
-                    conf = track[5]
+                # Store tracking data and draw on frame
+                current_frame_tracks = {}
+                for track in tracks:
+                    if len(track) >= 6:
+                        x1, y1, x2, y2 = map(int, track[:4])
+                        track_id = int(track[4])
+                        conf = track[5]
                     
-                    # Store track data
-                    self.track_history[track_id].append(frame_count)
-                    current_frame_tracks[track_id] = [x1, y1, x2, y2]
+                        # Store track data
+                        self.track_history[track_id].append(frame_count)
+                        current_frame_tracks[track_id] = [x1, y1, x2, y2]
                     
-                    # Draw bounding box and ID
-                    cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-                    label = f"ID:{track_id} ({conf:.2f})"
-                    cv2.putText(frame, label, (x1, y1-10), 
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
+                        # Draw bounding box and ID
+                        if render:
+                            cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+                            label = f"ID:{track_id} ({conf:.2f})"
+                            cv2.putText(frame, label, (x1, y1-10), 
+                                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
             
-            self.frame_data[frame_count] = current_frame_tracks
-            out_stage1.write(frame)
-            frame_count += 1
+                self.frame_data[frame_count] = current_frame_tracks
+                self.emit('tracks', frame=frame_count, tracks=current_frame_tracks)
+                if render:
+                    out_stage1.write(frame)
+                frame_count += 1
             
-            frame_time = time.time() - frame_start
-            frame_times.append(frame_time)
+                frame_time = time.time() - frame_start
+                frame_times.append(frame_time)
+                if controller is not None:
+                    controller.record('trackdet', frame_time)
+                    adjustment = controller.update('trackdet', frame_count)
+                    if adjustment is not None:
+                        self.emit('adjustment', **adjustment)
+                if memory is not None:
+                    memory.tick()
             
-            # Progress reporting
-            if frame_count % 50 == 0:
-                elapsed = time.time() - stage1_start
-                recent_fps = 50 / (elapsed - sum(frame_times[:-50])) if len(frame_times) > 50 else 0
-                print(f"   Frame {frame_count:04d}/{total_frames} | "
-                      f"Progress: {(frame_count/total_frames)*100:5.1f}% | "
-                      f"FPS: {recent_fps:5.1f} | "
-                      f"Active tracks: {len(current_frame_tracks):2d}")
-        
-        cap.release()
-        out_stage1.release()
+                # Progress reporting
+                if frame_count % 50 == 0:
+                    recent_fps = len(frame_times) / sum(frame_times)
+                    self.log(f"   Frame {frame_count:04d}/{total_frames} | "
+                             f"Progress: {(frame_count/total_frames)*100:5.1f}% | "
+                             f"FPS: {recent_fps:5.1f} | "
+                             f"Active tracks: {len(current_frame_tracks):2d}")
+        finally:
+            # Also on cancellation or errors, so partial outputs are finalized
+            cap.release()
+            if render:
+                out_stage1.release()
+            if memory is not None:
+                memory.end_stage()
+        
+        if self.config.trackdet.record_detections:
+            stream_path = os.path.join(self.output_dir, 'detections.npz')
+            save_detection_stream(stream_path, self.detection_stream, self.detection_frames,
+                                  width=width, height=height, fps=fps, frame_count=frame_count)
+            self.log(f"💾 Saved detection stream: {stream_path}")
         
         # Stage 1 timing results
         stage1_time = time.time() - stage1_start
         stage1_fps = frame_count / stage1_time if stage1_time > 0 else 0
         
-        print(f"\n✅ STAGE 1 COMPLETE:")
-        print(f"   Frames processed: {frame_count}")
-        print(f"   Total time: {stage1_time:.2f}s")
-        print(f"   Average FPS: {stage1_fps:.2f}")
-        print(f"   Output: {stage1_output}")
-        
+        self.log(f"\n✅ STAGE 1 COMPLETE:")
+        self.log(f"   Frames processed: {frame_count}")
+        self.log(f"   Total time: {stage1_time:.2f}s")
+        self.log(f"   Average FPS: {stage1_fps:.2f}")
+        if self.config.motion.enabled:
+            self.log(f"   Static frames (motion gate, models skipped): {len(self.motion_skipped)}")
+        if render:
+            self.log(f"   Output: {stage1_output}")
+        
+        self.emit('stage_complete', stage='trackdet', frames=frame_count,
+                  time=stage1_time, fps=stage1_fps)
         return {
             'frame_count': frame_count,
             'total_frames': total_frames,
@@ -214,31 +455,25 @@ class UnifiedPosePipeline:
             'width': width,
             'height': height,
             'stage1_time': stage1_time,
-            'stage1_fps': stage1_fps
+            'stage1_fps': stage1_fps,
+            'motion_skipped_frames': len(self.motion_skipped)
         }
 
     def analyze_tracking_results(self, tracking_results):
         """Analyze track history to find person with longest duration"""
-        print(f"\n🔍 Analyzing track history...")
+        self.log(f"\n🔍 Analyzing track history...")
         
         if not self.track_history:
             raise ValueError("No tracking data found. Run Stage 1 first.")
         
         # Find person with most frames
-        longest_person = None
-        max_frames = 0
-        start_frame = end_frame = 0
-        
-        for track_id, frames in self.track_history.items():
-            if len(frames) > max_frames:
-                max_frames = len(frames)
-                longest_person = track_id
-                start_frame = min(frames)
-                end_frame = max(frames)
+        longest_person, max_frames, start_frame, end_frame = select_longest_track(self.track_history)
         
-        print(f"🎯 Longest-running person: ID {longest_person}")
-        print(f"   Frames: {max_frames}")
-        print(f"   Duration: {start_frame} to {end_frame}")
+        self.log(f"🎯 Longest-running person: ID {longest_person}")
+        self.emit('target', track_id=longest_person, frames=max_frames,
+                  start_frame=start_frame, end_frame=end_frame)
+        self.log(f"   Frames: {max_frames}")
+        self.log(f"   Duration: {start_frame} to {end_frame}")
         
         # Save to text file
         txt_output = os.path.join(self.output_dir, 'longest_running_person_ID.txt')
@@ -251,12 +486,12 @@ class UnifiedPosePipeline:
             f.write(f"End Frame: {end_frame}\n")
             f.write(f"Track Duration: {end_frame - start_frame + 1} frames\n")
         
-        print(f"💾 Saved analysis: {txt_output}")
+        self.log(f"💾 Saved analysis: {txt_output}")
         return longest_person
 
     def save_bbox_data(self, target_person_id):
         """Save bbox coordinates for the target person as JSON"""
-        print(f"\n💾 Saving bbox data for person {target_person_id}...")
+        self.log(f"\n💾 Saving bbox data for person {target_person_id}...")
         
         bbox_data = {}
         for frame_id, tracks in self.frame_data.items():
@@ -267,147 +502,479 @@ class UnifiedPosePipeline:
         with open(json_output, 'w') as f:
             json.dump(bbox_data, f, indent=2)
         
-        print(f"   Saved bbox data: {json_output}")
-        print(f"   Frames with bboxes: {len(bbox_data)}")
+        self.log(f"   Saved bbox data: {json_output}")
+        self.log(f"   Frames with bboxes: {len(bbox_data)}")
         return bbox_data
 
     def stage2_pose2d(self, input_video, target_person_id, tracking_results, bbox_data=None):
         """Stage 2: 2D pose estimation for the target person"""
         if bbox_data is None:
             bbox_data = self.save_bbox_data(target_person_id)
+        # JSON round-trips turn frame keys into strings
+        bbox_data = {int(k): v for k, v in bbox_data.items()}
             
-        print(f"\n{'='*60}")
-        print("🎬 STAGE 2: 2D Pose Estimation")
-        print(f"{'='*60}")
-        
-        # Stage 2 output video
-        stage2_output = os.path.join(self.output_dir, 'unifiedpipelineoutput.mp4')
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out_stage2 = cv2.VideoWriter(stage2_output, fourcc, tracking_results['fps'], 
-                                   (tracking_results['width'], tracking_results['height']))
-        
+        self.log(f"\n{'='*60}")
+        self.log("🎬 STAGE 2: 2D Pose Estimation")
+        self.log(f"{'='*60}")
+        if self.config.runtime.multiprocess:
+            return self._stage2_multiprocess(input_video, target_person_id, tracking_results, bbox_data)
+        
+        # Stage 2 output video (skipped entirely when rendering is off)
+        render = self.config.output.render
+        stage2_output = os.path.join(self.output_dir, 'unifiedpipelineoutput.mp4') if render else None
+        out_stage2 = None
+        if render:
+            fourcc = cv2.VideoWriter_fourcc(*self.config.output.video_codec)
+            out_stage2 = cv2.VideoWriter(stage2_output, fourcc, tracking_results['fps'], 
+                                       (tracking_results['width'], tracking_results['height']))
+        
+        # Without rendering only frames containing the target are needed, so the
+        # reader skips the rest with grab()/seeks instead of decoding them fully
         cap = cv2.VideoCapture(input_video)
+        sparse = not render and self.config.pipeline.sparse_decode
+        reader = FrameReader(cap, bbox_data.keys() if sparse else None,
+                             max_frames=tracking_results['total_frames'],
+                             seek_min_gap=self.config.pipeline.seek_min_gap)
         
-        print(f"🎯 Processing 2D pose for Person ID: {target_person_id}")
-        print(f"⏳ Frames to process: {len(bbox_data)}")
+        self.log(f"🎯 Processing 2D pose for Person ID: {target_person_id}")
+        self.log(f"⏳ Frames to process: {len(bbox_data)}")
+        self.emit('stage_start', stage='pose2d', target_person=target_person_id,
+                  target_frames=len(bbox_data))
         
         # Timing for Stage 2
         stage2_start = time.time()
-        frame_count = 0
         processed_frames = 0
-        frame_times = []
+        next_report = 30
+        self.keypoint_data = {}
+        self.last_pose = None
+        self.pose_reused_frames = 0
+        
+        # Stage 2 gets whatever per-frame budget stage 1 left over
+        controller = self.controller
+        if controller is not None:
+            frames_to_read = len(bbox_data) if sparse else tracking_results['total_frames']
+            remaining = tracking_results['total_frames'] / controller.target_fps - tracking_results['stage1_time']
+            controller.set_budget('pose2d', remaining / max(frames_to_read, 1))
+        memory = self.memory
+        if memory is not None:
+            memory.start_stage('pose2d')
+        pose_skip = 1
+        target_frames = 0
+        window_start = time.time()
+        window_frames = 0
+        
+        # Frames are buffered until batch_size crops are pending, then all crops
+        # run through the pose model as one batch and frames are written in order
+        batch_size = self.config.pose2d.batch_size
+        pending = []
+        pending_crops = 0
         
-        while True:
-            ret, frame = cap.read()
-            if not ret or frame_count >= tracking_results['total_frames']:
-                break
+        try:
+            for frame_count, frame in reader:
+                self.check_cancelled()
+                bbox = bbox_data.get(frame_count)
+                run_pose = reuse = False
+                if bbox is not None:
+                    x1, y1, x2, y2 = bbox
+                    # Ensure valid crop
+                    run_pose = y2 > y1 and x2 > x1 and x1 >= 0 and y1 >= 0
+                if run_pose:
+                    # With pose_skip > 1 only every Nth target frame is estimated; the
+                    # others, and frames the motion gate found static, reuse the last
+                    # keypoints mapped onto their own bbox
+                    reuse = target_frames % pose_skip != 0 or frame_count in self.motion_skipped
+                    run_pose = not reuse
+                    target_frames += 1
             
-            frame_start = time.time()
+                if render and bbox is None and not pending:
+                    out_stage2.write(frame)
+                elif render or run_pose or reuse:
+                    pending.append((frame_count, frame, bbox, run_pose, reuse))
+                    pending_crops += run_pose
+                window_frames += 1
+                if memory is not None:
+                    memory.tick()
             
-            if frame_count in bbox_data:
-                # Get pre-computed bbox from Stage 1
-                x1, y1, x2, y2 = bbox_data[frame_count]
+                # Also flush when the target is missing for a while, so gaps never pile up in memory
+                if pending_crops >= batch_size or len(pending) >= 2 * batch_size:
+                    processed_frames += self._flush_pose_batch(pending, target_person_id, out_stage2)
+                    pending_crops = 0
                 
-                # Ensure valid crop
-                if y2 > y1 and x2 > x1 and x1 >= 0 and y1 >= 0:
-                    try:
-                        crop = frame[y1:y2, x1:x2]
-                        
-                        if crop.size > 0:
-                            # OPTIMIZATION: Resize crop to model's expected input size (256x192)
-                            # This provides up to 1.7x faster inference
-                            resized_crop = cv2.resize(crop, (192, 256))  # width, height
-                            
-                            # Run pose estimation on resized crop
-                            keypoints, scores = self.pose_estimator.pose_model(resized_crop)
-                            
-                            # Adjust coordinates back to original frame
-                            keypoints[:, :, 0] += x1
-                            keypoints[:, :, 1] += y1
-                            
-                            # Draw skeleton on original frame
-                            frame = self.draw_skeleton(
-                                frame, 
-                                keypoints, 
-                                scores, 
-                                openpose_skeleton=True, 
-                                kpt_thr=0.3
-                            )
-                            
-                            processed_frames += 1
-                    
-                    except Exception as e:
-                        # Silent error handling
-                        pass
-                
-                # Draw tracking bbox
-                cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-                cv2.putText(frame, f"ID:{target_person_id} (Pose2D)", 
-                           (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
-            
-            out_stage2.write(frame)
-            frame_count += 1
+                    if controller is not None:
+                        controller.record('pose2d', time.time() - window_start, window_frames)
+                        adjustment = controller.update('pose2d', frame_count)
+                        if adjustment is not None:
+                            self.emit('adjustment', **adjustment)
+                        window_start, window_frames = time.time(), 0
+                        pose_skip = controller.value('pose_skip')
+                        self.pose2d = self.get_pose_estimator(controller.value('pose_mode'))
             
-            frame_time = time.time() - frame_start
-            frame_times.append(frame_time)
-            
-            # Progress reporting
-            if processed_frames % 30 == 0 and processed_frames > 0:
-                elapsed = time.time() - stage2_start
-                recent_fps = 30 / (elapsed - sum(frame_times[:-30])) if len(frame_times) > 30 else 0
-                print(f"   Pose2D frames: {processed_frames:04d} | FPS: {recent_fps:5.1f}")
-        
-        cap.release()
-        out_stage2.release()
+                # Progress reporting
+                if processed_frames >= next_report:
+                    elapsed = time.time() - stage2_start
+                    self.log(f"   Pose2D frames: {processed_frames:04d} | FPS: {processed_frames / elapsed:5.1f}")
+                    next_report = (processed_frames // 30 + 1) * 30
+        
+            if pending:
+                processed_frames += self._flush_pose_batch(pending, target_person_id, out_stage2)
+            if controller is not None:
+                controller.record('pose2d', time.time() - window_start, window_frames)
+        finally:
+            if controller is not None:
+                # Leave the pipeline on its configured model for the next run
+                self.pose2d = self.get_pose_estimator(self.config.pose2d.mode)
+            cap.release()
+            if render:
+                out_stage2.release()
+            if memory is not None:
+                memory.end_stage()
         
         # Stage 2 timing results
         stage2_time = time.time() - stage2_start
         stage2_fps = processed_frames / stage2_time if stage2_time > 0 else 0
         
-        print(f"\n✅ STAGE 2 COMPLETE:")
-        print(f"   Pose2D frames processed: {processed_frames}")
-        print(f"   Total time: {stage2_time:.2f}s")
-        print(f"   Average FPS: {stage2_fps:.2f}")
-        print(f"   Output: {stage2_output}")
+        keypoints_output = self.save_keypoint_data(target_person_id)
+        
+        self.log(f"\n✅ STAGE 2 COMPLETE:")
+        self.log(f"   Pose2D frames processed: {processed_frames}")
+        if self.pose_reused_frames:
+            self.log(f"   Reused keypoints (pose skip / static): {self.pose_reused_frames} frames")
+        self.log(f"   Total time: {stage2_time:.2f}s")
+        self.log(f"   Average FPS: {stage2_fps:.2f}")
+        if sparse:
+            self.log(f"   Decoded {reader.retrieved} frames (skipped {reader.grabbed} via grab, "
+                     f"{reader.seeks} seeks)")
+        if render:
+            self.log(f"   Output: {stage2_output}")
+        
+        self.emit('stage_complete', stage='pose2d', frames=processed_frames,
+                  time=stage2_time, fps=stage2_fps)
+        return {
+            'processed_frames': processed_frames,
+            'stage2_time': stage2_time,
+            'stage2_fps': stage2_fps,
+            'target_person': target_person_id,
+            'video_output': stage2_output,
+            'keypoints_output': keypoints_output,
+            'decode_stats': reader.stats,
+            'pose_reused_frames': self.pose_reused_frames,
+            'motion_reused_frames': len(self.motion_skipped & self.keypoint_data.keys())
+        }
+
+    def _flush_pose_batch(self, pending, target_person_id, out_writer):
+        """Run pose on all buffered crops as one batch, then draw and write the frames in order"""
+        crops = [(frame, bbox) for _, frame, bbox, run_pose, _ in pending if run_pose]
+        keypoints = scores = None
+        if crops:
+            try:
+                frames, bboxes = zip(*crops)
+                keypoints, scores = self.pose2d.estimate_batch(frames, bboxes)
+            except Exception as e:
+                self.log(f"⚠️  Pose batch failed ({len(crops)} crops): {e}")
+        
+        crop_idx = 0
+        reused = 0
+        for frame_id, frame, bbox, run_pose, reuse in pending:
+            frame_kpts = None
+            if run_pose and keypoints is not None:
+                frame_kpts, frame_scores = keypoints[crop_idx], scores[crop_idx]
+                self.last_pose = (bbox, frame_kpts, frame_scores)
+            elif reuse and self.last_pose is not None:
+                last_bbox, last_kpts, frame_scores = self.last_pose
+                frame_kpts = transfer_keypoints(last_kpts, last_bbox, bbox)
+                reused += 1
+            if frame_kpts is not None:
+                self.keypoint_data[frame_id] = (frame_kpts, frame_scores)
+                self.emit('pose', frame=frame_id, bbox=bbox, keypoints=frame_kpts, scores=frame_scores)
+            
+            if out_writer is not None:
+                if bbox is not None:
+                    x1, y1, x2, y2 = bbox
+                    if frame_kpts is not None:
+                        # Draw skeleton on original frame
+                        self.skeleton_renderer.draw(frame, frame_kpts, frame_scores)
+                    
+                    # Draw tracking bbox
+                    cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+                    cv2.putText(frame, f"ID:{target_person_id} (Pose2D)", 
+                               (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
+                out_writer.write(frame)
+            crop_idx += run_pose
+        
+        pending.clear()
+        self.pose_reused_frames += reused
+        return (len(crops) if keypoints is not None else 0) + reused
+
+    def _stage1_multiprocess(self, input_video, max_frames=None):
+        """Stage 1 as decode -> trackdet -> render processes sharing a frame ring"""
+        from .multiprocess import run_stages, TrackDetWorker, TrackRenderWorker
         
+        cap = cv2.VideoCapture(input_video)
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+        if max_frames and max_frames > 0:
+            total_frames = min(total_frames, max_frames)
+        
+        render = self.config.output.render
+        stage1_output = os.path.join(self.output_dir, 'stage1_tracking.mp4') if render else None
+        workers = [TrackDetWorker(type(self), self.config)]
+        if render:
+            workers.append(TrackRenderWorker(stage1_output, self.config.output.video_codec,
+                                             fps, (width, height)))
+        
+        self.log(f"📹 Video: {width}x{height}, {fps:.1f} FPS, {total_frames} frames")
+        self.log(f"⏳ Tracking all persons ({len(workers) + 1} processes, "
+                 f"{self.config.runtime.ring_slots} shared frame slots)...")
+        self.emit('stage_start', stage='trackdet', total_frames=total_frames,
+                  width=width, height=height, fps=fps)
+        
+        stage1_start = time.time()
+        memory = self.memory
+        if memory is not None:
+            memory.start_stage('trackdet')
+        
+        def on_data(name, data):
+            self.check_cancelled()
+            if memory is not None:
+                memory.tick()
+            frame_idx, tracks, detections, static = data
+            if static:
+                self.motion_skipped.add(frame_idx)
+            current_frame_tracks = {}
+            for track_id, bbox, _ in tracks:
+                self.track_history[track_id].append(frame_idx)
+                current_frame_tracks[track_id] = bbox
+            self.frame_data[frame_idx] = current_frame_tracks
+            self.emit('tracks', frame=frame_idx, tracks=current_frame_tracks)
+            if detections is not None:
+                self.detection_stream.append(detections)
+                self.detection_frames.append(frame_idx)
+            frame_count = len(self.frame_data)
+            if frame_count % 50 == 0:
+                self.log(f"   Frame {frame_count:04d}/{total_frames} | "
+                         f"Progress: {(frame_count/total_frames)*100:5.1f}% | "
+                         f"Active tracks: {len(current_frame_tracks):2d}")
+        
+        _, stage1_time = run_stages(input_video, (height, width, 3), workers,
+                                    num_slots=self.config.runtime.ring_slots, max_frames=total_frames,
+                                    on_data=on_data, stall_timeout=self.config.runtime.stage_timeout)
+        if memory is not None:
+            memory.end_stage()
+        self.log(f"   Worker startup: {time.time() - stage1_start - stage1_time:.2f}s")
+        frame_count = len(self.frame_data)
+        
+        if self.config.trackdet.record_detections:
+            stream_path = os.path.join(self.output_dir, 'detections.npz')
+            save_detection_stream(stream_path, self.detection_stream, self.detection_frames,
+                                  width=width, height=height, fps=fps, frame_count=frame_count)
+            self.log(f"💾 Saved detection stream: {stream_path}")
+        
+        stage1_fps = frame_count / stage1_time if stage1_time > 0 else 0
+        
+        self.log(f"\n✅ STAGE 1 COMPLETE:")
+        self.log(f"   Frames processed: {frame_count}")
+        self.log(f"   Total time: {stage1_time:.2f}s")
+        self.log(f"   Average FPS: {stage1_fps:.2f}")
+        if self.config.motion.enabled:
+            self.log(f"   Static frames (motion gate, models skipped): {len(self.motion_skipped)}")
+        if render:
+            self.log(f"   Output: {stage1_output}")
+        
+        self.emit('stage_complete', stage='trackdet', frames=frame_count,
+                  time=stage1_time, fps=stage1_fps)
+        return {
+            'frame_count': frame_count,
+            'total_frames': total_frames,
+            'fps': fps,
+            'width': width,
+            'height': height,
+            'stage1_time': stage1_time,
+            'stage1_fps': stage1_fps,
+            'motion_skipped_frames': len(self.motion_skipped)
+        }
+
+    def _stage2_multiprocess(self, input_video, target_person_id, tracking_results, bbox_data):
+        """Stage 2 as decode -> pose -> render processes sharing a frame ring"""
+        from .multiprocess import run_stages, PoseWorker, PoseRenderWorker
+        
+        render = self.config.output.render
+        stage2_output = os.path.join(self.output_dir, 'unifiedpipelineoutput.mp4') if render else None
+        sparse = not render and self.config.pipeline.sparse_decode
+        slots = self.config.runtime.ring_slots
+        size = (tracking_results['width'], tracking_results['height'])
+        
+        # The pose process batches by holding slots; leave one each for decode and render
+        workers = [PoseWorker(type(self), self.config, bbox_data,
+                              max_pending=min(2 * self.config.pose2d.batch_size, slots - 2),
+                              static_frames=self.motion_skipped)]
+        if render:
+            workers.append(PoseRenderWorker(stage2_output, self.config.output.video_codec,
+                                            tracking_results['fps'], size, target_person_id,
+                                            self.config.pose2d.kpt_thr))
+        
+        self.log(f"🎯 Processing 2D pose for Person ID: {target_person_id}")
+        self.log(f"⏳ Frames to process: {len(bbox_data)} ({len(workers) + 1} processes, {slots} shared frame slots)")
+        self.emit('stage_start', stage='pose2d', target_person=target_person_id,
+                  target_frames=len(bbox_data))
+        
+        self.keypoint_data = {}
+        self.pose_reused_frames = 0
+        next_report = [30]
+        memory = self.memory
+        if memory is not None:
+            memory.start_stage('pose2d')
+        
+        def on_data(name, poses):
+            self.check_cancelled()
+            if memory is not None:
+                memory.tick(len(poses))
+            for frame_id, keypoints, scores in poses:
+                self.keypoint_data[frame_id] = (keypoints, scores)
+                self.emit('pose', frame=frame_id, bbox=bbox_data.get(frame_id),
+                          keypoints=keypoints, scores=scores)
+            if len(self.keypoint_data) >= next_report[0]:
+                self.log(f"   Pose2D frames: {len(self.keypoint_data):04d}")
+                next_report[0] = (len(self.keypoint_data) // 30 + 1) * 30
+        
+        summaries, stage2_time = run_stages(
+            input_video, (size[1], size[0], 3), workers, num_slots=slots,
+            frame_indices=bbox_data.keys() if sparse else None,
+            max_frames=tracking_results['total_frames'],
+            seek_min_gap=self.config.pipeline.seek_min_gap, on_data=on_data,
+            stall_timeout=self.config.runtime.stage_timeout)
+        if memory is not None:
+            memory.end_stage()
+        decode_stats = summaries['decode']
+        
+        processed_frames = len(self.keypoint_data)
+        stage2_fps = processed_frames / stage2_time if stage2_time > 0 else 0
+        keypoints_output = self.save_keypoint_data(target_person_id)
+        motion_reused = len(self.motion_skipped & self.keypoint_data.keys())
+        
+        self.log(f"\n✅ STAGE 2 COMPLETE:")
+        self.log(f"   Pose2D frames processed: {processed_frames}")
+        if motion_reused:
+            self.log(f"   Reused keypoints (static): {motion_reused} frames")
+        self.log(f"   Total time: {stage2_time:.2f}s")
+        self.log(f"   Average FPS: {stage2_fps:.2f}")
+        if sparse:
+            self.log(f"   Decoded {decode_stats['retrieved']} frames (skipped {decode_stats['grabbed']} via grab, "
+                     f"{decode_stats['seeks']} seeks)")
+        if render:
+            self.log(f"   Output: {stage2_output}")
+        
+        self.emit('stage_complete', stage='pose2d', frames=processed_frames,
+                  time=stage2_time, fps=stage2_fps)
         return {
             'processed_frames': processed_frames,
             'stage2_time': stage2_time,
             'stage2_fps': stage2_fps,
-            'target_person': target_person_id
+            'target_person': target_person_id,
+            'video_output': stage2_output,
+            'keypoints_output': keypoints_output,
+            'decode_stats': decode_stats,
+            'pose_reused_frames': motion_reused,
+            'motion_reused_frames': motion_reused
         }
 
+    def save_keypoint_data(self, target_person_id):
+        """Save the target person's keypoints in the configured output format (json/npz)"""
+        output_format = self.config.output.format
+        if output_format == 'none':
+            return None
+        
+        frame_ids = sorted(self.keypoint_data)
+        path = os.path.join(self.output_dir, f'person_{target_person_id}_keypoints.{output_format}')
+        if output_format == 'npz':
+            keypoints = np.array([self.keypoint_data[i][0] for i in frame_ids], dtype=np.float32)
+            scores = np.array([self.keypoint_data[i][1] for i in frame_ids], dtype=np.float32)
+            np.savez_compressed(path, frames=np.array(frame_ids, dtype=np.int64),
+                                keypoints=keypoints, scores=scores)
+        else:
+            with open(path, 'w') as f:
+                json.dump({frame_id: {'keypoints': self.keypoint_data[frame_id][0].tolist(),
+                                      'scores': self.keypoint_data[frame_id][1].tolist()}
+                           for frame_id in frame_ids}, f)
+        
+        self.log(f"💾 Saved keypoints: {path} ({len(frame_ids)} frames)")
+        return path
+
     def run_complete_pipeline(self, input_video, max_frames=None):
         """Run the complete unified pipeline"""
-        print("🚀 STARTING UNIFIED POSE PIPELINE")
-        print("=" * 60)
-        
-        # Stage 1: Tracking and detection
-        tracking_results = self.stage1_trackdet(input_video, max_frames)
+        if max_frames is None:
+            max_frames = self.config.pipeline.max_frames
         
-        # Find longest-running person
-        target_person = self.analyze_tracking_results(tracking_results)
+        self.log("🚀 STARTING UNIFIED POSE PIPELINE")
+        self.log("=" * 60)
         
-        # Stage 2: 2D pose estimation
-        pose_results = self.stage2_pose2d(input_video, target_person, tracking_results)
+        try:
+            # Stage 1: Tracking and detection
+            tracking_results = self.stage1_trackdet(input_video, max_frames)
+            
+            # Find longest-running person
+            target_person = self.analyze_tracking_results(tracking_results)
+            
+            # Stage 2: 2D pose estimation
+            pose_results = self.stage2_pose2d(input_video, target_person, tracking_results)
+        finally:
+            # Stop tracemalloc if the monitor started it, also when a run is cancelled
+            if self.memory is not None:
+                self.memory.stop()
         
         # Final summary
         total_time = tracking_results['stage1_time'] + pose_results['stage2_time']
         overall_fps = tracking_results['frame_count'] / total_time if total_time > 0 else 0
         
-        print(f"\n🎉 UNIFIED POSE PIPELINE COMPLETE!")
-        print(f"📊 PERFORMANCE SUMMARY:")
-        print(f"   Total Frames: {tracking_results['frame_count']}")
-        print(f"   Total Time: {total_time:.2f}s")
-        print(f"   Overall FPS: {overall_fps:.2f}")
-        print(f"   TrackDet FPS: {tracking_results['stage1_fps']:.2f}")
-        print(f"   Pose2D FPS: {pose_results['stage2_fps']:.2f}")
-        print(f"   Target Person: ID {pose_results['target_person']}")
-        print(f"📁 All outputs saved to: {self.output_dir}/")
+        self.log(f"\n🎉 UNIFIED POSE PIPELINE COMPLETE!")
+        self.log(f"📊 PERFORMANCE SUMMARY:")
+        self.log(f"   Total Frames: {tracking_results['frame_count']}")
+        self.log(f"   Total Time: {total_time:.2f}s")
+        self.log(f"   Overall FPS: {overall_fps:.2f}")
+        self.log(f"   TrackDet FPS: {tracking_results['stage1_fps']:.2f}")
+        self.log(f"   Pose2D FPS: {pose_results['stage2_fps']:.2f}")
+        self.log(f"   Target Person: ID {pose_results['target_person']}")
         
-        return {
+        results = {
             'tracking_results': tracking_results,
             'pose_results': pose_results,
             'total_time': total_time,
             'overall_fps': overall_fps
-        }
\ No newline at end of file
+        }
+        if self.controller is not None:
+            results['controller'] = self.controller.summary()
+            adjustments = results['controller']['adjustments']
+            self.log(f"🎚️  Throughput controller (target {self.controller.target_fps:.1f} FPS): "
+                     f"{len(adjustments)} adjustments")
+            for adj in adjustments:
+                self.log(f"   [{adj['stage']} @ frame {adj['frame']}] {adj['knob']}: {adj['from']} -> {adj['to']} "
+                         f"({adj['reason']}, {adj['latency_ms']:.1f}/{adj['budget_ms']:.1f} ms)")
+            self.log(f"   Final settings: {results['controller']['final_settings']}")
+        if self.memory is not None:
+            results['memory'] = self.memory.summary()
+            growth = ', '.join(f"{name} {stage['growth_mb_per_1k_frames']:+.1f}"
+                               for name, stage in results['memory']['stages'].items()
+                               if stage['growth_mb_per_1k_frames'] is not None)
+            self.log(f"🧠 Memory: peak RSS {results['memory']['peak_rss_mb']:.0f} MB"
+                     + (f" | growth MB/1k frames: {growth}" if growth else ""))
+            for warning in results['memory']['warnings']:
+                self.log(f"   ⚠️  {warning}")
+        self.log(f"📁 All outputs saved to: {self.output_dir}/")
+        
+        return results
+
+    def astream(self, input_video, max_frames=None, executor=None, quiet=True):
+        """Async generator of structured events for one run (see pipeline/aio.py)"""
+        from .aio import stream_events
+        return stream_events(self, input_video, max_frames, executor=executor, quiet=quiet)
+
+    async def arun(self, input_video, max_frames=None, on_event=None, executor=None):
+        """Awaitable run_complete_pipeline; the blocking work runs in an executor thread"""
+        async with contextlib.aclosing(self.astream(input_video, max_frames, executor)) as events:
+            async for event in events:
+                if event['type'] == 'complete':
+                    return event['results']
+                if on_event is not None:
+                    on_event(event)
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""
+Shared-memory frame ring
+Fixed-size frame slots in one multiprocessing.shared_memory block, so decode,
+detection/tracking and pose/render processes hand frames to each other by
+slot index instead of pickling pixels.
+
+Slot ownership protocol: a slot is owned by exactly one stage at a time.
+The producer acquire()s a FREE slot, fills it and passes its index to the
+next stage's queue; the receiving stage claim()s it, and the last stage
+release()s it back to the free queue. Only the current owner touches a
+slot's pixels or its row in the owner table, so no locks are needed; the
+queue hand-off orders the writes. The owner table (stage, pid) lets the
+parent report which slots a crashed worker was holding.
+"""
+
+import os
+import queue
+import numpy as np
+from multiprocessing import shared_memory
+
+
+FREE = -1
+
+
+class FrameRing:
+    """num_slots frames of frame_shape (uint8) shared between processes"""
+
+    def __init__(self, num_slots, frame_shape, free_queue, name=None, owners_name=None):
+        self.num_slots = num_slots
+        self.frame_shape = tuple(frame_shape)
+        self.free_queue = free_queue
+        self.slot_size = int(np.prod(self.frame_shape))
+        create = name is None
+
+        self._shm = shared_memory.SharedMemory(name=name, create=create,
+                                               size=self.slot_size * num_slots)
+        self._owners_shm = shared_memory.SharedMemory(name=owners_name, create=create,
+                                                      size=num_slots * 2 * 8)
+        self.frames = np.ndarray((num_slots,) + self.frame_shape, dtype=np.uint8, buffer=self._shm.buf)
+        self.owners = np.ndarray((num_slots, 2), dtype=np.int64, buffer=self._owners_shm.buf)
+
+        if create:
+            self.owners[:, 0] = FREE
+            self.owners[:, 1] = 0
+            for slot in range(num_slots):
+                free_queue.put(slot)
+
+    @classmethod
+    def create(cls, num_slots, frame_shape, ctx):
+        """New ring in the parent; ctx is the multiprocessing context the workers use"""
+        return cls(num_slots, frame_shape, ctx.Queue())
+
+    def spec(self):
+        """Picklable description for FrameRing.attach() in a child process"""
+        return {'num_slots': self.num_slots, 'frame_shape': self.frame_shape,
+                'free_queue': self.free_queue, 'name': self._shm.name,
+                'owners_name': self._owners_shm.name}
+
+    @classmethod
+    def attach(cls, spec):
+        """Map an existing ring (created by the parent) into this process"""
+        return cls(**spec)
+
+    def frame(self, slot):
+        """Writable view of a slot; valid only while the caller owns it"""
+        return self.frames[slot]
+
+    def acquire(self, stage, timeout=None):
+        """Take a free slot for `stage`, or None if none frees up within timeout"""
+        try:
+            slot = self.free_queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        self.claim(slot, stage)
+        return slot
+
+    def claim(self, slot, stage):
+        """Record that `stage` (in this process) now owns a slot it received"""
+        self.owners[slot] = (stage, os.getpid())
+
+    def release(self, slot):
+        self.owners[slot] = (FREE, 0)
+        self.free_queue.put(slot)
+
+    def owned_by(self, pid):
+        """Slots currently held by a process (e.g. one that crashed)"""
+        return [int(s) for s in np.flatnonzero(self.owners[:, 1] == pid)]
+
+    def close(self):
+        # Views must go before the mapping can be closed
+        self.frames = self.owners = None
+        for shm in (self._shm, self._owners_shm):
+            try:
+                shm.close()
+            except BufferError:
+                pass  # a view is still referenced; the mapping goes away with the process
+
+    def unlink(self):
+        """Free the shared memory; call once, from the creating process"""
+        for shm in (self._shm, self._owners_shm):
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
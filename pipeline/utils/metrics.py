@@ -0,0 +1,145 @@
+"""
+Memory metrics
+MemoryMonitor samples process RSS every N frames of a pipeline stage and,
+optionally, takes tracemalloc snapshots at stage boundaries. Per stage it
+reports start/end/peak RSS, the growth rate per 1k frames (least-squares
+slope over the samples) and the largest allocation sites, and warns when the
+growth rate means a long video will eventually run out of memory.
+"""
+
+import os
+import sys
+import tracemalloc
+
+import numpy as np
+
+
+MB = 1024 * 1024
+
+
+def rss_bytes():
+    """Current resident set size of this process (peak RSS where current is unavailable)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def growth_per_1k(frames, values, warmup_fraction=0.25):
+    """Slope of values over frames * 1000, ignoring the allocator warm-up at the start"""
+    skip = int(len(frames) * warmup_fraction)
+    frames, values = np.asarray(frames[skip:], float), np.asarray(values[skip:], float)
+    if len(frames) < 3 or np.ptp(frames) == 0:
+        return None
+    return float(np.polyfit(frames, values, 1)[0] * 1000)
+
+
+class _StageMemory:
+    def __init__(self, name, trace):
+        self.name = name
+        self.frames = 0
+        self.sample_frames = [0]
+        self.samples = [rss_bytes()]
+        self.snapshot = tracemalloc.take_snapshot() if trace else None
+
+
+class MemoryMonitor:
+    """Per-stage RSS sampling with optional tracemalloc; one instance per run.
+
+    Call start_stage(name), tick() once per frame, end_stage(); summary()
+    returns the report merged into run_complete_pipeline's results.
+    """
+
+    def __init__(self, sample_every=50, trace=False, top_allocations=5, growth_warn_mb=50.0,
+                 warn_min_frames=500):
+        self.sample_every = sample_every
+        self.trace = trace
+        self.top_allocations = top_allocations
+        self.growth_warn_mb = growth_warn_mb
+        self.warn_min_frames = warn_min_frames  # shorter stages are dominated by warm-up growth
+        self.stages = {}
+        self.warnings = []
+        self.log = print
+        self.peak_rss = rss_bytes()
+        self._current = None
+        self._started_tracing = False
+
+    @classmethod
+    def from_config(cls, config):
+        mem = config.memory
+        return cls(sample_every=mem.sample_every, trace=mem.tracemalloc,
+                   top_allocations=mem.top_allocations, growth_warn_mb=mem.growth_warn_mb)
+
+    def start_stage(self, name):
+        if self.trace and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if self._started_tracing:
+            tracemalloc.reset_peak()
+        self._current = _StageMemory(name, self.trace)
+
+    def tick(self, frames=1):
+        """Count processed frames; samples RSS every sample_every frames"""
+        stage = self._current
+        before = stage.frames
+        stage.frames += frames
+        if stage.frames // self.sample_every > before // self.sample_every:
+            self._sample(stage)
+
+    def _sample(self, stage):
+        rss = rss_bytes()
+        stage.sample_frames.append(stage.frames)
+        stage.samples.append(rss)
+        self.peak_rss = max(self.peak_rss, rss)
+
+    def end_stage(self):
+        stage, self._current = self._current, None
+        if stage.sample_frames[-1] != stage.frames:
+            self._sample(stage)
+
+        growth = growth_per_1k(stage.sample_frames, stage.samples)
+        report = {
+            'frames': stage.frames,
+            'rss_start_mb': stage.samples[0] / MB,
+            'rss_end_mb': stage.samples[-1] / MB,
+            'rss_peak_mb': max(stage.samples) / MB,
+            'growth_mb_per_1k_frames': growth / MB if growth is not None else None,
+        }
+        if stage.snapshot is not None:
+            report['traced_peak_mb'] = tracemalloc.get_traced_memory()[1] / MB
+            diff = tracemalloc.take_snapshot().compare_to(stage.snapshot, 'lineno')
+            report['top_allocations'] = [
+                {'site': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                 'size_kb': stat.size_diff / 1024, 'blocks': stat.count_diff}
+                for stat in diff[:self.top_allocations]]
+        self.stages[stage.name] = report
+
+        if (growth is not None and stage.frames >= self.warn_min_frames
+                and growth / MB > self.growth_warn_mb):
+            warning = (f"{stage.name}: RSS grew {growth / MB:.1f} MB per 1k frames "
+                       f"({report['rss_start_mb']:.0f} -> {report['rss_end_mb']:.0f} MB over "
+                       f"{stage.frames} frames); memory looks unbounded on long videos")
+            self.warnings.append(warning)
+            self.log(f"⚠️  {warning}")
+        return report
+
+    def stop(self):
+        """Stop tracemalloc if this monitor started it"""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def summary(self):
+        return {
+            'peak_rss_mb': self.peak_rss / MB,
+            'stages': self.stages,
+            'warnings': self.warnings,
+        }
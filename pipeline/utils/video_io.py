@@ -0,0 +1,102 @@
+"""
+Video input helpers
+FrameReader iterates a cv2.VideoCapture either sequentially or over a sparse
+set of frame indices, skipping unwanted frames as cheaply as possible.
+"""
+
+import cv2
+
+
+def to_segments(frame_indices):
+    """Group sorted frame indices into contiguous (start, end) inclusive ranges"""
+    segments = []
+    for idx in frame_indices:
+        if segments and idx == segments[-1][1] + 1:
+            segments[-1][1] = idx
+        else:
+            segments.append([idx, idx])
+    return [tuple(s) for s in segments]
+
+
+class FrameReader:
+    """Yields (frame_idx, frame) from an open cv2.VideoCapture.
+
+    With frame_indices=None every frame up to max_frames is decoded. With a
+    set of indices, only those frames are retrieved: short gaps are skipped
+    with grab() (demux + decode, but no colour conversion or copy out), and
+    gaps of at least seek_min_gap frames are jumped with a keyframe seek.
+    Set seek_min_gap=None to never seek (for streams where seeking is
+    unreliable). If `out` is set to a frame-sized uint8 array, the next
+    retrieved frame is decoded into it (e.g. a shared-memory ring slot).
+    """
+
+    def __init__(self, cap, frame_indices=None, max_frames=None, seek_min_gap=250):
+        self.cap = cap
+        self.max_frames = max_frames
+        self.seek_min_gap = seek_min_gap
+        self.frame_indices = None
+        self.out = None
+        if frame_indices is not None:
+            self.frame_indices = sorted(i for i in set(frame_indices)
+                                        if i >= 0 and (max_frames is None or i < max_frames))
+
+        # Decode statistics
+        self.retrieved = 0
+        self.grabbed = 0
+        self.seeks = 0
+
+    def __iter__(self):
+        if self.frame_indices is None:
+            return self._iter_sequential()
+        return self._iter_sparse()
+
+    def _iter_sequential(self):
+        frame_idx = 0
+        while self.max_frames is None or frame_idx < self.max_frames:
+            ret, frame = self._read()
+            if not ret:
+                return
+            self.retrieved += 1
+            yield frame_idx, frame
+            frame_idx += 1
+
+    def _read(self):
+        if self.out is None:
+            return self.cap.read()
+        return self.cap.read(self.out)
+
+    def _seek(self, target):
+        """Jump to target; returns False if the backend did not land exactly there"""
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+        self.seeks += 1
+        return int(self.cap.get(cv2.CAP_PROP_POS_FRAMES)) == target
+
+    def _iter_sparse(self):
+        position = 0  # index of the next frame the capture will return
+        for target in self.frame_indices:
+            gap = target - position
+            if self.seek_min_gap is not None and gap >= self.seek_min_gap:
+                if self._seek(target):
+                    position = target
+                else:
+                    # Inaccurate seeking on this stream: rewind and fall back to grab()
+                    self.seek_min_gap = None
+                    self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    position = 0
+
+            while position < target:
+                if not self.cap.grab():
+                    return
+                self.grabbed += 1
+                position += 1
+
+            ret, frame = self._read()
+            if not ret:
+                return
+            self.retrieved += 1
+            position += 1
+            yield target, frame
+
+    @property
+    def stats(self):
+        return {'retrieved': self.retrieved, 'grabbed': self.grabbed, 'seeks': self.seeks}
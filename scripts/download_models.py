@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Model provisioning
+Fills a local model directory with every model a config needs, verifies it
+against checksums.sha256, pre-builds the optimized ONNX graph cache and
+reports pipeline startup time with a cold and a warm cache.
+
+Examples:
+    # Download missing models into ./models and record their checksums
+    python scripts/download_models.py --model-dir models --fetch --write-checksums
+
+    # Verify an existing (e.g. copied or shared) model directory and warm the ONNX cache
+    python scripts/download_models.py --model-dir models --config configs/realtime.yaml
+
+    # Compare cold vs warm startup (runs the pipeline constructor in fresh processes)
+    python scripts/download_models.py --model-dir models --startup-benchmark
+
+Then set `pipeline.model_dir: models` in the config so the pipeline loads
+only verified local files.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pipeline.config import load_config
+from pipeline.models import (CHECKSUM_FILE, required_models, read_checksums, write_checksums,
+                             file_sha256, create_ort_session)
+
+
+def fetch_model(model_dir, filename, kind):
+    """Download one model into model_dir using the library that normally fetches it"""
+    path = os.path.join(model_dir, filename)
+    if kind.startswith('pose:'):
+        from rtmlib import Body
+        from rtmlib.tools.file import download_checkpoint
+        mode = kind.split(':', 1)[1]
+        with tempfile.TemporaryDirectory() as tmp:
+            shutil.copy(download_checkpoint(Body.MODE[mode]['pose'], dst_dir=tmp), path)
+    elif kind == 'detector':
+        from ultralytics.utils.downloads import attempt_download_asset
+        attempt_download_asset(path)
+    elif kind == 'reid':
+        # boxmot downloads ReID weights to the given path when they are missing
+        from pathlib import Path
+        from pipeline.trackdet import TrackingManager
+        TrackingManager('botsort', device='cpu', reid_weights=Path(path))
+    return os.path.exists(path)
+
+
+def startup_probe(config_path, model_dir, cache_dir):
+    """Construct a pipeline in a fresh process and return its startup_times"""
+    config_path = os.path.abspath(config_path) if config_path else None
+    model_dir = os.path.abspath(model_dir)
+    code = (
+        "import json, sys\n"
+        "from pipeline.config import load_config\n"
+        "from pipeline.unified_pipeline import UnifiedPosePipeline\n"
+        f"config = load_config({config_path!r}).with_overrides(**{{'pipeline.model_dir': {model_dir!r}, "
+        f"'runtime.onnx_cache_dir': {cache_dir!r}, 'output.render': False, 'output.format': 'npz', "
+        f"'pipeline.output_dir': {tempfile.gettempdir()!r}}})\n"
+        "pipeline = UnifiedPosePipeline(config=config)\n"
+        "print('STARTUP_JSON', json.dumps(pipeline.startup_times))\n"
+    )
+    root = os.path.join(os.path.dirname(__file__), '..')
+    out = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True)
+    for line in out.stdout.splitlines():
+        if line.startswith('STARTUP_JSON'):
+            return json.loads(line.split(' ', 1)[1])
+    raise RuntimeError(f"Startup probe failed:\n{out.stderr[-2000:]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Provision, verify and warm pipeline models')
+    parser.add_argument('--config', default=None, help='YAML profile deciding which models are needed')
+    parser.add_argument('--model-dir', default='models')
+    parser.add_argument('--modes', nargs='+', choices=['lightweight', 'balanced', 'performance'],
+                        help='pose modes to provision (default: from config)')
+    parser.add_argument('--fetch', action='store_true', help='download models missing from --model-dir')
+    parser.add_argument('--write-checksums', action='store_true',
+                        help=f'record sha256 of present models in {CHECKSUM_FILE}')
+    parser.add_argument('--cache-dir', default=None, help='ONNX cache (default: runtime.onnx_cache_dir)')
+    parser.add_argument('--device', default=None, help='device for ONNX sessions (default: config)')
+    parser.add_argument('--startup-benchmark', action='store_true')
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    cache_dir = args.cache_dir or config.runtime.onnx_cache_dir
+    device = args.device or config.pipeline.device
+    models = required_models(config, args.modes)
+    os.makedirs(args.model_dir, exist_ok=True)
+
+    print("📦 Model Provisioning")
+    print("=" * 60)
+    print(f"Model dir: {os.path.abspath(args.model_dir)}")
+
+    if args.fetch:
+        for filename, kind in models.items():
+            if os.path.exists(os.path.join(args.model_dir, filename)):
+                continue
+            print(f"⬇️  Fetching {kind}: {filename}")
+            try:
+                if not fetch_model(args.model_dir, filename, kind):
+                    print(f"   ❌ {filename} was not created")
+            except Exception as e:
+                print(f"   ❌ Cannot fetch {filename}: {e}. Copy it into {args.model_dir} manually.")
+
+    if args.write_checksums:
+        present = [f for f in models if os.path.exists(os.path.join(args.model_dir, f))]
+        write_checksums(args.model_dir, present)
+        print(f"📝 Wrote {len(present)} checksums to {os.path.join(args.model_dir, CHECKSUM_FILE)}")
+
+    # Verify every required model
+    checksums = read_checksums(args.model_dir)
+    failures = 0
+    for filename, kind in models.items():
+        path = os.path.join(args.model_dir, filename)
+        if not os.path.exists(path):
+            status = '❌ missing'
+        elif filename not in checksums:
+            status = '⚠️  no checksum'
+        elif file_sha256(path, use_cache=False) != checksums[filename]:
+            status = '❌ checksum mismatch'
+        else:
+            status = '✅ verified'
+        failures += not status.startswith('✅')
+        print(f"   {status:22s} {kind:18s} {filename}")
+    if failures:
+        print(f"\n❌ {failures} model(s) not verified")
+        sys.exit(1)
+
+    # Pre-build the optimized ONNX graphs so the pipeline starts from a warm cache
+    runtime = config.runtime
+    if config.pose2d.backend == 'onnxruntime' and cache_dir:
+        print(f"\n⚙️  ONNX graph cache: {os.path.expanduser(cache_dir)}")
+        for filename, kind in models.items():
+            if not kind.startswith('pose:'):
+                continue
+            start = time.time()
+            _, hit = create_ort_session(os.path.join(args.model_dir, filename), device=device,
+                                        cache_dir=cache_dir,
+                                        intra_op_threads=runtime.onnx_intra_op_threads,
+                                        inter_op_threads=runtime.onnx_inter_op_threads)
+            print(f"   {'♻️  cached' if hit else '🛠️  built '} {kind:18s} {time.time() - start:.2f}s")
+
+    if args.startup_benchmark:
+        print("\n⏱️  Startup benchmark (fresh process each)")
+        with tempfile.TemporaryDirectory() as cold_cache:
+            cold = startup_probe(args.config, args.model_dir, cold_cache)
+            warm = startup_probe(args.config, args.model_dir, cold_cache)
+        for name, times in (('Cold cache', cold), ('Warm cache', warm)):
+            print(f"   {name}: {times['total']:.2f}s | TrackDet {times['trackdet']:.2f}s | "
+                  f"Pose2D {times['pose2d']:.2f}s | warm-up {times['warmup']:.2f}s | "
+                  f"ONNX cache hits {times['onnx_cache_hits']}/{times['onnx_sessions']}")
+        print(f"   Saved: {cold['total'] - warm['total']:.2f}s per startup")
+
+
+if __name__ == "__main__":
+    main()
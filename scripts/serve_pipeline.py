@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Warm-model pipeline server
+Loads the models once and serves video jobs from a priority queue.
+
+Examples:
+    python scripts/serve_pipeline.py --config configs/realtime.yaml --workers 2
+    python scripts/serve_pipeline.py --socket /tmp/pose_pipeline.sock
+
+Submit jobs with pipeline.client.PipelineClient or:
+    python scripts/serve_pipeline.py --submit video1.mp4 video2.mp4 --priority 5 --wait
+"""
+
+import os
+import sys
+import json
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the pose pipeline with warm models')
+    parser.add_argument('--config', default=None, help='YAML profile (default: built-in defaults)')
+    parser.add_argument('--workers', type=int, default=1, help='pipelines kept warm / jobs run at once')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--socket', default=None, help='serve on a Unix socket instead of TCP')
+    parser.add_argument('--output-dir', default='unifiedpipelineoutputs/jobs')
+    parser.add_argument('--submit', nargs='+', metavar='VIDEO', help='submit jobs to a running server')
+    parser.add_argument('--priority', type=int, default=0)
+    parser.add_argument('--max-frames', type=int, default=None)
+    parser.add_argument('--wait', action='store_true', help='with --submit, wait for the jobs to finish')
+    args = parser.parse_args()
+
+    if args.submit:
+        from pipeline.client import PipelineClient
+        client = PipelineClient(f'http://{args.host}:{args.port}', socket_path=args.socket)
+        jobs = [client.submit(os.path.abspath(v), priority=args.priority, max_frames=args.max_frames)
+                for v in args.submit]
+        for job in jobs:
+            print(f"📥 {job['job_id']}: {job['video']}")
+        if args.wait:
+            for job in jobs:
+                job = client.wait(job['job_id'])
+                print(f"{'✅' if job['status'] == 'done' else '❌'} {job['job_id']} {job['status']}: "
+                      f"{json.dumps(job['timing'])}" + (f" {job['error']}" if job['error'] else ""))
+        return
+
+    from pipeline.server import PipelineServer
+    server = PipelineServer(config=args.config, workers=args.workers, output_dir=args.output_dir)
+    server.serve(args.host, args.port, socket_path=args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+import os
+
+import pytest
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'perf: wall-clock budgets, run only with PIPELINE_PERF=1')
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.environ.get('PIPELINE_PERF'):
+        return
+    skip = pytest.mark.skip(reason='timing budget; set PIPELINE_PERF=1 to run')
+    for item in items:
+        if 'perf' in item.keywords:
+            item.add_marker(skip)
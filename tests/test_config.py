@@ -0,0 +1,50 @@
+"""
+Tests for pipeline configuration loading and validation (pipeline/config.py).
+"""
+
+import pytest
+import yaml
+
+from pipeline import config as config_module
+from pipeline.config import DEFAULT_CONFIG_PATH, PipelineConfig, load_config
+
+
+def test_default_yaml_matches_dataclass_defaults():
+    with open(DEFAULT_CONFIG_PATH) as f:
+        data = yaml.safe_load(f)
+    # Every key is spelled out in the shipped profile, with the same values as the dataclasses
+    assert data == PipelineConfig().to_dict()
+    assert load_config() == PipelineConfig()
+
+
+def test_no_config_loads_default_yaml(tmp_path, monkeypatch):
+    path = tmp_path / 'default.yaml'
+    path.write_text("pose2d:\n  batch_size: 4\n")
+    monkeypatch.setattr(config_module, 'DEFAULT_CONFIG_PATH', str(path))
+    assert load_config().pose2d.batch_size == 4
+
+
+@pytest.mark.parametrize('data, message', [
+    ({'trackdet': {'max_agee': 30}}, "Unknown keys in config section 'trackdet'"),
+    ({'tracking': {}}, 'Unknown config sections'),
+    ({'pose2d': {'batch_size': '8'}}, 'pose2d.batch_size has wrong type'),
+    ({'output': {'render': 1}}, 'output.render has wrong type'),
+    ({'trackdet': {'iou_threshold': 1.5}}, r'trackdet.iou_threshold must be in \[0, 1\]'),
+    ({'trackdet': {'detector_input_size': 500}}, 'multiple of 32'),
+    ({'runtime': {'multiprocess': True}, 'controller': {'enabled': True}},
+     'runtime.multiprocess does not support controller.enabled'),
+])
+def test_invalid_config_raises(data, message):
+    with pytest.raises(ValueError, match=message):
+        load_config(data)
+
+
+def test_validation_reports_every_error():
+    with pytest.raises(ValueError) as error:
+        load_config({'pose2d': {'kpt_thr': 2.0, 'batch_size': 0}, 'motion': {'pixel_threshold': 300}})
+    assert str(error.value).count('\n  - ') == 3
+
+
+def test_with_overrides_rejects_unknown_key():
+    with pytest.raises(ValueError, match='Unknown config key: pose2d.batch'):
+        PipelineConfig().with_overrides(**{'pose2d.batch': 4})
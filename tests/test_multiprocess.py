@@ -0,0 +1,80 @@
+"""
+Failure handling in run_stages (pipeline/multiprocess.py): workers that die
+or hang mid-run abort the run, and the shared-memory ring is freed.
+"""
+
+import os
+import time
+
+import pytest
+
+from pipeline.multiprocess import StageWorker, run_stages
+from tests.test_pipeline import write_clip, WIDTH, HEIGHT, NUM_FRAMES
+
+
+class CountingWorker(StageWorker):
+    name = 'count'
+
+    def setup(self):
+        self.frames = 0
+
+    def process(self, slot, frame_idx, frame, payload):
+        self.frames += 1
+        return [(slot, frame_idx, payload)]
+
+    def finish(self):
+        return [], self.frames
+
+
+class CrashingWorker(StageWorker):
+    """Exits the process without cleanup, as a segfaulting model would"""
+
+    name = 'crash'
+
+    def process(self, slot, frame_idx, frame, payload):
+        if frame_idx == 5:
+            os._exit(3)
+        return [(slot, frame_idx, payload)]
+
+
+class HangingWorker(StageWorker):
+    name = 'hang'
+
+    def process(self, slot, frame_idx, frame, payload):
+        if frame_idx == 5:
+            time.sleep(3600)
+        return [(slot, frame_idx, payload)]
+
+
+@pytest.fixture(scope='module')
+def clip(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('clip') / 'clip.mp4')
+    write_clip(path)
+    return path
+
+
+def shm_entries():
+    return set(os.listdir('/dev/shm')) if os.path.isdir('/dev/shm') else set()
+
+
+def test_run_completes(clip):
+    summaries, elapsed = run_stages(clip, (HEIGHT, WIDTH, 3), [CountingWorker()], num_slots=4,
+                                    stall_timeout=30)
+    assert summaries['count'] == NUM_FRAMES and elapsed > 0
+
+
+def test_crashed_worker_aborts_run(clip):
+    before = shm_entries()
+    with pytest.raises(RuntimeError, match=r'crash worker died \(exit code 3\) holding ring slots'):
+        run_stages(clip, (HEIGHT, WIDTH, 3), [CrashingWorker(), CountingWorker()], num_slots=4)
+    assert shm_entries() == before
+
+
+def test_hung_worker_times_out(clip):
+    before = shm_entries()
+    start = time.time()
+    with pytest.raises(RuntimeError, match=r"No progress from stage workers for 1s .*'hang'"):
+        run_stages(clip, (HEIGHT, WIDTH, 3), [HangingWorker()], num_slots=4, stall_timeout=1)
+    # Aborted after the timeout plus the join grace period, not after the worker's hour-long sleep
+    assert time.time() - start < 30
+    assert shm_entries() == before
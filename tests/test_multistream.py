@@ -0,0 +1,140 @@
+"""
+Tests for MultiStreamScheduler with the stub models from test_pipeline: per-
+stream routing against single-stream pipeline runs, pooled detection/pose
+batches, and the latency deadline in _collect_batch.
+"""
+
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from pipeline.multistream import MultiStreamScheduler
+from tests.test_pipeline import (ContourDetector, make_pipeline, write_clip, parked_walker_box,
+                                 NUM_FRAMES)
+
+
+class BatchContourDetector:
+    """ContourDetector over a list of frames, as YOLO is called by the scheduler"""
+
+    def __init__(self):
+        self.detector = ContourDetector()
+        self.batch_sizes = []
+
+    def __call__(self, frames, **kwargs):
+        self.batch_sizes.append(len(frames))
+        return [self.detector(frame, **kwargs)[0] for frame in frames]
+
+
+@pytest.fixture(scope='module')
+def clips(tmp_path_factory):
+    root = tmp_path_factory.mktemp('streams')
+    paths = [str(root / 'walker.mp4'), str(root / 'parked.mp4')]
+    write_clip(paths[0])
+    write_clip(paths[1], box=parked_walker_box, visitor_frames=())
+    return paths
+
+
+def make_scheduler(tmp_path, **kwargs):
+    pipeline = make_pipeline(tmp_path / 'scheduler')
+    pipeline.detector = BatchContourDetector()
+    return MultiStreamScheduler.from_pipeline(pipeline, **kwargs)
+
+
+def test_streams_match_single_stream_runs(clips, tmp_path):
+    scheduler = make_scheduler(tmp_path, max_batch=4, max_latency_ms=50)
+    for i, clip in enumerate(clips):
+        scheduler.add_stream(f'cam{i}', clip)
+    stats = scheduler.run()
+
+    assert stats['total_frames'] == len(clips) * NUM_FRAMES
+    # Detection batches mix frames from both streams; pose batches pool all their crops
+    assert max(scheduler.detector.batch_sizes) == 4
+    assert stats['mean_pose_batch'] > 2
+
+    for i, clip in enumerate(clips):
+        pipeline = make_pipeline(tmp_path / f'single{i}', **{'output.render': False})
+        results = pipeline.run_complete_pipeline(clip)
+        target = results['pose_results']['target_person']
+        stream = scheduler.streams[f'cam{i}']
+
+        assert stats['streams'][f'cam{i}'] == {'frames': NUM_FRAMES, 'tracks': len(pipeline.track_history),
+                                               'longest_track': target}
+        assert sorted(stream.results) == sorted(pipeline.frame_data)
+        for frame_idx, tracks in stream.results.items():
+            assert {tid: t['bbox'] for tid, t in tracks.items()} == pipeline.frame_data[frame_idx]
+            keypoints, scores = pipeline.keypoint_data[frame_idx]
+            np.testing.assert_allclose(tracks[target]['keypoints'], keypoints, atol=1e-4)
+            np.testing.assert_allclose(tracks[target]['scores'], scores, atol=1e-6)
+
+
+def test_deadline_dispatches_partial_batches(tmp_path):
+    frame = np.full((240, 320, 3), 30, np.uint8)
+    cv2.rectangle(frame, (40, 60), (69, 139), (230, 230, 230), -1)
+
+    def slow_camera(num_frames=12, interval=0.05):
+        for _ in range(num_frames):
+            time.sleep(interval)
+            yield frame.copy()
+
+    # A frame every 50 ms and a 10 ms deadline: batches never wait to fill up
+    scheduler = make_scheduler(tmp_path, max_batch=8, max_latency_ms=10)
+    scheduler.add_stream('slow', slow_camera())
+    stats = scheduler.run()
+
+    assert stats['total_frames'] == 12
+    assert max(scheduler.detector.batch_sizes) <= 2
+    assert stats['latency_p50_ms'] < 40  # waiting for 8 frames would take ~350 ms
+
+
+def test_per_stream_callbacks(clips, tmp_path):
+    seen = {}
+
+    def on_result(stream_id, frame_idx, frame, tracks):
+        seen.setdefault(stream_id, []).append(frame_idx)
+
+    scheduler = make_scheduler(tmp_path, max_batch=3, keep_results=False, on_result=on_result)
+    scheduler.add_stream('a', clips[0], max_frames=30)
+    scheduler.add_stream('b', clips[1], max_frames=20)
+    with pytest.raises(ValueError):
+        scheduler.add_stream('a', clips[1])
+    scheduler.run()
+
+    # Every stream's frames arrive exactly once and in order
+    assert seen == {'a': list(range(30)), 'b': list(range(20))}
+    assert all(not stream.results for stream in scheduler.streams.values())
+
+
+def test_pose_limited_to_longest_track(clips, tmp_path):
+    scheduler = make_scheduler(tmp_path, max_batch=4, pose_tracks='longest')
+    scheduler.add_stream('walker', clips[0])
+    stats = scheduler.run()
+
+    pipeline = make_pipeline(tmp_path / 'single', **{'output.render': False})
+    target = pipeline.run_complete_pipeline(clips[0])['pose_results']['target_person']
+    results = scheduler.streams['walker'].results
+    # One pose per frame, always the pipeline's target, with the same keypoints
+    assert sum(scheduler.pose_batches) == NUM_FRAMES
+    for frame_idx, tracks in results.items():
+        posed = [track_id for track_id, track in tracks.items() if 'keypoints' in track]
+        assert posed == [target]
+        keypoints, _ = pipeline.keypoint_data[frame_idx]
+        np.testing.assert_allclose(tracks[target]['keypoints'], keypoints, atol=1e-4)
+    assert stats['streams']['walker']['longest_track'] == target
+
+
+def test_per_stream_pose_selection(clips, tmp_path):
+    scheduler = make_scheduler(tmp_path, max_batch=4)
+    scheduler.add_stream('ids', clips[0], pose_tracks={2})
+    scheduler.add_stream('even', clips[1], pose_tracks=lambda frame_idx, track_ids:
+                         track_ids if frame_idx % 2 == 0 else [])
+    with pytest.raises(ValueError, match='pose_tracks'):
+        scheduler.add_stream('bad', clips[1], pose_tracks='target')
+    scheduler.run()
+
+    assert any(2 in tracks for tracks in scheduler.streams['ids'].results.values())
+    for frame_idx, tracks in scheduler.streams['ids'].results.items():
+        assert [t for t, track in tracks.items() if 'keypoints' in track] == [t for t in tracks if t == 2]
+    for frame_idx, tracks in scheduler.streams['even'].results.items():
+        assert all(('keypoints' in track) == (frame_idx % 2 == 0) for track in tracks.values())
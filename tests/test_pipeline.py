@@ -0,0 +1,557 @@
+"""
+End-to-end tests for UnifiedPosePipeline on a generated clip with stub
+models (a contour detector and a fixed-output pose model), so the real
+pipeline loops, tracker, batching and post-processing run without model
+downloads.
+
+Allocation and peak-memory budgets are checked against
+tests/perf_baseline.json. Wall-clock budgets depend on the machine, so they
+are marked `perf` and only run with PIPELINE_PERF=1. After an intended change
+in cost, refresh the baseline with
+    PIPELINE_UPDATE_BASELINE=1 python -m pytest tests/test_pipeline.py -k budget
+and scale the timing tolerance on slow machines with PIPELINE_PERF_TOLERANCE=2.
+"""
+
+import gc
+import os
+import shutil
+import asyncio
+import sys
+import json
+import types
+import tracemalloc
+
+import cv2
+import numpy as np
+import pytest
+
+from pipeline.unified_pipeline import UnifiedPosePipeline, PipelineCancelled
+from pipeline.aio import AsyncPipelinePool
+from pipeline.pose2d.postprocess import bbox_xyxy2cs, fix_aspect_ratio, to_openpose_batch
+from pipeline.utils.metrics import MemoryMonitor
+from pipeline.trackdet.utils import load_detection_stream
+from pipeline import models
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'perf_baseline.json')
+
+WIDTH, HEIGHT, NUM_FRAMES, FPS = 320, 240, 90, 25
+WALKER_FRAMES = range(NUM_FRAMES)  # person A: whole clip, moving right
+VISITOR_FRAMES = range(20, 50)     # person B: a short visit, standing still
+
+
+def walker_box(i):
+    x = 20 + 2 * i
+    return [x, 60, x + 30, 140]
+
+
+VISITOR_BOX = [240, 100, 270, 180]
+PARKED_FRAMES = range(30, 70)      # motion-gate clip: the walker stands still, no visitor
+
+
+def parked_walker_box(i):
+    """Walks until PARKED_FRAMES, stands still, then walks on from where it stopped"""
+    if i in PARKED_FRAMES:
+        return walker_box(PARKED_FRAMES.start)
+    return walker_box(i if i < PARKED_FRAMES.start else i - len(PARKED_FRAMES) + 1)
+
+
+def write_clip(path, box=walker_box, visitor_frames=VISITOR_FRAMES):
+    out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), FPS, (WIDTH, HEIGHT))
+    for i in range(NUM_FRAMES):
+        frame = np.full((HEIGHT, WIDTH, 3), 30, np.uint8)
+        x1, y1, x2, y2 = box(i)
+        cv2.rectangle(frame, (x1, y1), (x2 - 1, y2 - 1), (230, 230, 230), -1)
+        if i in visitor_frames:
+            x1, y1, x2, y2 = VISITOR_BOX
+            cv2.rectangle(frame, (x1, y1), (x2 - 1, y2 - 1), (180, 180, 180), -1)
+        out.write(frame)
+    out.release()
+
+
+class ContourDetector:
+    """YOLO stand-in: every bright blob is a class-0 detection"""
+
+    def __call__(self, frame, conf=0.5, imgsz=640, verbose=False):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        contours, _ = cv2.findContours((gray > 100).astype(np.uint8), cv2.RETR_EXTERNAL,
+                                       cv2.CHAIN_APPROX_SIMPLE)
+        boxes = [[x, y, x + w, y + h, 0.9, 0] for x, y, w, h in map(cv2.boundingRect, contours)
+                 if w * h >= 100]
+        data = np.array(boxes, dtype=np.float32).reshape(-1, 6)
+        return [types.SimpleNamespace(boxes=types.SimpleNamespace(data=_Tensor(data)))]
+
+
+class _Tensor:
+    def __init__(self, data):
+        self.data = data
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self.data
+
+
+class FixedPoseModel:
+    """RTMPose stand-in returning the same SimCC logits for every crop"""
+
+    model_input_size = (192, 256)
+    mean = (123.675, 116.28, 103.53)
+    std = (58.395, 57.12, 57.375)
+    backend = 'opencv'
+
+    def __init__(self):
+        rng = np.random.default_rng(0)
+        self.simcc = [rng.random((1, 17, 384)).astype(np.float32),
+                      rng.random((1, 17, 512)).astype(np.float32)]
+
+    def inference(self, img):
+        return self.simcc
+
+
+class StubPipeline(UnifiedPosePipeline):
+    def setup_trackdet_components(self):
+        self.detector = ContourDetector()
+        self.tracker = self.build_tracker()
+
+    def build_pose_estimator(self, mode):
+        from pipeline.pose2d import Pose2DEstimator
+        return Pose2DEstimator(FixedPoseModel(), to_openpose=True)
+
+
+def make_pipeline(output_dir, **overrides):
+    config = {
+        'pipeline': {'output_dir': str(output_dir), 'device': 'cpu'},
+        'trackdet': {'tracker_type': 'iou', 'min_hits': 1},
+        'runtime': {'warmup_iterations': 0, 'onnx_cache_dir': None},
+    }
+    for dotted, value in overrides.items():
+        section, key = dotted.split('.')
+        config.setdefault(section, {})[key] = value
+    return StubPipeline(config=config)
+
+
+@pytest.fixture(scope='module')
+def clip(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('clip') / 'clip.mp4')
+    write_clip(path)
+    return path
+
+
+@pytest.fixture(scope='module')
+def parked_clip(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('parked') / 'parked.mp4')
+    write_clip(path, box=parked_walker_box, visitor_frames=())
+    return path
+
+
+@pytest.fixture(scope='module')
+def rendered_run(clip, tmp_path_factory):
+    output_dir = tmp_path_factory.mktemp('rendered')
+    pipeline = make_pipeline(output_dir)
+    return pipeline, pipeline.run_complete_pipeline(clip), output_dir
+
+
+def test_target_is_longest_track(rendered_run):
+    pipeline, results, output_dir = rendered_run
+    target = results['pose_results']['target_person']
+
+    assert results['tracking_results']['frame_count'] == NUM_FRAMES
+    assert len(pipeline.track_history) == 2
+    assert len(pipeline.track_history[target]) == NUM_FRAMES
+    assert f"Person ID: {target}" in (output_dir / 'longest_running_person_ID.txt').read_text()
+
+
+def test_bbox_json_follows_target(rendered_run):
+    _, results, output_dir = rendered_run
+    target = results['pose_results']['target_person']
+    with open(output_dir / f'person_{target}_bboxes.json') as f:
+        bboxes = json.load(f)
+
+    assert sorted(map(int, bboxes)) == list(WALKER_FRAMES)
+    for frame_id, bbox in bboxes.items():
+        np.testing.assert_allclose(bbox, walker_box(int(frame_id)), atol=2)
+
+
+def test_keypoints_json_shapes(rendered_run):
+    _, results, _ = rendered_run
+    with open(results['pose_results']['keypoints_output']) as f:
+        keypoints = json.load(f)
+
+    assert results['pose_results']['processed_frames'] == NUM_FRAMES
+    assert sorted(map(int, keypoints)) == list(WALKER_FRAMES)
+    for frame_id, entry in keypoints.items():
+        kpts = np.array(entry['keypoints'])
+        assert kpts.shape == (18, 2)  # COCO-17 converted to OpenPose-18
+        assert np.array(entry['scores']).shape == (18,)
+        # Keypoints land inside the target's pose crop
+        centers, scales = bbox_xyxy2cs([walker_box(int(frame_id))], padding=1.25)
+        half = fix_aspect_ratio(scales, FixedPoseModel.model_input_size)[0] / 2 + 2
+        assert np.all(np.abs(kpts - centers[0]) <= half)
+
+
+def test_rendered_videos(rendered_run):
+    _, results, output_dir = rendered_run
+    for path in (output_dir / 'stage1_tracking.mp4', results['pose_results']['video_output']):
+        cap = cv2.VideoCapture(str(path))
+        assert int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) == NUM_FRAMES
+        cap.release()
+
+
+def _load_npz_keypoints(results):
+    data = np.load(results['pose_results']['keypoints_output'])
+    return data['frames'], data['keypoints'], data['scores']
+
+
+def test_sparse_decode_matches_full_decode(clip, rendered_run, tmp_path):
+    _, rendered, _ = rendered_run
+    runs = {}
+    for sparse in (True, False):
+        pipeline = make_pipeline(tmp_path / str(sparse), **{'output.render': False, 'output.format': 'npz',
+                                                            'pipeline.sparse_decode': sparse})
+        runs[sparse] = _load_npz_keypoints(pipeline.run_complete_pipeline(clip))
+
+    frames, keypoints, scores = runs[True]
+    assert keypoints.shape == (NUM_FRAMES, 18, 2) and scores.shape == (NUM_FRAMES, 18)
+    for a, b in zip(runs[True], runs[False]):
+        np.testing.assert_array_equal(a, b)
+    # Same keypoints whether or not the frames were rendered
+    with open(rendered['pose_results']['keypoints_output']) as f:
+        rendered_kpts = json.load(f)
+    np.testing.assert_allclose(keypoints, [rendered_kpts[str(i)]['keypoints'] for i in frames], atol=1e-4)
+
+
+def test_multiprocess_matches_in_process(clip, tmp_path):
+    runs = {}
+    for multiprocess in (False, True):
+        pipeline = make_pipeline(tmp_path / str(multiprocess),
+                                 **{'output.render': False, 'output.format': 'npz',
+                                    'runtime.multiprocess': multiprocess, 'runtime.ring_slots': 6})
+        results = pipeline.run_complete_pipeline(clip)
+        runs[multiprocess] = (results['pose_results']['target_person'], pipeline.frame_data,
+                              _load_npz_keypoints(results))
+
+    assert runs[True][:2] == runs[False][:2]
+    for a, b in zip(runs[True][2], runs[False][2]):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_constructor_arguments_override_config(tmp_path):
+    pipeline = StubPipeline(output_dir=str(tmp_path), pose_batch_size=3, record_detections=True,
+                            config={'trackdet': {'tracker_type': 'iou'}, 'pipeline': {'device': 'cpu'}})
+    assert pipeline.config.pose2d.batch_size == 3
+    assert pipeline.config.trackdet.record_detections
+    assert pipeline.output_dir == str(tmp_path)
+
+
+def test_detection_stream_skips_held_frames(clip, tmp_path):
+    # An unreachable FPS target makes the controller raise the detection interval
+    pipeline = make_pipeline(tmp_path, **{'trackdet.record_detections': True, 'controller.enabled': True,
+                                          'controller.target_fps': 1e5, 'controller.window': 1,
+                                          'controller.cooldown': 0, 'output.render': False})
+    results = pipeline.run_complete_pipeline(clip)
+    assert results['controller']['final_settings']['detection_interval'] > 1
+
+    frames, meta = load_detection_stream(os.path.join(tmp_path, 'detections.npz'))
+    indices = list(meta['frame_indices'])
+    assert len(frames) == len(indices) < NUM_FRAMES
+    assert indices == sorted(set(indices))
+    for i, detections in zip(indices, frames):
+        # The walker moves every frame, so a re-recorded stale frame would not match
+        assert np.abs(detections[:, :4] - walker_box(i)).max(axis=1).min() <= 1
+
+
+def test_motion_gate_reuses_results_on_static_frames(parked_clip, tmp_path):
+    runs = {}
+    for label, overrides in (('full', {}), ('gated', {'motion.enabled': True}),
+                             ('gated_mp', {'motion.enabled': True, 'runtime.multiprocess': True,
+                                           'runtime.ring_slots': 6})):
+        pipeline = make_pipeline(tmp_path / label, **{'output.render': False, 'output.format': 'npz',
+                                                      'trackdet.record_detections': True, **overrides})
+        results = pipeline.run_complete_pipeline(parked_clip)
+        runs[label] = (results, pipeline.frame_data, pipeline.keypoint_data, pipeline.motion_skipped)
+        # Static frames reuse detections, so they must not appear in the recorded stream
+        _, meta = load_detection_stream(os.path.join(tmp_path, label, 'detections.npz'))
+        assert list(meta['frame_indices']) == [i for i in range(NUM_FRAMES) if i not in pipeline.motion_skipped]
+
+    (full, full_tracks, full_kpts, _), (gated, tracks, kpts, skipped) = runs['full'], runs['gated']
+    assert full['tracking_results']['motion_skipped_frames'] == 0
+    assert gated['tracking_results']['motion_skipped_frames'] == len(skipped)
+    # Skipping starts once the walker has stood still for settle_frames (5)
+    assert len(skipped) >= len(PARKED_FRAMES) - 10 and skipped <= set(PARKED_FRAMES)
+    assert gated['pose_results']['motion_reused_frames'] == len(skipped)
+
+    # Processed frames match the ungated run; skipped ones hold the last processed result
+    assert tracks.keys() == full_tracks.keys() and kpts.keys() == full_kpts.keys()
+    for i in full_tracks:
+        source = max(j for j in full_tracks if j <= i and j not in skipped)
+        assert tracks[i] == full_tracks[source]
+        np.testing.assert_allclose(kpts[i][0], full_kpts[source][0], atol=1e-4)
+
+    _, mp_tracks, mp_kpts, mp_skipped = runs['gated_mp']
+    assert mp_skipped == skipped and mp_tracks == tracks
+    for i in kpts:
+        np.testing.assert_array_equal(mp_kpts[i][0], kpts[i][0])
+
+
+def test_memory_report(rendered_run):
+    _, results, _ = rendered_run
+    memory = results['memory']
+
+    assert memory['peak_rss_mb'] > 0
+    assert memory['warnings'] == []
+    for stage in ('trackdet', 'pose2d'):
+        report = memory['stages'][stage]
+        assert report['frames'] == NUM_FRAMES
+        assert report['rss_peak_mb'] >= report['rss_start_mb'] > 0
+
+
+def test_memory_monitor_flags_unbounded_growth():
+    retained = []
+    monitor = MemoryMonitor(sample_every=10, trace=True, top_allocations=3, growth_warn_mb=20,
+                            warn_min_frames=100)
+    monitor.start_stage('leaky')
+    for _ in range(200):
+        retained.append(np.ones(256 * 1024 // 8))  # 256 KB kept per frame: ~250 MB per 1k
+        monitor.tick()
+    report = monitor.end_stage()
+    monitor.stop()
+
+    assert report['growth_mb_per_1k_frames'] > 100
+    assert len(monitor.warnings) == 1 and monitor.warnings[0].startswith('leaky')
+    assert report['top_allocations'][0]['size_kb'] >= 200 * 256
+
+
+
+def test_openpose_conversion_matches_rtmlib():
+    from rtmlib.tools.pose_estimation.post_processings import convert_coco_to_openpose
+    rng = np.random.default_rng(0)
+    keypoints = rng.uniform(0, 320, (5, 17, 2)).astype(np.float32)
+    scores = rng.uniform(0, 1, (5, 17)).astype(np.float32)
+
+    expected_keypoints, expected_scores = convert_coco_to_openpose(keypoints, scores)
+    actual_keypoints, actual_scores = to_openpose_batch(keypoints, scores)
+    np.testing.assert_allclose(actual_keypoints, expected_keypoints, atol=1e-4)
+    np.testing.assert_array_equal(actual_scores, expected_scores)
+
+
+def test_checksum_cache_catches_in_place_replacement(tmp_path, monkeypatch):
+    monkeypatch.setattr(models, '_hash_cache_path', lambda: str(tmp_path / 'cache' / 'sha256.json'))
+    model_dir = tmp_path / 'models'
+    model_dir.mkdir()
+    path = model_dir / 'model.onnx'
+    path.write_bytes(b'a' * 1024)
+    models.write_checksums(str(model_dir), ['model.onnx'])
+    assert models.verify_model(str(model_dir), 'model.onnx') == str(path)  # now cached
+
+    # Same size and mtime, different bytes: must not be served from the cache
+    stat = os.stat(path)
+    path.write_bytes(b'b' * 1024)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    with pytest.raises(ValueError, match='Checksum mismatch'):
+        models.verify_model(str(model_dir), 'model.onnx')
+
+
+def test_astream_events_and_arun(clip, rendered_run, tmp_path):
+    _, sync_results, _ = rendered_run
+    pipeline = make_pipeline(tmp_path)
+
+    async def collect():
+        return [event async for event in pipeline.astream(clip)]
+
+    events = asyncio.run(collect())
+    types_seen = [event['type'] for event in events]
+    assert types_seen == (['stage_start'] + ['tracks'] * NUM_FRAMES + ['stage_complete', 'target', 'stage_start']
+                          + ['pose'] * NUM_FRAMES + ['stage_complete', 'complete'])
+    assert [event['stage'] for event in events if event['type'] == 'stage_start'] == ['trackdet', 'pose2d']
+    target = sync_results['pose_results']['target_person']
+    assert events[NUM_FRAMES + 2]['track_id'] == target
+    assert events[-1]['results']['pose_results']['target_person'] == target
+    assert pipeline.on_event is None and pipeline.verbose
+
+    pipeline.reset(str(tmp_path / 'again'))
+    results = asyncio.run(pipeline.arun(clip))
+    assert results['pose_results']['target_person'] == target
+    assert results['tracking_results']['frame_count'] == NUM_FRAMES
+
+
+_VideoWriter = cv2.VideoWriter
+
+
+class TrackedWriter:
+    """cv2.VideoWriter wrapper that records release(); instances are kept alive so
+    garbage collection cannot finalize the file behind the test's back"""
+
+    instances = []
+
+    def __init__(self, path, *args):
+        self.path = path
+        self.released = False
+        self.writer = _VideoWriter(path, *args)
+        TrackedWriter.instances.append(self)
+
+    def write(self, frame):
+        self.writer.write(frame)
+
+    def release(self):
+        self.released = True
+        self.writer.release()
+
+
+def test_astream_cancellation_stops_run(clip, tmp_path, monkeypatch):
+    monkeypatch.setattr(cv2, 'VideoWriter', TrackedWriter)
+    TrackedWriter.instances.clear()
+    pipeline = make_pipeline(tmp_path)
+
+    async def stop_early():
+        seen = 0
+        async for event in pipeline.astream(clip):
+            seen += event['type'] == 'tracks'
+            if seen == 10:
+                break
+
+    async def cancel_task():
+        started = asyncio.Event()
+        task = asyncio.create_task(pipeline.arun(clip, on_event=lambda event: started.set()))
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(stop_early())
+    assert len(pipeline.frame_data) < NUM_FRAMES  # stopped well before the end of stage 1
+    assert pipeline.on_event is None  # worker thread has finished
+    # The partial stage 1 video was finalized when the run stopped
+    assert [os.path.basename(w.path) for w in TrackedWriter.instances] == ['stage1_tracking.mp4']
+    assert TrackedWriter.instances[0].released
+    assert cv2.VideoCapture(TrackedWriter.instances[0].path).get(cv2.CAP_PROP_FRAME_COUNT) > 0
+    asyncio.run(cancel_task())
+    assert pipeline.on_event is None
+    assert all(w.released for w in TrackedWriter.instances)
+
+    pipeline.reset(str(tmp_path / 'reused'))
+    results = asyncio.run(pipeline.arun(clip))
+    assert results['tracking_results']['frame_count'] == NUM_FRAMES
+
+
+def test_sync_cancel_then_reset_reruns(clip, tmp_path):
+    pipeline = make_pipeline(tmp_path, **{'output.render': False})
+
+    def cancel_after_10(event):
+        if event['type'] == 'tracks' and event['frame'] == 10:
+            pipeline.cancel_event.set()
+
+    pipeline.on_event = cancel_after_10
+    with pytest.raises(PipelineCancelled):
+        pipeline.run_complete_pipeline(clip)
+    assert len(pipeline.frame_data) == 11
+
+    pipeline.on_event = None
+    pipeline.reset(str(tmp_path / 'rerun'))
+    results = pipeline.run_complete_pipeline(clip)
+    assert results['tracking_results']['frame_count'] == NUM_FRAMES
+
+
+def test_pool_bounds_concurrency(clip, tmp_path):
+    videos = []
+    for i in range(4):
+        videos.append(str(tmp_path / f'clip{i}.mp4'))
+        shutil.copy(clip, videos[-1])
+    active, peak = set(), [0]
+
+    def on_event(event):
+        if event['type'] == 'stage_start' and event['stage'] == 'trackdet':
+            active.add(event['video'])
+            peak[0] = max(peak[0], len(active))
+        elif event['type'] == 'stage_complete' and event['stage'] == 'pose2d':
+            active.discard(event['video'])
+
+    async def run_all():
+        pool = AsyncPipelinePool(size=2, pipeline_factory=lambda: make_pipeline(tmp_path / 'init'),
+                                 output_root=str(tmp_path / 'pool'))
+        async with pool:
+            return await pool.arun_many(videos, max_frames=40, on_event=on_event)
+
+    results = asyncio.run(run_all())
+    assert 1 <= peak[0] <= 2 and not active
+    assert len(results) == 4
+    assert len({r['pose_results']['target_person'] for r in results}) == 1
+    assert all(r['tracking_results']['frame_count'] == 40 for r in results)
+    assert len(os.listdir(tmp_path / 'pool')) == 4
+
+def measure_timing(pipeline, clip, repeats=3):
+    """Best-of-N stage ms/frame (untraced)"""
+    stage_ms = {'stage1_ms_per_frame': [], 'stage2_ms_per_frame': []}
+    for _ in range(repeats):
+        pipeline.reset()
+        results = pipeline.run_complete_pipeline(clip)
+        frames = results['tracking_results']['frame_count']
+        stage_ms['stage1_ms_per_frame'].append(results['tracking_results']['stage1_time'] * 1000 / frames)
+        stage_ms['stage2_ms_per_frame'].append(results['pose_results']['stage2_time'] * 1000 / frames)
+    return {name: min(values) for name, values in stage_ms.items()}
+
+
+def measure_memory(pipeline, clip):
+    """Retained blocks/frame and peak traced memory for one run"""
+    pipeline.reset()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        blocks_before = sys.getallocatedblocks()
+        results = pipeline.run_complete_pipeline(clip)
+        gc.collect()
+        blocks_after = sys.getallocatedblocks()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    frames = results['tracking_results']['frame_count']
+    return {'alloc_blocks_per_frame': (blocks_after - blocks_before) / frames,
+            'peak_kb': peak / 1024}
+
+
+@pytest.fixture(scope='module')
+def budget_pipeline(clip, tmp_path_factory):
+    pipeline = make_pipeline(tmp_path_factory.mktemp('budget'),
+                             **{'output.render': False, 'output.format': 'npz'})
+    pipeline.run_complete_pipeline(clip)  # warm caches, imports and the codec
+    return pipeline
+
+
+def check_budgets(metrics, tolerance, scale=1.0):
+    with open(BASELINE_PATH) as f:
+        baseline = json.load(f)
+    failures = []
+    for name, value in metrics.items():
+        expected = baseline['metrics'][name]
+        budget = expected * baseline['tolerance'][tolerance] * scale + baseline['slack'][name]
+        if value > budget:
+            failures.append(f"{name}: {value:.3f} > budget {budget:.3f} (baseline {expected})")
+    return failures
+
+
+def test_memory_budgets(budget_pipeline, clip):
+    metrics = measure_memory(budget_pipeline, clip)
+
+    if os.environ.get('PIPELINE_UPDATE_BASELINE'):
+        metrics.update(measure_timing(budget_pipeline, clip))
+        baseline = {'tolerance': {'time': 2.5, 'memory': 1.5},
+                    'slack': {'stage1_ms_per_frame': 0.5, 'stage2_ms_per_frame': 0.5,
+                              'alloc_blocks_per_frame': 20, 'peak_kb': 512},
+                    'metrics': {name: round(value, 3) for name, value in metrics.items()}}
+        with open(BASELINE_PATH, 'w') as f:
+            json.dump(baseline, f, indent=2)
+            f.write('\n')
+        pytest.skip(f"Baseline written to {BASELINE_PATH}: {baseline['metrics']}")
+
+    failures = check_budgets(metrics, 'memory')
+    assert not failures, "Memory regression:\n  " + "\n  ".join(failures)
+
+
+@pytest.mark.perf
+def test_timing_budgets(budget_pipeline, clip):
+    metrics = measure_timing(budget_pipeline, clip)
+    scale = float(os.environ.get('PIPELINE_PERF_TOLERANCE', 1))
+    failures = check_budgets(metrics, 'time', scale)
+    assert not failures, "Performance regression:\n  " + "\n  ".join(failures)
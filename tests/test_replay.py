@@ -0,0 +1,105 @@
+"""
+Tests for offline tracker replay (pipeline/trackdet/replay.py) against
+streams recorded by stage 1 with the stub models from test_pipeline.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from pipeline.trackdet.replay import (count_fragmentations, evaluate_config, expand_grid, hold_tracks,
+                                      id_switch_stats, replay_stream, sweep_tracker_params,
+                                      tracks_to_history)
+from pipeline.trackdet.utils import load_detection_stream, select_longest_track
+from tests.test_pipeline import make_pipeline, write_clip, parked_walker_box, NUM_FRAMES
+
+
+@pytest.fixture(scope='module')
+def parked_clip(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('parked') / 'parked.mp4')
+    write_clip(path, box=parked_walker_box)
+    return path
+
+
+def test_replay_matches_stage1_history(parked_clip, tmp_path):
+    # Motion-skipped frames hold the last tracks, so the stream has fewer updates than frames
+    pipeline = make_pipeline(tmp_path, **{'motion.enabled': True, 'trackdet.record_detections': True,
+                                          'output.render': False})
+    results = pipeline.run_complete_pipeline(parked_clip)
+    frames, meta = load_detection_stream(os.path.join(tmp_path, 'detections.npz'))
+    assert pipeline.motion_skipped and len(frames) < meta['frame_count'] == NUM_FRAMES
+
+    config = dict(tracker_type='iou', **pipeline.tracker.tracker_params)
+    frame_tracks = hold_tracks(replay_stream(frames, **config), meta['frame_indices'],
+                               meta['frame_count'])
+    assert tracks_to_history(frame_tracks) == pipeline.track_history
+
+    result = evaluate_config(frames, config, frame_indices=meta['frame_indices'],
+                             frame_count=meta['frame_count'])
+    target_id, target_frames, start, end = select_longest_track(pipeline.track_history)
+    assert results['pose_results']['target_person'] == target_id == result['target_id']
+    assert (result['target_frames'], result['target_start'], result['target_end']) == \
+        (target_frames, start, end) == (NUM_FRAMES, 0, NUM_FRAMES - 1)
+
+
+def test_hold_tracks_fills_gaps():
+    updates = [np.full((1, 5), i, np.float32) for i in range(3)]
+    held = hold_tracks(updates, [2, 3, 6], frame_count=8)
+    assert [len(t) for t in held[:2]] == [0, 0]
+    assert [int(t[0, 4]) for t in held[2:]] == [0, 1, 1, 1, 2, 2]
+
+
+def two_walkers(num_frames=30, swap_at=None):
+    """Per-frame (M, 5) tracks for two people; IDs are swapped from frame swap_at on"""
+    frames = []
+    for i in range(num_frames):
+        ids = (2, 1) if swap_at is not None and i >= swap_at else (1, 2)
+        frames.append(np.array([[10 + 2 * i, 50, 40 + 2 * i, 130, ids[0]],
+                                [200, 60, 230, 140, ids[1]]], np.float32))
+    return frames
+
+
+def test_expand_grid():
+    configs = expand_grid({'tracker_type': ['iou'], 'max_age': [10, 30], 'min_hits': [1, 3]})
+    assert configs == [{'tracker_type': 'iou', 'max_age': 10, 'min_hits': 1},
+                       {'tracker_type': 'iou', 'max_age': 10, 'min_hits': 3},
+                       {'tracker_type': 'iou', 'max_age': 30, 'min_hits': 1},
+                       {'tracker_type': 'iou', 'max_age': 30, 'min_hits': 3}]
+
+
+def test_id_switch_stats_counts_a_forced_swap():
+    reference = two_walkers()
+    assert id_switch_stats(reference, reference) == (0, {}, 1.0)
+
+    switches, per_track, recall = id_switch_stats(two_walkers(swap_at=15), reference)
+    assert switches == 2 and per_track == {1: 1, 2: 1} and recall == 1.0
+
+    # A missing track lowers recall but is not a switch
+    partial = [tracks[:1] for tracks in reference]
+    assert id_switch_stats(partial, reference) == (0, {}, 0.5)
+
+
+def test_count_fragmentations():
+    assert count_fragmentations({1: [0, 1, 2, 3], 2: [5, 6]}) == 0
+    assert count_fragmentations({1: [0, 1, 4, 5, 9], 2: [3, 7]}) == 3
+
+
+def test_sweep_workers_match_in_process(parked_clip, tmp_path):
+    pipeline = make_pipeline(tmp_path, **{'trackdet.record_detections': True, 'output.render': False})
+    pipeline.run_complete_pipeline(parked_clip)
+    frames, meta = load_detection_stream(os.path.join(tmp_path, 'detections.npz'))
+    configs = expand_grid({'tracker_type': ['iou'], 'max_age': [1, 30], 'min_hits': [1, 3],
+                           'iou_threshold': [0.3, 0.9]})
+
+    def strip_timing(results):
+        return [{k: v for k, v in r.items() if k != 'ms_per_frame'} for r in results]
+
+    kwargs = dict(frame_shape=(meta['height'], meta['width']), frame_indices=meta['frame_indices'],
+                  frame_count=meta['frame_count'])
+    serial = sweep_tracker_params(frames, configs, workers=1, **kwargs)
+    parallel = sweep_tracker_params(frames, configs, workers=2, **kwargs)
+    assert [r['config'] for r in parallel] == configs
+    assert strip_timing(parallel) == strip_timing(serial)
+    # The grid is not degenerate: some configurations behave differently
+    assert len({(r['num_ids'], r['id_switches']) for r in serial}) > 1
@@ -0,0 +1,139 @@
+"""
+Tests for the local inference server and client, using a stub pipeline
+so no models are loaded.
+"""
+
+import socket
+import threading
+import time
+
+import pytest
+
+from pipeline.client import PipelineClient
+from pipeline.server import PipelineServer
+
+
+class StubPipeline:
+    """Stands in for UnifiedPosePipeline: records calls, optionally blocks on a gate"""
+
+    instances = []
+
+    def __init__(self, gate=None):
+        self.gate = gate
+        self.resets = []
+        self.videos = []
+        StubPipeline.instances.append(self)
+
+    def reset(self, output_dir=None):
+        self.resets.append(output_dir)
+
+    def run_complete_pipeline(self, input_video, max_frames=None):
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        if 'broken' in input_video:
+            raise ValueError("No tracking data found. Run Stage 1 first.")
+        self.videos.append(input_video)
+        return {
+            'tracking_results': {'frame_count': max_frames or 10, 'stage1_time': 0.01},
+            'pose_results': {'stage2_time': 0.02, 'target_person': 1},
+            'total_time': 0.03,
+            'overall_fps': 333.3,
+        }
+
+
+@pytest.fixture
+def videos(tmp_path):
+    paths = {}
+    for name in ('a', 'b', 'c', 'broken'):
+        path = tmp_path / f'{name}.mp4'
+        path.write_bytes(b'')
+        paths[name] = str(path)
+    return paths
+
+
+@pytest.fixture
+def make_server(tmp_path):
+    servers = []
+
+    def factory(workers=1, gate=None, socket_path=None):
+        StubPipeline.instances = []
+        app = PipelineServer(workers=workers, pipeline_factory=lambda: StubPipeline(gate),
+                             output_dir=str(tmp_path / 'jobs')).start()
+        httpd = app.make_http_server(port=0, socket_path=socket_path)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        servers.append((app, httpd))
+        if socket_path:
+            return app, PipelineClient(socket_path=socket_path)
+        return app, PipelineClient(f'http://127.0.0.1:{httpd.server_address[1]}')
+
+    yield factory
+    for app, httpd in servers:
+        httpd.shutdown()
+        httpd.server_close()
+        app.shutdown()
+
+
+def test_jobs_run_on_warm_pipelines(make_server, videos):
+    app, client = make_server(workers=2)
+    assert len(StubPipeline.instances) == 2
+    assert client.health()['workers'] == 2
+
+    jobs = [client.submit(videos[name], max_frames=5) for name in ('a', 'b', 'c')]
+    finished = [client.wait(job['job_id'], timeout=5, poll_interval=0.01) for job in jobs]
+
+    assert [job['status'] for job in finished] == ['done'] * 3
+    for job in finished:
+        assert job['timing']['frames'] == 5
+        assert job['timing']['run_time'] >= 0 and job['timing']['queue_time'] >= 0
+        assert job['result']['pose_results']['target_person'] == 1
+
+    # Pipelines are built once, then reset with a per-job output directory
+    assert len(StubPipeline.instances) == 2
+    resets = [d for p in StubPipeline.instances for d in p.resets]
+    assert sorted(resets) == sorted(job['output_dir'] for job in finished)
+    assert len(client.jobs()) == 3
+
+
+def test_priority_order_and_cancel(make_server, videos):
+    gate = threading.Event()
+    app, client = make_server(workers=1, gate=gate)
+
+    blocker = client.submit(videos['a'])
+    while client.status(blocker['job_id'])['status'] != 'running':
+        time.sleep(0.01)
+    low = client.submit(videos['b'], priority=0)
+    high = client.submit(videos['c'], priority=10)
+    cancelled = client.submit(videos['a'], priority=5)
+    assert client.cancel(cancelled['job_id'])['status'] == 'cancelled'
+
+    gate.set()
+    for job in (low, high):
+        client.wait(job['job_id'], timeout=5, poll_interval=0.01)
+
+    assert StubPipeline.instances[0].videos == [videos['a'], videos['c'], videos['b']]
+    assert client.status(cancelled['job_id'])['status'] == 'cancelled'
+
+
+def test_failures_are_reported(make_server, videos):
+    app, client = make_server()
+
+    job = client.wait(client.submit(videos['broken'])['job_id'], timeout=5, poll_interval=0.01)
+    assert job['status'] == 'failed'
+    assert 'No tracking data' in job['error']
+
+    with pytest.raises(RuntimeError, match='404'):
+        client.status('job-99999')
+    with pytest.raises(RuntimeError, match='400'):
+        client.submit('/does/not/exist.mp4')
+
+    # The worker survives a failed job
+    job = client.wait(client.submit(videos['a'])['job_id'], timeout=5, poll_interval=0.01)
+    assert job['status'] == 'done'
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='Unix sockets not available')
+def test_unix_socket(make_server, videos, tmp_path):
+    app, client = make_server(socket_path=str(tmp_path / 'pipeline.sock'))
+    job = client.wait(client.submit(videos['a'])['job_id'], timeout=5, poll_interval=0.01)
+    assert job['status'] == 'done'
+    assert client.health()['done'] == 1
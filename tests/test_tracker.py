@@ -0,0 +1,143 @@
+"""
+Unit tests for IoUTracker and TrackingManager (pipeline/trackdet/tracker.py).
+"""
+
+import numpy as np
+import pytest
+
+from pipeline.trackdet.tracker import TRACKER_BACKENDS, IoUTracker, TrackingManager
+
+
+def det(x, y=50, w=30, h=80, conf=0.9):
+    return [x, y, x + w, y + h, conf, 0]
+
+
+def step(tracker, *dets):
+    return tracker.update(np.array(dets, dtype=np.float32).reshape(-1, 6))
+
+
+def ids(tracks):
+    return sorted(int(i) for i in tracks[:, 4])
+
+
+def test_ids_persist_across_frames():
+    tracker = IoUTracker(min_hits=1)
+    seen = [step(tracker, det(10 + 3 * i), det(200 - 3 * i, y=20)) for i in range(20)]
+
+    assert all(ids(tracks) == [1, 2] for tracks in seen)
+    # Each ID keeps following its own box
+    for i, tracks in enumerate(seen):
+        walker = tracks[tracks[:, 4] == 1][0]
+        np.testing.assert_allclose(walker[:4], det(10 + 3 * i)[:4], atol=3)
+
+
+def test_max_age_expires_lost_tracks():
+    tracker = IoUTracker(min_hits=1, max_age=2)
+    for _ in range(3):
+        step(tracker, det(10))
+    for _ in range(2):
+        assert len(step(tracker)) == 0
+    # Missing for max_age frames: the track survives and is matched again
+    assert ids(step(tracker, det(10))) == [1]
+
+    for _ in range(3):
+        step(tracker)
+    # Missing for more than max_age frames: the track is gone, the box gets a new ID
+    assert len(tracker.ids) == 0
+    assert ids(step(tracker, det(10))) == [2]
+
+
+def test_min_hits_gates_output_after_a_miss():
+    tracker = IoUTracker(min_hits=3)
+    for _ in range(5):
+        assert ids(step(tracker, det(10))) == [1]
+    assert len(step(tracker)) == 0
+
+    # After a miss the hit streak restarts: hidden until min_hits consecutive matches
+    assert len(step(tracker, det(10))) == 0
+    assert len(step(tracker, det(10))) == 0
+    assert ids(step(tracker, det(10))) == [1]
+
+
+def test_new_tracks_wait_for_min_hits():
+    tracker = IoUTracker(min_hits=3)
+    for _ in range(4):
+        step(tracker, det(10))
+    # Past the first min_hits frames, a new person needs min_hits matches to appear
+    outputs = [ids(step(tracker, det(10), det(200))) for _ in range(3)]
+    assert outputs == [[1], [1], [1, 2]]
+
+
+def test_det_thresh_filters_detections():
+    tracker = IoUTracker(min_hits=1, det_thresh=0.5)
+    tracks = step(tracker, det(10, conf=0.4), det(100, conf=0.6))
+    assert len(tracks) == 1 and tracks[0, 5] == pytest.approx(0.6)
+    assert len(tracker.ids) == 1  # the weak detection did not spawn a track
+
+
+def test_det_ind_maps_back_to_input_rows():
+    tracker = IoUTracker(min_hits=1, det_thresh=0.5)
+    rows = [det(10, conf=0.2), det(100), det(200, conf=0.1), det(150, y=150)]
+    for _ in range(3):
+        tracks = step(tracker, *rows)
+        rows = rows[::-1]  # reorder the input; det_ind must follow it
+
+    assert tracks.shape == (2, 8)
+    inputs = np.array(rows[::-1], dtype=np.float32)
+    for track in tracks:
+        source = inputs[int(track[7])]
+        assert source[4] >= 0.5
+        np.testing.assert_allclose(track[:4], source[:4], atol=2)
+
+
+def test_reset_restarts_ids():
+    tracker = IoUTracker(min_hits=1)
+    step(tracker, det(10))
+    tracker.reset()
+    assert len(tracker.ids) == 0
+    assert ids(step(tracker, det(200))) == [1]
+
+
+def test_manager_reset_keeps_backend_with_reset(monkeypatch):
+    built = []
+
+    class ReIDTracker:
+        """Stands in for botsort/strongsort: expensive to build, resettable"""
+        def __init__(self, **kwargs):
+            built.append(self)
+            self.resets = 0
+
+        def reset(self):
+            self.resets += 1
+
+        def update(self, dets, img=None):
+            return np.empty((0, 8))
+
+    class PlainTracker(ReIDTracker):
+        reset = None
+
+    def builder(tracker_class):
+        def build(**kwargs):
+            return tracker_class(**kwargs)
+        build.uses_reid = True
+        return build
+
+    monkeypatch.setitem(TRACKER_BACKENDS, 'reid', builder(ReIDTracker))
+    monkeypatch.setitem(TRACKER_BACKENDS, 'plain', builder(PlainTracker))
+
+    manager = TrackingManager('reid', device='cpu')
+    tracker = manager.tracker
+    manager.reset()
+    manager.reset()
+    assert manager.tracker is tracker and tracker.resets == 2 and len(built) == 1
+
+    # Backends without reset() are rebuilt
+    manager = TrackingManager('plain', device='cpu')
+    tracker = manager.tracker
+    manager.reset()
+    assert manager.tracker is not tracker and len(built) == 3
+
+
+def test_manager_rejects_unknown_tracker():
+    with pytest.raises(ValueError, match="Unknown tracker 'sort'"):
+        TrackingManager('sort')
@@ -0,0 +1,72 @@
+"""
+Tests for SkeletonRenderer (pipeline/pose2d/visualization.py) on a blank canvas.
+"""
+
+import numpy as np
+import pytest
+
+from pipeline.pose2d.visualization import SKELETONS, SkeletonRenderer
+
+
+def person():
+    """OpenPose-18 person with only neck (1), right shoulder (2), right elbow (3)
+    and left shoulder (5) placed; every other joint has score 0"""
+    keypoints = np.zeros((18, 2), np.float32)
+    scores = np.zeros(18, np.float32)
+    keypoints[[1, 2, 3, 5]] = [[50, 50], [150, 50], [250, 50], [50, 150]]
+    scores[[1, 2, 3, 5]] = [0.9, 0.9, 0.9, 0.2]
+    return keypoints, scores
+
+
+def pixel(img, x, y):
+    return tuple(int(c) for c in img[y, x])
+
+
+def test_draws_limbs_and_joints():
+    table = SKELETONS['openpose18']
+    img = np.zeros((200, 200, 3), np.uint8)
+    SkeletonRenderer(kpt_thr=0.3).draw(img, *person())
+
+    # Limb 1-2 along y=50, and a dot in each endpoint's joint colour
+    assert pixel(img, 100, 50) == table['limb_colors'][table['limbs'].index((1, 2))]
+    assert pixel(img, 50, 50) == table['joint_colors'][1]
+    assert pixel(img, 150, 50) == table['joint_colors'][2]
+
+
+def test_low_score_and_out_of_frame_joints_are_skipped():
+    img = np.zeros((200, 200, 3), np.uint8)
+    SkeletonRenderer(kpt_thr=0.3).draw(img, *person())
+
+    # Joint 5 (score 0.2) and limb 1-5 are below kpt_thr
+    assert pixel(img, 50, 150) == (0, 0, 0) and pixel(img, 50, 100) == (0, 0, 0)
+    # Joint 3 lies right of the 200 px frame, so limb 2-3 is not drawn either
+    assert pixel(img, 175, 50) == (0, 0, 0)
+    # Only the two visible joints, the limb between them and nothing else
+    drawn = img.any(axis=2)
+    assert not drawn[:, :40].any() and not drawn[60:].any()
+
+    # A per-call kpt_thr overrides the renderer's
+    SkeletonRenderer(kpt_thr=0.3).draw(img, *person(), kpt_thr=0.1)
+    assert pixel(img, 50, 150) == SKELETONS['openpose18']['joint_colors'][5]
+    assert pixel(img, 50, 100) != (0, 0, 0)
+
+
+def test_batches_and_empty_input():
+    keypoints, scores = person()
+    single = np.zeros((200, 200, 3), np.uint8)
+    SkeletonRenderer().draw(single, keypoints, scores)
+    batched = np.zeros((200, 200, 3), np.uint8)
+    SkeletonRenderer().draw(batched, keypoints[None], scores[None])
+    np.testing.assert_array_equal(single, batched)
+
+    img = np.zeros((200, 200, 3), np.uint8)
+    assert SkeletonRenderer().draw(img, np.empty((0, 18, 2)), np.empty((0, 18))) is img
+    assert not img.any()
+
+
+def test_rejects_wrong_keypoint_count():
+    renderer = SkeletonRenderer('openpose18')
+    with pytest.raises(ValueError, match='openpose18 expects 18 keypoints, got 17'):
+        renderer.draw(np.zeros((200, 200, 3), np.uint8), np.zeros((1, 17, 2)), np.ones((1, 17)))
+    with pytest.raises(ValueError, match='Unknown skeleton'):
+        SkeletonRenderer('body25')